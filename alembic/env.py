@@ -17,25 +17,44 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
-def run_migrations_offline():
-    url = config.get_main_option("sqlalchemy.url")
-    context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
-    with context.begin_transaction():
-        context.run_migrations()
+def _targets():
+    """
+    (name, url) of every database to migrate: the primary, then each shard of
+    SHARD_DATABASE_URLS (all share one schema). `alembic -x shard=2 upgrade head`
+    limits the run to one of them (`-x shard=primary` for DATABASE_URL only).
+    """
+    targets = [("primary", config.get_main_option("sqlalchemy.url"))]
+    for i, url in enumerate(settings.SHARD_DATABASE_URLS):
+        if url not in (u for _, u in targets):
+            targets.append((f"shard{i}", url))
+    only = context.get_x_argument(as_dictionary=True).get("shard")
+    if only is not None:
+        name = only if only == "primary" else f"shard{only}"
+        targets = [t for t in targets if t[0] == name]
+        if not targets:
+            raise SystemExit(f"no database named {name} (shards: {len(settings.SHARD_DATABASE_URLS)})")
+    return targets
 
 
-def run_migrations_online():
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
-    with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+def run_migrations_offline():
+    for name, url in _targets():
+        context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
         with context.begin_transaction():
+            context.execute(f"-- {name}")
             context.run_migrations()
 
 
+def run_migrations_online():
+    for name, url in _targets():
+        section = dict(config.get_section(config.config_ini_section), **{"sqlalchemy.url": url})
+        connectable = engine_from_config(section, prefix="sqlalchemy.", poolclass=pool.NullPool)
+        with connectable.connect() as connection:
+            context.configure(connection=connection, target_metadata=target_metadata)
+            with context.begin_transaction():
+                context.run_migrations()
+        connectable.dispose()
+
+
 if context.is_offline_mode():
     run_migrations_offline()
 else:
@@ -0,0 +1,21 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "0003_policy_expiry_pending_idx"
+down_revision = "0002_task_a_end_date_not_null"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Partial index: only policies the expiry job still has to log
+    op.create_index(
+        "ix_policy_expiry_pending",
+        "insurance_policy",
+        ["end_date"],
+        postgresql_where=sa.text("logged_expiry_at IS NULL"),
+        sqlite_where=sa.text("logged_expiry_at IS NULL"),
+    )
+
+def downgrade():
+    op.drop_index("ix_policy_expiry_pending", table_name="insurance_policy")
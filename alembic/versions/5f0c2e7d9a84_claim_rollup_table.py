@@ -0,0 +1,25 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "0007_claim_rollup"
+down_revision = "0006_car_summary"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "claim_rollup",
+        sa.Column("grain", sa.String(length=5), primary_key=True),
+        sa.Column("period_start", sa.Date(), primary_key=True),
+        sa.Column("make", sa.String(length=100), primary_key=True),
+        sa.Column("model", sa.String(length=100), primary_key=True),
+        sa.Column("provider", sa.String(length=200), primary_key=True),
+        sa.Column("claim_count", sa.Integer(), nullable=False),
+        sa.Column("amount_total", sa.Numeric(16, 2), nullable=False),
+    )
+    # Filled by the refresh job (watermark starts at 0) or python -m scripts.rebuild_claim_rollups
+
+def downgrade():
+    op.drop_table("claim_rollup")
+    op.execute("DELETE FROM version_counter WHERE name = 'claim_rollup_watermark'")
@@ -0,0 +1,20 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "0004_scheduler_lease"
+down_revision = "0003_policy_expiry_pending_idx"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "scheduler_lease",
+        sa.Column("name", sa.String(length=100), primary_key=True),
+        sa.Column("holder", sa.String(length=200), nullable=False),
+        sa.Column("acquired_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+def downgrade():
+    op.drop_table("scheduler_lease")
@@ -0,0 +1,22 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "0005_car_version_counters"
+down_revision = "0004_scheduler_lease"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("car", sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")))
+    op.create_table(
+        "version_counter",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+    )
+    op.execute("INSERT INTO version_counter (name, value) VALUES ('cars', 1)")
+
+def downgrade():
+    op.drop_table("version_counter")
+    with op.batch_alter_table("car") as batch:
+        batch.drop_column("version")
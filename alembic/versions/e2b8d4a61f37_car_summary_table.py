@@ -0,0 +1,54 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "0006_car_summary"
+down_revision = "0005_car_version_counters"
+branch_labels = None
+depends_on = None
+
+# Same rollup as scripts.rebuild_car_summary, in portable SQL (window functions: SQLite >= 3.25)
+BACKFILL = """
+INSERT INTO car_summary (
+    car_id, claim_count, claim_total, last_claim_date, policy_count,
+    latest_policy_id, latest_policy_provider, latest_policy_start, latest_policy_end, updated_at
+)
+SELECT c.id,
+       COALESCE(cl.n, 0), COALESCE(cl.total, 0), cl.last_date,
+       COALESCE(pc.n, 0),
+       lp.id, lp.provider, lp.start_date, lp.end_date,
+       CURRENT_TIMESTAMP
+FROM car c
+LEFT JOIN (
+    SELECT car_id, COUNT(*) AS n, SUM(amount) AS total, MAX(claim_date) AS last_date
+    FROM claim GROUP BY car_id
+) cl ON cl.car_id = c.id
+LEFT JOIN (
+    SELECT car_id, COUNT(*) AS n FROM insurance_policy GROUP BY car_id
+) pc ON pc.car_id = c.id
+LEFT JOIN (
+    SELECT id, car_id, provider, start_date, end_date,
+           ROW_NUMBER() OVER (PARTITION BY car_id ORDER BY start_date DESC, id DESC) AS rn
+    FROM insurance_policy
+) lp ON lp.car_id = c.id AND lp.rn = 1
+WHERE cl.car_id IS NOT NULL OR pc.car_id IS NOT NULL
+"""
+
+def upgrade():
+    op.create_table(
+        "car_summary",
+        sa.Column("car_id", sa.Integer(), sa.ForeignKey("car.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("claim_count", sa.Integer(), nullable=False),
+        sa.Column("claim_total", sa.Numeric(14, 2), nullable=False),
+        sa.Column("last_claim_date", sa.Date(), nullable=True),
+        sa.Column("policy_count", sa.Integer(), nullable=False),
+        sa.Column("latest_policy_id", sa.Integer(), nullable=True),
+        sa.Column("latest_policy_provider", sa.String(), nullable=True),
+        sa.Column("latest_policy_start", sa.Date(), nullable=True),
+        sa.Column("latest_policy_end", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.execute(BACKFILL)
+
+def downgrade():
+    op.drop_table("car_summary")
@@ -1,7 +1,13 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
+from sqlalchemy.exc import DBAPIError
+from app.core.config import settings
+from app.db.replicas import mark_session_failed, read_session
 from app.db.session import SessionLocal
+from app.db.shards import car_read_session, car_session, shard_set
+from app.db.async_session import get_async_sessionmaker
 
 # Dependency to be used in routes
 def get_db() -> Generator[Session, None, None]:
@@ -9,4 +15,53 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Read-only endpoints: a replica when READ_DATABASE_URLS is set, the primary otherwise
+def get_read_db() -> Generator[Session, None, None]:
+    db = read_session()
+    try:
+        yield db
+    except DBAPIError as e:
+        mark_session_failed(db, e)
+        raise
+    finally:
+        db.close()
+
+
+# Car-scoped endpoints (path parameter carId): the car's shard, or the primary when unsharded
+def get_car_db(carId: int) -> Generator[Session, None, None]:
+    db = car_session(carId)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Read-only car-scoped endpoints: the car's shard, or get_read_db's choice when unsharded
+def get_car_read_db(carId: int) -> Generator[Session, None, None]:
+    if not shard_set.sharded:
+        yield from get_read_db()
+        return
+    db = car_read_session(carId)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Single-car validity check: with VALIDITY_INDEX_ENABLED a cache miss loads the car's policies into the
+# process-wide index, so it reads the primary (a lagging replica would refill an entry that a write just
+# invalidated); plain lookups cache nothing and use get_car_read_db. Index hits open no connection.
+def get_validity_db(carId: int) -> Generator[Session, None, None]:
+    if settings.VALIDITY_INDEX_ENABLED:
+        yield from get_car_db(carId)
+    else:
+        yield from get_car_read_db(carId)
+
+
+# Async counterpart, used by the async routers (ASYNC_DB_ENABLED)
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -18,6 +18,12 @@ class BadRequestError(Exception):
         self.detail = detail
 
 
+class LockTimeoutError(Exception):
+    """A write could not get its row/database lock within the configured retries."""
+    def __init__(self, detail: str):
+        self.detail = detail
+
+
 def _validation_payload(exc) -> dict:
     """Normalize Pydantic/FastAPI validation errors into a consistent envelope."""
     try:
@@ -48,6 +54,11 @@ def register_exception_handlers(app):
         log.info("bad_request", detail=exc.detail, path=str(request.url))
         return JSONResponse(status_code=400, content={"detail": exc.detail})
 
+    @app.exception_handler(LockTimeoutError)
+    async def lock_timeout_handler(request: Request, exc: LockTimeoutError):
+        log.warning("write_lock_timeout", detail=exc.detail, path=str(request.url))
+        return JSONResponse(status_code=503, content={"detail": exc.detail}, headers={"Retry-After": "1"})
+
     @app.exception_handler(RequestValidationError)
     async def request_validation_handler(request: Request, exc: RequestValidationError):
         payload = _validation_payload(exc)
@@ -0,0 +1,26 @@
+"""
+Strong ETags for conditional GETs. The tag is derived from a version counter
+(see app.services.version_service) plus the request's query string, so it is
+known before any policies/claims are loaded; a matching If-None-Match is
+answered with 304 and no body.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(request: Request, resource: str, version: int) -> str:
+    raw = f"{resource}|{version}|{request.url.query}".encode()
+    return '"' + hashlib.sha1(raw).hexdigest()[:24] + '"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response when If-None-Match matches `etag` (weak comparison, as RFC 9110 requires), else None."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    if "*" in tags or etag in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -0,0 +1,96 @@
+"""
+Fast JSON path (FAST_JSON_ENABLED): rows -> plain dicts -> JSON bytes, skipping the
+response_model re-validation and jsonable_encoder pass FastAPI does per object.
+
+The dict builders mirror the public schemas in app.api.schemas (camelCase aliases,
+ClaimOut.amount as float, history amounts as strings like pydantic's JSON mode);
+keep them in sync when a schema changes. Uses orjson when installed, otherwise
+pydantic-core's encoder.
+"""
+from typing import Any, Iterable
+
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return to_json(obj)
+
+
+class FastJSONResponse(Response):
+    """Response whose body is already-encoded JSON bytes (or any object to encode)."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def owner_dict(o) -> dict:
+    return {"id": o.id, "name": o.name, "email": o.email}
+
+
+def car_dict(c) -> dict:
+    return {
+        "id": c.id,
+        "vin": c.vin,
+        "make": c.make,
+        "model": c.model,
+        "yearOfManufacture": c.year_of_manufacture,
+        "owner": owner_dict(c.owner),
+    }
+
+
+def policy_dict(p) -> dict:
+    return {
+        "id": p.id,
+        "carId": p.car_id,
+        "provider": p.provider,
+        "startDate": p.start_date,
+        "endDate": p.end_date,
+    }
+
+
+def claim_dict(c) -> dict:
+    return {
+        "id": c.id,
+        "carId": c.car_id,
+        "claimDate": c.claim_date,
+        "description": c.description,
+        "amount": float(c.amount),
+    }
+
+
+def history_item_dict(item) -> dict:
+    if item.type == "POLICY":
+        return {
+            "type": "POLICY",
+            "policyId": item.policy_id,
+            "startDate": item.start_date,
+            "endDate": item.end_date,
+            "provider": item.provider,
+        }
+    return {
+        "type": "CLAIM",
+        "claimId": item.claim_id,
+        "claimDate": item.claim_date,
+        "amount": str(item.amount),
+        "description": item.description,
+    }
+
+
+def encode_list(builder, objs: Iterable) -> bytes:
+    return dumps([builder(o) for o in objs])
+
+
+def encode_line(builder, obj) -> bytes:
+    """One NDJSON line."""
+    return dumps(builder(obj)) + b"\n"
@@ -0,0 +1,86 @@
+# app/api/middleware.py
+"""Pure ASGI middleware (no BaseHTTPMiddleware: streaming responses pass through untouched)."""
+from __future__ import annotations
+
+import uuid
+from time import perf_counter
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.context import request_id
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class RequestIDMiddleware:
+    """Take X-Request-ID from the client (or generate one), expose it to logs and echo it back."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                rid = value.decode("latin-1")[:128]
+                break
+        rid = rid or uuid.uuid4().hex
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = rid
+            await send(message)
+
+        token = request_id.set(rid)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Per-route latency histogram, status counts and in-flight gauge, plus the number
+    of SQL statements / DB time spent while handling the request.
+    Routes are labelled by their template (/api/cars/{carId}/history), unmatched
+    paths as "unmatched", to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = metrics.QueryStats()
+        token = metrics.current_query_stats.set(stats)
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.http_requests_in_flight.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - started
+            metrics.http_requests_in_flight.dec()
+            metrics.current_query_stats.reset(token)
+            route = scope.get("route")
+            labels = {"method": scope["method"], "route": getattr(route, "path", "unmatched")}
+            metrics.http_requests_total.inc(status=status, **labels)
+            metrics.http_request_duration_seconds.observe(elapsed, **labels)
+            metrics.http_request_db_queries.observe(stats.queries, **labels)
+            metrics.http_request_db_seconds.observe(stats.seconds, **labels)
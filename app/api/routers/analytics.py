@@ -0,0 +1,39 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Query
+
+from app.api.errors import BadRequestError
+from app.api.schemas import ClaimRollupOut, ClaimRollupRow
+from app.db.shards import scatter
+from app.services.rollup_service import merge_rollups, query_rollups, rollup_dimensions
+from app.utils.dates import parse_date_str
+
+
+router = APIRouter()
+
+
+@router.get("/api/analytics/claims", response_model=ClaimRollupOut, response_model_exclude_unset=True)
+def claim_analytics(
+    grain: Literal["day", "month"] = Query("month"),
+    date_from: Optional[str] = Query(None, alias="from", description="YYYY-MM-DD, inclusive"),
+    date_to: Optional[str] = Query(None, alias="to", description="YYYY-MM-DD, inclusive"),
+    group_by: str = Query("", alias="groupBy", description="comma list of: make, model, provider"),
+):
+    """Claim count and amount per day/month from the claim_rollup table, optionally by make/model/provider."""
+    try:
+        start = parse_date_str(date_from) if date_from else None
+        end = parse_date_str(date_to) if date_to else None
+        dims = rollup_dimensions(group_by.split(","))
+    except ValueError as e:
+        raise BadRequestError(str(e))
+    if start and end and end < start:
+        raise BadRequestError("to must be on or after from")
+    if grain == "month" and start is not None:
+        start = start.replace(day=1)  # month rows are keyed by their first day
+    rows, watermark = merge_rollups(scatter(lambda db: query_rollups(db, grain, start, end, dims)), dims)
+    return ClaimRollupOut(
+        grain=grain,
+        group_by=dims,
+        watermark=watermark,
+        rows=[ClaimRollupRow(**row) for row in rows],
+    )
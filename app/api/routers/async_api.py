@@ -0,0 +1,171 @@
+"""
+Async route handlers (ASYNC_DB_ENABLED).
+
+Same paths and payloads as the sync routers for the hot endpoints; app.main
+registers this router first so these handlers take precedence. Endpoints not
+listed here (bulk import, batch validity, ...) keep running on the sync stack.
+"""
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db
+from app.api.errors import BadRequestError
+from app.api.etag import make_etag, not_modified
+from app.api.fastjson import FastJSONResponse, car_dict, encode_line, encode_list, history_item_dict
+from app.api.schemas import (
+    CarOut,
+    ClaimCreate,
+    ClaimOut,
+    HistoryItem,
+    PolicyCreate,
+    PolicyOut,
+    ValidityOut,
+)
+from app.core.config import settings
+from app.db.async_session import get_async_sessionmaker
+from app.services.car_service import iter_cars_async, list_cars_page_async
+from app.services.claim_service import create_claim_async
+from app.services.history_service import (
+    HistoryCursor,
+    get_car_history_async,
+    iter_car_history_async,
+)
+from app.services.policy_service import create_policy_async
+from app.services.validity_service import is_insurance_valid_on_async
+from app.services.version_service import car_version_async, cars_version_async
+from app.utils.dates import parse_date_str
+
+router = APIRouter()
+
+
+def _optional_date(value: Optional[str]):
+    if value is None:
+        return None
+    try:
+        return parse_date_str(value)
+    except ValueError as e:
+        raise BadRequestError(str(e))
+
+
+async def _ndjson_cars(after: Optional[int]):
+    async with get_async_sessionmaker()() as db:
+        async for car in iter_cars_async(db, after=after, chunk_size=settings.STREAM_CHUNK_SIZE):
+            if settings.FAST_JSON_ENABLED:
+                yield encode_line(car_dict, car)
+            else:
+                yield CarOut.model_validate(car).model_dump_json(by_alias=True) + "\n"
+
+
+@router.get("/api/cars", response_model=List[CarOut])
+async def list_cars(
+    request: Request,
+    response: Response,
+    after: Optional[int] = Query(None, ge=0, description="Cursor: return cars with id > after"),
+    limit: int = Query(settings.CARS_PAGE_SIZE, ge=1, le=settings.CARS_PAGE_SIZE_MAX),
+    format: Literal["json", "ndjson"] = Query("json"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    etag = make_etag(request, "cars", await cars_version_async(db))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    if format == "ndjson":
+        return StreamingResponse(_ndjson_cars(after), media_type="application/x-ndjson", headers={"ETag": etag})
+
+    cars, next_cursor = await list_cars_page_async(db, after=after, limit=limit)
+    headers = {"ETag": etag}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)
+        headers["Link"] = f'</api/cars?after={next_cursor}&limit={limit}>; rel="next"'
+    if settings.FAST_JSON_ENABLED:
+        return FastJSONResponse(encode_list(car_dict, cars), headers=headers)
+    response.headers.update(headers)
+    return cars
+
+
+@router.post("/api/cars/{carId}/policies", status_code=status.HTTP_201_CREATED, response_model=PolicyOut)
+async def create_car_policy(carId: int, payload: PolicyCreate, db: AsyncSession = Depends(get_async_db)):
+    return await create_policy_async(
+        db,
+        car_id=carId,
+        provider=payload.provider,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+    )
+
+
+@router.get("/api/cars/{carId}/insurance-valid", response_model=ValidityOut)
+async def insurance_valid(
+    carId: int,
+    date: str = Query(..., description="YYYY-MM-DD"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        d = parse_date_str(date)
+    except ValueError as e:
+        raise BadRequestError(str(e))
+    valid = await is_insurance_valid_on_async(db, car_id=carId, on_date=d)
+    return ValidityOut(car_id=carId, date=d, valid=valid)
+
+
+@router.post("/api/cars/{carId}/claims", status_code=status.HTTP_201_CREATED, response_model=ClaimOut)
+async def register_claim(carId: int, payload: ClaimCreate, response: Response, db: AsyncSession = Depends(get_async_db)):
+    claim = await create_claim_async(
+        db,
+        car_id=carId,
+        claim_date=payload.claim_date,
+        description=payload.description,
+        amount=payload.amount,
+    )
+    response.headers["Location"] = f"/api/cars/{carId}/claims/{claim.id}"
+    return claim
+
+
+async def _ndjson_history(car_id: int, date_from, date_to, after):
+    async with get_async_sessionmaker()() as db:
+        async for _, item in iter_car_history_async(db, car_id, date_from, date_to, after, settings.STREAM_CHUNK_SIZE):
+            if settings.FAST_JSON_ENABLED:
+                yield encode_line(history_item_dict, item)
+            else:
+                yield item.model_dump_json(by_alias=True) + "\n"
+
+
+@router.get("/api/cars/{carId}/history", response_model=List[HistoryItem])
+async def car_history(
+    carId: int,
+    request: Request,
+    response: Response,
+    date_from: Optional[str] = Query(None, alias="from", description="YYYY-MM-DD, inclusive"),
+    date_to: Optional[str] = Query(None, alias="to", description="YYYY-MM-DD, inclusive"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.HISTORY_PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    format: Literal["json", "ndjson"] = Query("json"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    start = _optional_date(date_from)
+    end = _optional_date(date_to)
+    after = HistoryCursor.decode(cursor) if cursor else None
+
+    etag = make_etag(request, f"history:{carId}", await car_version_async(db, carId))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    if format == "ndjson":
+        return StreamingResponse(
+            _ndjson_history(carId, start, end, after), media_type="application/x-ndjson", headers={"ETag": etag}
+        )
+
+    items, next_cursor = await get_car_history_async(
+        db, car_id=carId, date_from=start, date_to=end, after=after, limit=limit
+    )
+    headers = {"ETag": etag}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor.encode()
+    if settings.FAST_JSON_ENABLED:
+        return FastJSONResponse(encode_list(history_item_dict, items), headers=headers)
+    response.headers.update(headers)
+    return items
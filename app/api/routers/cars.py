@@ -1,17 +1,59 @@
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
-
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from app.api.schemas import CarOut
-from app.api.deps import get_db
-from app.db.models import Car
+from app.api.etag import make_etag, not_modified
+from app.api.fastjson import FastJSONResponse, car_dict, encode_line, encode_list
+from app.core.config import settings
+from app.db.shards import merge_pages, merged_stream, scatter
+from app.services.car_service import list_cars_page, iter_cars
+from app.services.version_service import cars_version
 
 router = APIRouter()
 
+
+def _ndjson_cars(after: Optional[int]):
+    # Own sessions (one per shard, merged by id): the body is streamed after the handler has returned
+    with merged_stream(
+        lambda db: iter_cars(db, after=after, chunk_size=settings.STREAM_CHUNK_SIZE), key=lambda car: car.id
+    ) as cars:
+        for car in cars:
+            if settings.FAST_JSON_ENABLED:
+                yield encode_line(car_dict, car)
+            else:
+                yield CarOut.model_validate(car).model_dump_json(by_alias=True) + "\n"
+
+
 @router.get("/api/cars", response_model=List[CarOut])
-def list_cars(db: Session = Depends(get_db)):
-    stmt = select(Car).options(selectinload(Car.owner)).order_by(Car.id)
-    cars = db.execute(stmt).scalars().all()
+def list_cars(
+    request: Request,
+    response: Response,
+    after: Optional[int] = Query(None, ge=0, description="Cursor: return cars with id > after"),
+    limit: int = Query(settings.CARS_PAGE_SIZE, ge=1, le=settings.CARS_PAGE_SIZE_MAX),
+    format: Literal["json", "ndjson"] = Query("json"),
+):
+    # Version read before the data, so a concurrent write can only make the tag older.
+    # Sharded: sum of the per-shard counters, which only grow, so any bump changes it
+    etag = make_etag(request, "cars", sum(scatter(cars_version)))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    if format == "ndjson":
+        # Streams the whole fleet from `after` onwards; `limit` does not apply
+        return StreamingResponse(
+            _ndjson_cars(after), media_type="application/x-ndjson", headers={"ETag": etag}
+        )
+
+    # Scatter-gather: a keyset page from every shard, merged by id
+    pages = scatter(lambda db: list_cars_page(db, after=after, limit=limit))
+    cars, next_cursor = merge_pages(pages, limit, key=lambda car: car.id)
+    headers = {"ETag": etag}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)
+        headers["Link"] = f'</api/cars?after={next_cursor}&limit={limit}>; rel="next"'
+    if settings.FAST_JSON_ENABLED:
+        return FastJSONResponse(encode_list(car_dict, cars), headers=headers)
+    response.headers.update(headers)
     # FastAPI+pydantic v2 will serialize using aliases for fields with serialization_alias
-    return cars
\ No newline at end of file
+    return cars
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, status, Response
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request, status, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.api.schemas import ClaimCreate, ClaimOut
+from app.api.deps import get_car_db
+from app.api.errors import BadRequestError
+from app.api.schemas import ClaimCreate, ClaimOut, ClaimIngestReport
+from app.api.uploads import UPLOAD_OPENAPI, iter_body, run_upload
+from app.core.config import settings
+from app.db.shards import run_partitioned
 from app.services.claim_service import create_claim
+from app.services.claim_ingest_service import ingest_claims
+from app.utils.bulk_io import detect_format, iter_lines, iter_records
 
 router = APIRouter()
 
 @router.post("/api/cars/{carId}/claims", status_code=status.HTTP_201_CREATED, response_model=ClaimOut)
-def register_claim(carId: int, payload: ClaimCreate, response: Response, db: Session = Depends(get_db)):
+def register_claim(carId: int, payload: ClaimCreate, response: Response, db: Session = Depends(get_car_db)):
     claim = create_claim(
         db,
         car_id=carId,
@@ -17,4 +24,27 @@ def register_claim(carId: int, payload: ClaimCreate, response: Response, db: Ses
         amount=payload.amount,
     )
     response.headers["Location"] = f"/api/cars/{carId}/claims/{claim.id}"
-    return claim
\ No newline at end of file
+    return claim
+
+@router.post("/api/claims/import", response_model=ClaimIngestReport, openapi_extra=UPLOAD_OPENAPI)
+async def import_claims_bulk(
+    request: Request,
+    format: Optional[Literal["ndjson", "csv"]] = Query(None, description="Defaults from Content-Type"),
+):
+    """NDJSON or CSV rows with carId, claimDate, description, amount (any Content-Type)."""
+    fmt = format or detect_format(request.headers.get("content-type"))
+
+    def run() -> ClaimIngestReport:
+        # lazily from the request stream: one chunk of rows in memory at a time
+        try:
+            reports = run_partitioned(
+                iter_records(iter_lines(iter_body(request)), fmt),
+                lambda db, records: ingest_claims(db, records, chunk_size=settings.CLAIM_INGEST_CHUNK_SIZE),
+                chunk_size=settings.CLAIM_INGEST_CHUNK_SIZE,
+            )
+        except UnicodeDecodeError:
+            # CSV only (NDJSON reports the line); chunks before it stay ingested
+            raise BadRequestError("Import body must be UTF-8 encoded; rows before the bad line were ingested")
+        return ClaimIngestReport.merge(reports)
+
+    return await run_upload(run)
@@ -0,0 +1,85 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_car_read_db
+from app.api.errors import BadRequestError
+from app.api.etag import make_etag, not_modified
+from app.api.schemas import (
+    CarCoverageOut,
+    CoverageBatchIn,
+    CoverageBatchItemOut,
+    CoverageBatchOut,
+    CoverageInterval,
+)
+from app.db.shards import scatter_by_car
+from app.services.coverage_service import get_coverage, get_coverage_batch
+from app.services.version_service import car_version
+from app.utils.dates import parse_date_str
+
+
+router = APIRouter()
+
+
+def _intervals(pairs) -> list[CoverageInterval]:
+    return [CoverageInterval(start_date=s, end_date=e, days=(e - s).days + 1) for s, e in pairs]
+
+
+def _coverage_out(cls, car_id: int, date_from: date, date_to: date, covered, gaps, **extra):
+    covered_out, gaps_out = _intervals(covered), _intervals(gaps)
+    return cls(
+        car_id=car_id,
+        date_from=date_from,
+        date_to=date_to,
+        covered_days=sum(i.days for i in covered_out),
+        uncovered_days=sum(i.days for i in gaps_out),
+        covered=covered_out,
+        gaps=gaps_out,
+        **extra,
+    )
+
+
+@router.get("/api/cars/{carId}/coverage", response_model=CarCoverageOut)
+def car_coverage(
+    carId: int,
+    request: Request,
+    response: Response,
+    date_from: str = Query(..., alias="from", description="YYYY-MM-DD, inclusive"),
+    date_to: str = Query(..., alias="to", description="YYYY-MM-DD, inclusive"),
+    db: Session = Depends(get_car_read_db),
+):
+    """Merged covered intervals and uncovered gaps of a car within [from, to]."""
+    try:
+        start = parse_date_str(date_from)
+        end = parse_date_str(date_to)
+    except ValueError as e:
+        raise BadRequestError(str(e))
+    if end < start:
+        raise BadRequestError("to must be on or after from")
+    etag = make_etag(request, f"coverage:{carId}", car_version(db, carId))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    covered, gaps = get_coverage(db, car_id=carId, date_from=start, date_to=end)
+    response.headers["ETag"] = etag
+    return _coverage_out(CarCoverageOut, carId, start, end, covered, gaps)
+
+
+@router.post("/api/cars/coverage/batch", response_model=CoverageBatchOut)
+def car_coverage_batch(payload: CoverageBatchIn):
+    """Coverage of up to 1000 cars over one range, in input order; unknown cars have found=false."""
+    start, end = payload.date_from, payload.date_to
+
+    def shard_coverage(db: Session, car_ids: list[int]) -> list:
+        by_car = get_coverage_batch(db, car_ids, start, end)
+        return [by_car.get(car_id) for car_id in car_ids]
+
+    coverage = scatter_by_car(payload.car_ids, lambda car_id: car_id, shard_coverage)
+    results = []
+    for car_id, found in zip(payload.car_ids, coverage):
+        if found is not None:
+            results.append(_coverage_out(CoverageBatchItemOut, car_id, start, end, *found))
+        else:
+            results.append(_coverage_out(CoverageBatchItemOut, car_id, start, end, [], [], found=False))
+    return CoverageBatchOut(results=results)
@@ -1,16 +1,79 @@
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 
-from app.api.deps import get_db
+from app.api.deps import get_car_read_db
+from app.api.errors import BadRequestError
+from app.api.etag import make_etag, not_modified
+from app.api.fastjson import FastJSONResponse, encode_line, encode_list, history_item_dict
 from app.api.schemas import HistoryItem
-from app.services.history_service import get_car_history
+from app.core.config import settings
+from app.db.shards import car_read_session
+from app.services.history_service import (
+    HistoryCursor,
+    get_car_history,
+    iter_car_history,
+)
+from app.services.version_service import car_version
+from app.utils.dates import parse_date_str
 
 
 router = APIRouter()
 
 
+def _optional_date(value: Optional[str]):
+    if value is None:
+        return None
+    try:
+        return parse_date_str(value)
+    except ValueError as e:
+        raise BadRequestError(str(e))
+
+
+def _ndjson_history(car_id: int, date_from, date_to, after):
+    # Own session: the request-scoped one is closed before the body is streamed
+    with car_read_session(car_id) as db:
+        for _, item in iter_car_history(db, car_id, date_from, date_to, after, settings.STREAM_CHUNK_SIZE):
+            if settings.FAST_JSON_ENABLED:
+                yield encode_line(history_item_dict, item)
+            else:
+                yield item.model_dump_json(by_alias=True) + "\n"
+
+
 @router.get("/api/cars/{carId}/history", response_model=List[HistoryItem])
-def car_history(carId: int, db: Session = Depends(get_db)):
-    return get_car_history(db, car_id=carId)
\ No newline at end of file
+def car_history(
+    carId: int,
+    request: Request,
+    response: Response,
+    date_from: Optional[str] = Query(None, alias="from", description="YYYY-MM-DD, inclusive"),
+    date_to: Optional[str] = Query(None, alias="to", description="YYYY-MM-DD, inclusive"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.HISTORY_PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    format: Literal["json", "ndjson"] = Query("json"),
+    db: Session = Depends(get_car_read_db),
+):
+    start = _optional_date(date_from)
+    end = _optional_date(date_to)
+    after = HistoryCursor.decode(cursor) if cursor else None
+
+    # One primary-key lookup (also the 404 check); policies/claims only load on a miss
+    etag = make_etag(request, f"history:{carId}", car_version(db, carId))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    if format == "ndjson":
+        return StreamingResponse(
+            _ndjson_history(carId, start, end, after), media_type="application/x-ndjson", headers={"ETag": etag}
+        )
+
+    items, next_cursor = get_car_history(db, car_id=carId, date_from=start, date_to=end, after=after, limit=limit)
+    headers = {"ETag": etag}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor.encode()
+    if settings.FAST_JSON_ENABLED:
+        return FastJSONResponse(encode_list(history_item_dict, items), headers=headers)
+    response.headers.update(headers)
+    return items
@@ -1,17 +1,32 @@
-from fastapi import APIRouter, Depends, status, Query
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Request, status, Query
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.api.schemas import PolicyCreate, PolicyOut, ValidityOut
+from app.api.deps import get_car_db, get_validity_db
+from app.api.schemas import (
+    PolicyCreate,
+    PolicyOut,
+    ValidityOut,
+    ValidityBatchIn,
+    ValidityBatchOut,
+    ValidityBatchItemOut,
+    ImportReport,
+)
+from app.core.config import settings
+from app.db.shards import run_partitioned, scatter_by_car
 from app.services.policy_service import create_policy
-from app.services.validity_service import is_insurance_valid_on
+from app.services.policy_import_service import import_policies
+from app.services.validity_service import is_insurance_valid_on, check_validity_batch
 from app.utils.dates import parse_date_str
+from app.utils.bulk_io import detect_format, iter_lines, iter_records
 from app.api.errors import BadRequestError
+from app.api.fastjson import FastJSONResponse
+from app.api.uploads import UPLOAD_OPENAPI, iter_body, run_upload
 
 router = APIRouter()
 
 @router.post("/api/cars/{carId}/policies", status_code=status.HTTP_201_CREATED, response_model=PolicyOut)
-def create_car_policy(carId: int, payload: PolicyCreate, db: Session = Depends(get_db)):
+def create_car_policy(carId: int, payload: PolicyCreate, db: Session = Depends(get_car_db)):
     policy = create_policy(
         db,
         car_id=carId,
@@ -22,10 +37,48 @@ def create_car_policy(carId: int, payload: PolicyCreate, db: Session = Depends(g
     return policy
 
 @router.get("/api/cars/{carId}/insurance-valid", response_model=ValidityOut)
-def insurance_valid(carId: int, date: str = Query(..., description="YYYY-MM-DD"), db: Session = Depends(get_db)):
+def insurance_valid(carId: int, date: str = Query(..., description="YYYY-MM-DD"), db: Session = Depends(get_validity_db)):
     try:
         d = parse_date_str(date)
     except ValueError as e:
         raise BadRequestError(str(e))
     valid = is_insurance_valid_on(db, car_id=carId, on_date=d)
-    return ValidityOut(car_id=carId, date=d, valid=valid)
\ No newline at end of file
+    return ValidityOut(car_id=carId, date=d, valid=valid)
+
+@router.post("/api/cars/insurance-valid/batch", response_model=ValidityBatchOut)
+def insurance_valid_batch(payload: ValidityBatchIn):
+    pairs = [(item.car_id, item.date) for item in payload.items]
+    results = scatter_by_car(pairs, lambda pair: pair[0], check_validity_batch)
+    if settings.FAST_JSON_ENABLED:
+        return FastJSONResponse({"results": [
+            {"carId": car_id, "date": d, "valid": valid, "found": found}
+            for (car_id, d), (found, valid) in zip(pairs, results)
+        ]})
+    return ValidityBatchOut(results=[
+        ValidityBatchItemOut(car_id=car_id, date=d, valid=valid, found=found)
+        for (car_id, d), (found, valid) in zip(pairs, results)
+    ])
+
+
+@router.post("/api/policies/import", response_model=ImportReport, openapi_extra=UPLOAD_OPENAPI)
+async def import_policies_bulk(
+    request: Request,
+    format: Optional[Literal["ndjson", "csv"]] = Query(None, description="Defaults from Content-Type"),
+):
+    """NDJSON or CSV rows with carId, provider, startDate, endDate (any Content-Type)."""
+    fmt = format or detect_format(request.headers.get("content-type"))
+
+    def run() -> ImportReport:
+        try:
+            reports = run_partitioned(
+                iter_records(iter_lines(iter_body(request)), fmt),
+                lambda db, records: import_policies(
+                    db, records, batch_size=settings.IMPORT_BATCH_SIZE, group_size=settings.IMPORT_LOCK_GROUP_SIZE,
+                ),
+            )
+        except UnicodeDecodeError:
+            # CSV only (NDJSON reports the line); rows are all read before the first write
+            raise BadRequestError("Import body must be UTF-8 encoded")
+        return ImportReport.merge(reports)
+
+    return await run_upload(run)
@@ -0,0 +1,42 @@
+from datetime import date as date_type
+from typing import Literal
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.errors import BadRequestError
+from app.core.config import settings
+from app.db.shards import merged_stream
+from app.services.report_service import UNINSURED_COLUMNS, iter_uninsured_cars
+from app.utils.bulk_io import iter_export
+from app.utils.dates import parse_date_str
+
+
+router = APIRouter()
+
+_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def _stream_uninsured(on_date: date_type, fmt: str):
+    # Own sessions (one per shard, merged by car id): the body is streamed after the handler has returned
+    with merged_stream(
+        lambda db: iter_uninsured_cars(db, on_date, chunk_size=settings.STREAM_CHUNK_SIZE),
+        key=lambda row: row[0],
+    ) as rows:
+        yield from iter_export(UNINSURED_COLUMNS, rows, fmt, rows_per_chunk=settings.STREAM_CHUNK_SIZE)
+
+
+@router.get("/api/reports/uninsured-cars")
+def uninsured_cars_report(
+    date: str = Query(..., description="YYYY-MM-DD"),
+    format: Literal["csv", "ndjson"] = Query("csv"),
+):
+    """Every car without a policy covering `date`, with its owner, streamed as CSV or NDJSON."""
+    try:
+        d = parse_date_str(date)
+    except ValueError as e:
+        raise BadRequestError(str(e))
+    headers = {}
+    if format == "csv":
+        headers["Content-Disposition"] = f'attachment; filename="uninsured-cars-{d.isoformat()}.csv"'
+    return StreamingResponse(_stream_uninsured(d, format), media_type=_MEDIA_TYPES[format], headers=headers)
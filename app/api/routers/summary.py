@@ -0,0 +1,44 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_car_read_db
+from app.api.etag import make_etag, not_modified
+from app.api.schemas import CarSummaryOut
+from app.core.config import settings
+from app.db.shards import merge_pages, scatter
+from app.services.summary_service import get_car_summary, list_car_summaries
+from app.services.version_service import car_version
+
+
+router = APIRouter()
+
+
+@router.get("/api/cars/summary", response_model=List[CarSummaryOut])
+def car_summaries(
+    response: Response,
+    after: Optional[int] = Query(None, ge=0, description="Cursor: return cars with id > after"),
+    limit: int = Query(settings.CARS_PAGE_SIZE, ge=1, le=settings.CARS_PAGE_SIZE_MAX),
+):
+    """Keyset page of per-car summaries (read from car_summary, no aggregates)."""
+    today = date.today()
+    pages = scatter(lambda db: list_car_summaries(db, after=after, limit=limit, today=today))
+    items, next_cursor = merge_pages(pages, limit, key=lambda item: item.car_id)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+        response.headers["Link"] = f'</api/cars/summary?after={next_cursor}&limit={limit}>; rel="next"'
+    return items
+
+
+@router.get("/api/cars/{carId}/summary", response_model=CarSummaryOut)
+def car_summary(carId: int, request: Request, response: Response, db: Session = Depends(get_car_read_db)):
+    """Claim count/total, policy count, latest and current policy of one car."""
+    # currentPolicy depends on today's date, so the day is part of the tag
+    etag = make_etag(request, f"summary:{carId}:{date.today().isoformat()}", car_version(db, carId))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
+    return get_car_summary(db, carId)
@@ -46,6 +46,37 @@ class PolicyCreate(BaseModel):
         return self
 
 
+class PolicyImportRow(PolicyCreate):
+    car_id: int = Field(validation_alias="carId")
+
+
+class ImportRowError(BaseModel):
+    row: int
+    car_id: int | None = Field(default=None, serialization_alias="carId")
+    detail: str
+
+
+class ImportReport(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = Field(default_factory=list)
+
+    @classmethod
+    def merge(cls, reports: list["ImportReport"]):
+        """One report from per-shard reports of the same import."""
+        if len(reports) == 1:
+            return reports[0]
+        merged = cls()
+        for r in reports:
+            merged.total += r.total
+            merged.inserted += r.inserted
+            merged.errors.extend(r.errors)
+        merged.errors.sort(key=lambda e: e.row)
+        merged.failed = len(merged.errors)
+        return merged
+
+
 class PolicyOut(BaseModel):
     id: int
     car_id: int = Field(serialization_alias="carId")
@@ -55,6 +86,21 @@ class PolicyOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CarSummaryOut(BaseModel):
+    car_id: int = Field(serialization_alias="carId")
+    claim_count: int = Field(serialization_alias="claimCount")
+    claim_total: Decimal = Field(serialization_alias="claimTotal")
+    last_claim_date: date | None = Field(default=None, serialization_alias="lastClaimDate")
+    policy_count: int = Field(serialization_alias="policyCount")
+    # latest policy by start date; currentPolicy is the one covering today (server date), if any
+    latest_policy: PolicyOut | None = Field(default=None, serialization_alias="latestPolicy")
+    current_policy: PolicyOut | None = Field(default=None, serialization_alias="currentPolicy")
+
+    @field_serializer("claim_total")
+    def _total_to_float(self, v: Decimal):
+        return float(v)
+
+
 class ValidityOut(BaseModel):
     car_id: int = Field(serialization_alias="carId")
     date: date
@@ -62,6 +108,102 @@ class ValidityOut(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
+class ValidityQuery(BaseModel):
+    car_id: int = Field(validation_alias="carId")
+    date: date
+
+    @field_validator("date")
+    @classmethod
+    def _in_range(cls, v: date):
+        if v.year < 1900 or v.year > 2100:
+            raise ValueError("Date must be between 1900 and 2100")
+        return v
+
+
+class ValidityBatchIn(BaseModel):
+    # Upper bound keeps the IN (...) list and the response size reasonable
+    items: list[ValidityQuery] = Field(min_length=1, max_length=1000)
+
+
+class ValidityBatchItemOut(BaseModel):
+    car_id: int = Field(serialization_alias="carId")
+    date: date
+    valid: bool
+    # False when the car does not exist (valid is then always False)
+    found: bool = True
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ValidityBatchOut(BaseModel):
+    results: list[ValidityBatchItemOut]
+
+
+class CoverageInterval(BaseModel):
+    start_date: date = Field(serialization_alias="startDate")
+    end_date: date = Field(serialization_alias="endDate")
+    days: int
+
+
+class CarCoverageOut(BaseModel):
+    car_id: int = Field(serialization_alias="carId")
+    date_from: date = Field(serialization_alias="from")
+    date_to: date = Field(serialization_alias="to")
+    covered_days: int = Field(serialization_alias="coveredDays")
+    uncovered_days: int = Field(serialization_alias="uncoveredDays")
+    covered: list[CoverageInterval]
+    gaps: list[CoverageInterval]
+
+
+class CoverageBatchIn(BaseModel):
+    car_ids: list[int] = Field(validation_alias="carIds", min_length=1, max_length=1000)
+    date_from: date = Field(validation_alias="from")
+    date_to: date = Field(validation_alias="to")
+
+    @field_validator("date_from", "date_to")
+    @classmethod
+    def _in_range(cls, v: date):
+        if v.year < 1900 or v.year > 2100:
+            raise ValueError("Date must be between 1900 and 2100")
+        return v
+
+    @model_validator(mode="after")
+    def _to_after_from(self):
+        if self.date_to < self.date_from:
+            raise ValueError("to must be on or after from")
+        return self
+
+
+class CoverageBatchItemOut(CarCoverageOut):
+    # False when the car does not exist (covered/gaps are then empty)
+    found: bool = True
+
+
+class CoverageBatchOut(BaseModel):
+    results: list[CoverageBatchItemOut]
+
+
+class ClaimRollupRow(BaseModel):
+    period_start: date = Field(serialization_alias="period")
+    # only the groupBy dimensions are set (null = unknown make/model or no active policy)
+    make: str | None = None
+    model: str | None = None
+    provider: str | None = None
+    claim_count: int = Field(serialization_alias="claimCount")
+    amount_total: Decimal = Field(serialization_alias="amountTotal")
+
+    @field_serializer("amount_total")
+    def _total_to_float(self, v: Decimal):
+        return float(v)
+
+
+class ClaimRollupOut(BaseModel):
+    grain: Literal["day", "month"]
+    group_by: list[str] = Field(serialization_alias="groupBy")
+    # id of the last claim included; newer claims show up after the next refresh
+    watermark: int
+    rows: list[ClaimRollupRow]
+
+
 class ClaimCreate(BaseModel):
     claim_date: date = Field(validation_alias="claimDate")
     description: str
@@ -94,6 +236,25 @@ class ClaimCreate(BaseModel):
             raise ValueError("amount is too large")
         return v
 
+class ClaimImportRow(ClaimCreate):
+    car_id: int = Field(validation_alias="carId")
+
+
+class ClaimIngestReport(ImportReport):
+    elapsed_seconds: float = Field(default=0.0, serialization_alias="elapsedSeconds")
+    rows_per_second: float = Field(default=0.0, serialization_alias="rowsPerSecond")
+
+    @classmethod
+    def merge(cls, reports: list["ClaimIngestReport"]):
+        merged = super().merge(reports)
+        if len(reports) > 1:
+            # shards are ingested one after the other
+            merged.elapsed_seconds = round(sum(r.elapsed_seconds for r in reports), 3)
+            if merged.elapsed_seconds > 0:
+                merged.rows_per_second = round(merged.inserted / merged.elapsed_seconds, 1)
+        return merged
+
+
 class ClaimOut(BaseModel):
     id: int
     car_id: int = Field(serialization_alias="carId")
@@ -0,0 +1,40 @@
+"""
+Bulk upload bodies read as a stream. The import handlers are async only to reach
+request.stream(); the import itself is blocking DB work, so it runs in a worker
+thread (run_upload) and pulls the body from there one chunk at a time. Memory is
+bounded by what the import buffers, not by the upload size.
+"""
+from typing import Callable, Iterator, TypeVar
+
+import anyio.from_thread
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+# documents the accepted bodies (the handlers take no Body parameter, which would JSON-decode it)
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/x-ndjson": {"schema": {"type": "string"}},
+            "text/csv": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+def iter_body(request: Request) -> Iterator[bytes]:
+    """request.stream() as a blocking iterator; only usable from run_upload's worker thread."""
+    stream = request.stream().__aiter__()
+    while True:
+        try:
+            chunk = anyio.from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            return
+        if chunk:
+            yield chunk
+
+
+async def run_upload(fn: Callable[[], T]) -> T:
+    return await run_in_threadpool(fn)
@@ -4,7 +4,92 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+pysqlite:///./dev.db"
     SCHEDULER_ENABLED: bool = False
     SCHEDULER_TEST_MODE: bool = False
+    # Only the holder of a DB lease runs scheduled jobs (safe with several workers)
+    SCHEDULER_LEADER_ELECTION: bool = True
+    SCHEDULER_LEASE_TTL_SECONDS: float = 60.0
+    SCHEDULER_HEARTBEAT_SECONDS: float = 15.0
+    # Policy-expiry job: rows per set-based UPDATE, and chunks per run
+    EXPIRY_CHUNK_SIZE: int = 500
+    EXPIRY_MAX_CHUNKS_PER_RUN: int = 100
+    # Claim analytics rollups: incremental refresh job (leader-only)
+    ROLLUP_ENABLED: bool = True
+    ROLLUP_REFRESH_MINUTES: int = 5
+    ROLLUP_CHUNK_SIZE: int = 50_000
+    # only claims older than this are rolled up, so slow concurrent inserts are not skipped
+    ROLLUP_SAFETY_LAG_SECONDS: int = 60
+    # full rebuild that picks up claims the watermark skipped (committed later than the lag); 0 disables
+    ROLLUP_RECONCILE_HOURS: float = 24.0
     LOG_LEVEL: str = "DEBUG"
+    # Logs are queued and written by a background thread; full queue -> drop + count
+    LOG_ASYNC: bool = True
+    LOG_QUEUE_SIZE: int = 10_000
+    # Per-event keep probability, e.g. {"insurance_validity_checked": 0.01}
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+    # Audit events never sampled out (warnings and errors are always kept too)
+    LOG_ALWAYS_KEEP: list[str] = ["policy_created", "claim_created", "policy_expired", "policy_expired_msg"]
+    # Prometheus-format /metrics endpoint + request/DB instrumentation
+    METRICS_ENABLED: bool = True
+
+    # Connection pool (sizing applies to QueuePool engines: Postgres, SQLite files)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 disables
+    DB_POOL_TIMEOUT: float = 30.0
+
+    # SQLite PRAGMAs applied on every connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -20000  # negative = KiB (~20 MB)
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB
+
+    # Per-car write locks (policy and claim writes / imports): lock wait on PostgreSQL
+    # (SQLite waits SQLITE_BUSY_TIMEOUT_MS), then retries with jittered backoff
+    CAR_LOCK_TIMEOUT_MS: int = 2000
+    CAR_LOCK_RETRIES: int = 3
+    CAR_LOCK_BACKOFF_MS: int = 25
+
+    # Read replicas for read-only endpoints (JSON list of URLs; empty = primary only).
+    # A replica failing to connect is skipped for READ_REPLICA_RETRY_SECONDS.
+    READ_DATABASE_URLS: list[str] = []
+    READ_REPLICA_RETRY_SECONDS: float = 30.0
+
+    # Hash sharding of car-scoped data (JSON list of URLs; empty = everything on DATABASE_URL).
+    # DATABASE_URL keeps the scheduler lease; changing the list requires a reshard.
+    SHARD_DATABASE_URLS: list[str] = []
+
+    # Opt-in async stack (AsyncEngine + async route handlers).
+    # ASYNC_DATABASE_URL defaults to DATABASE_URL with an async driver
+    # (sqlite -> aiosqlite, postgresql / postgresql+psycopg2 -> psycopg async; async URLs are kept).
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+
+    # In-process set of known car ids (bitmap) replacing the per-request car lookup
+    CAR_REGISTRY_ENABLED: bool = True
+    CAR_REGISTRY_MAX_ID: int = 50_000_000  # ids above this always hit the DB (bitmap <= ~6 MB)
+
+    # In-process policy interval index for validity checks (per worker)
+    VALIDITY_INDEX_ENABLED: bool = False
+    VALIDITY_INDEX_MAX_CARS: int = 10_000
+    VALIDITY_INDEX_TTL_SECONDS: float = 30.0
+
+    # Serialize list/history/stream responses straight from rows to JSON bytes
+    FAST_JSON_ENABLED: bool = False
+
+    # Pagination / streaming
+    CARS_PAGE_SIZE: int = 100
+    CARS_PAGE_SIZE_MAX: int = 1000
+    STREAM_CHUNK_SIZE: int = 500
+    HISTORY_PAGE_SIZE_MAX: int = 1000
+
+    # Bulk policy import: rows per INSERT statement (one transaction per group of locked cars)
+    IMPORT_BATCH_SIZE: int = 1000
+    # Cars write-locked, checked and committed together (max 500); bounds how long
+    # single-policy writes to those cars wait (CAR_LOCK_TIMEOUT_MS)
+    IMPORT_LOCK_GROUP_SIZE: int = 100
+    # Bulk claim ingestion: rows validated / existence-checked / inserted per chunk
+    CLAIM_INGEST_CHUNK_SIZE: int = 2000
 
     # .env support; keep case-sensitive so keys must match exactly
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
@@ -0,0 +1,5 @@
+from contextvars import ContextVar
+from typing import Optional
+
+# Request id of the request being handled (set by RequestIDMiddleware)
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
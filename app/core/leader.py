@@ -0,0 +1,110 @@
+# app/core/leader.py
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Optional
+
+import structlog
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.db.session import SessionLocal
+from app.db.models import SchedulerLease
+
+log = structlog.get_logger()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class LeaderLease:
+    """
+    DB-backed lease so exactly one worker runs the scheduled jobs.
+
+    heartbeat() acquires the lease when it is free or expired and renews it while
+    held; a worker that stops heartbeating loses it after `ttl_seconds` and another
+    worker takes over on its next heartbeat. Workers compare wall-clock times, so
+    the TTL should be well above the clock skew between hosts.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, holder: Optional[str] = None):
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._leader = False
+        # local deadline (monotonic) after which we stop trusting our last renewal
+        self._valid_until = 0.0
+
+    def is_leader(self) -> bool:
+        with self._lock:
+            return self._leader and monotonic() < self._valid_until
+
+    def _try_acquire(self) -> bool:
+        now = _utcnow()
+        values = {"holder": self.holder, "expires_at": now + self.ttl}
+        with SessionLocal() as db:
+            renewed = db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name)
+                .where(or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if renewed.rowcount:
+                db.commit()
+                return True
+            try:
+                db.execute(insert(SchedulerLease).values(name=self.name, acquired_at=now, **values))
+                db.commit()
+                return True
+            except IntegrityError:
+                # row exists and is held by another, unexpired worker
+                db.rollback()
+                return False
+
+    def heartbeat(self) -> bool:
+        """Acquire or renew the lease; returns whether this worker is the leader."""
+        started = monotonic()
+        try:
+            acquired = self._try_acquire()
+        except Exception:
+            log.exception("scheduler_lease_heartbeat_failed", lease=self.name)
+            acquired = False
+
+        with self._lock:
+            was_leader = self._leader
+            self._leader = acquired
+            if acquired:
+                self._valid_until = started + self.ttl.total_seconds()
+        if acquired and not was_leader:
+            log.info("scheduler_leader_acquired", lease=self.name, holder=self.holder)
+        elif was_leader and not acquired:
+            log.warning("scheduler_leader_lost", lease=self.name, holder=self.holder)
+        return acquired
+
+    def release(self) -> None:
+        """Give up the lease (on shutdown) so another worker can take over immediately."""
+        with self._lock:
+            if not self._leader:
+                return
+            self._leader = False
+        try:
+            with SessionLocal() as db:
+                db.execute(
+                    update(SchedulerLease)
+                    .where(SchedulerLease.name == self.name)
+                    .where(SchedulerLease.holder == self.holder)
+                    .values(expires_at=_utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+            log.info("scheduler_leader_released", lease=self.name, holder=self.holder)
+        except Exception:
+            log.exception("scheduler_lease_release_failed", lease=self.name)
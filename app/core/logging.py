@@ -1,23 +1,22 @@
+from __future__ import annotations
+
+import atexit
+import json
 import logging
+import queue
+import random
+import sys
+import threading
+from typing import Optional, TextIO
+
 import structlog
-from .config import settings
-from __future__ import annotations
 from structlog.processors import TimeStamper
+
+from .config import settings
 from app.core.context import request_id  # <-- import the context var
 
+_ALWAYS_KEPT_LEVELS = {"warning", "warn", "error", "critical", "exception", "fatal"}
 
-structlog.configure(
-        processors=[
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.add_log_level,
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.dev.ConsoleRenderer(),  # pretty in dev; JSON later in prod
-        ],
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
-        cache_logger_on_first_use=True,
-)
 
 def add_request_id(_, __, event_dict):
     rid = request_id.get()
@@ -25,15 +24,147 @@ def add_request_id(_, __, event_dict):
         event_dict["request_id"] = rid
     return event_dict
 
-def setup_logging(level: str = "INFO") -> None:
+
+class EventSampler:
+    """
+    Per-event sampling: keeps an event with probability LOG_SAMPLE_RATES[event].
+    Warnings/errors and events listed in LOG_ALWAYS_KEEP (audit events such as
+    policy_created) are never dropped. Kept sampled events carry `sample_rate`.
+    """
+
+    def __init__(self, rates: dict[str, float], always_keep: set[str]):
+        self.rates = rates
+        self.always_keep = always_keep
+        self.sampled_out = 0
+
+    def __call__(self, _, method_name, event_dict):
+        if method_name in _ALWAYS_KEPT_LEVELS:
+            return event_dict
+        event = event_dict.get("event")
+        if event in self.always_keep:
+            return event_dict
+        rate = self.rates.get(event)
+        if rate is None or rate >= 1:
+            return event_dict
+        if random.random() >= rate:
+            self.sampled_out += 1
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+class QueueLogWriter:
+    """
+    Bounded queue + background thread: request threads only enqueue the event
+    dict; JSON rendering and the stdout write happen on the writer thread.
+    When the queue is full the event is dropped and counted instead of blocking.
+    """
+
+    _STOP = object()
+
+    def __init__(self, maxsize: int, stream: TextIO = sys.stdout):
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stream = stream
+        self.written = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, event_dict: dict) -> None:
+        try:
+            self._queue.put_nowait(event_dict)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._stream.flush()
+                return
+            try:
+                self._stream.write(json.dumps(item, default=str) + "\n")
+                self.written += 1
+            except Exception:
+                self.dropped += 1
+            if self._queue.empty():
+                self._stream.flush()
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Flush what is queued (used at interpreter exit)."""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(self._STOP, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class QueueLogger:
+    """structlog logger that hands the finished event dict to a QueueLogWriter."""
+
+    def __init__(self, writer: QueueLogWriter):
+        self._writer = writer
+
+    def msg(self, event_dict: dict) -> None:
+        self._writer.submit(event_dict)
+
+    debug = info = warning = warn = error = critical = exception = fatal = log = msg
+
+
+def _enqueue(_, __, event_dict):
+    # final processor: pass the dict itself (not a rendered string) to QueueLogger.msg
+    return (event_dict,), {}
+
+
+_writer: Optional[QueueLogWriter] = None
+_sampler: Optional[EventSampler] = None
+
+
+def setup_logging(level: Optional[str] = None) -> None:
+    """Configure structlog once (JSON lines, request_id, sampling, async writer)."""
+    global _writer, _sampler
+    level_no = logging.getLevelName((level or settings.LOG_LEVEL).upper())
+    if not isinstance(level_no, int):
+        level_no = logging.INFO
+
+    _sampler = EventSampler(settings.LOG_SAMPLE_RATES, set(settings.LOG_ALWAYS_KEEP))
+    processors = [
+        _sampler,                              # drop sampled-out events before doing any work
+        TimeStamper(fmt="iso"),                # timestamp
+        structlog.processors.add_log_level,    # level
+        add_request_id,                        # <-- add request_id
+        structlog.processors.format_exc_info,
+        structlog.processors.EventRenamer("message"),
+    ]
+
+    if settings.LOG_ASYNC:
+        if _writer is None:
+            _writer = QueueLogWriter(settings.LOG_QUEUE_SIZE)
+            atexit.register(_writer.close)
+        writer = _writer
+        processors.append(_enqueue)
+        logger_factory = lambda *args: QueueLogger(writer)  # noqa: E731
+    else:
+        processors.append(structlog.processors.JSONRenderer())  # nice structured JSON
+        logger_factory = structlog.PrintLoggerFactory()
+
     structlog.configure(
-        processors=[
-            TimeStamper(fmt="iso"),                # timestamp
-            structlog.processors.add_log_level,    # level
-            add_request_id,                        # <-- add request_id
-            structlog.processors.EventRenamer("message"),
-            structlog.processors.JSONRenderer(),   # nice structured JSON
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(getattr(structlog, level, 20)),
+        processors=processors,
+        logger_factory=logger_factory,
+        wrapper_class=structlog.make_filtering_bound_logger(level_no),
         cache_logger_on_first_use=True,
-    )
\ No newline at end of file
+    )
+
+
+def log_pipeline_stats() -> dict:
+    """Counters of the log pipeline (for metrics)."""
+    return {
+        "queued": _writer.qsize() if _writer else 0,
+        "written": _writer.written if _writer else 0,
+        "dropped": _writer.dropped if _writer else 0,
+        "sampledOut": _sampler.sampled_out if _sampler else 0,
+    }
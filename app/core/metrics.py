@@ -0,0 +1,274 @@
+# app/core/metrics.py
+"""
+Minimal in-process metrics (counters, gauges, histograms) rendered in the
+Prometheus text exposition format. Values are per worker process.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, doc, labelnames=()):
+        super().__init__(name, doc, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def total(self) -> float:
+        """Sum over all label sets."""
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, doc, labelnames=()):
+        super().__init__(name, doc, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with self._lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()]
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_num(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+_registry: list[_Metric] = []
+
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+
+# --- HTTP ---
+http_requests_total = _register(Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")))
+http_request_duration_seconds = _register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")))
+http_requests_in_flight = _register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled."))
+
+# --- DB ---
+db_queries_total = _register(Counter(
+    "db_queries_total", "SQL statements executed.", ("engine",)))
+db_query_seconds_total = _register(Counter(
+    "db_query_seconds_total", "Time spent executing SQL statements.", ("engine",)))
+http_request_db_queries = _register(Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request.", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS))
+http_request_db_seconds = _register(Histogram(
+    "http_request_db_seconds", "Time spent in SQL per HTTP request.", ("method", "route")))
+db_pool_checked_out = _register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool.", ("engine",)))
+db_pool_size = _register(Gauge(
+    "db_pool_size", "Configured pool size (QueuePool only).", ("engine",)))
+db_pool_overflow = _register(Gauge(
+    "db_pool_overflow", "Connections opened beyond pool size (QueuePool only).", ("engine",)))
+db_replica_healthy = _register(Gauge(
+    "db_replica_healthy", "1 while a read replica is in rotation, 0 during its cooldown.", ("engine",)))
+db_read_fallbacks_total = _register(Counter(
+    "db_read_fallbacks_total", "Read sessions served by the primary because no replica was healthy."))
+
+# --- Scheduler ---
+scheduler_job_duration_seconds = _register(Gauge(
+    "scheduler_job_duration_seconds", "Duration of the last run of a scheduled job.", ("job",)))
+scheduler_job_rows = _register(Gauge(
+    "scheduler_job_rows", "Rows processed by the last run of a scheduled job.", ("job",)))
+scheduler_job_backlog = _register(Gauge(
+    "scheduler_job_backlog", "1 when the last run stopped with work left over.", ("job",)))
+scheduler_job_last_run_timestamp = _register(Gauge(
+    "scheduler_job_last_run_timestamp_seconds", "Start time of the last run of a scheduled job.", ("job",)))
+
+# --- In-process caches / logging ---
+cache_stat = _register(Gauge(
+    "app_cache_stat", "Counters of the in-process car registry and validity index.", ("cache", "stat")))
+log_pipeline = _register(Gauge(
+    "app_log_events", "Log pipeline counters (queued, written, dropped, sampledOut).", ("stat",)))
+
+
+@dataclass
+class QueryStats:
+    """SQL statements and DB time attributed to the current request."""
+    queries: int = 0
+    seconds: float = 0.0
+
+
+# Set by MetricsMiddleware for the duration of a request; the object is shared
+# with threadpool workers (contexts are copied), so counts made there add up.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def record_query(engine_name: str, seconds: float) -> None:
+    db_queries_total.inc(engine=engine_name)
+    db_query_seconds_total.inc(seconds, engine=engine_name)
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += seconds
+
+
+def _collect_runtime() -> None:
+    """Refresh gauges read from other modules at scrape time."""
+    from sqlalchemy.pool import QueuePool
+
+    from app.core.logging import log_pipeline_stats
+    from app.db import async_session
+    from app.db.replicas import replica_set
+    from app.db.session import get_engine
+    from app.db.shards import shard_set
+    from app.services import rollup_service
+    from app.services.car_registry import car_registry
+    from app.services.validity_index import validity_index
+
+    engines = [("primary", get_engine())]
+    if async_session._engine is not None:
+        engines.append(("async", async_session._engine.sync_engine))
+    engines.extend(replica_set.engines().items())
+    engines.extend(shard_set.engines().items())
+    for name, target in engines:
+        pool = target.pool
+        db_pool_checked_out.set(pool.checkedout() if hasattr(pool, "checkedout") else 0, engine=name)
+        if isinstance(pool, QueuePool):
+            db_pool_size.set(pool.size(), engine=name)
+            db_pool_overflow.set(max(pool.overflow(), 0), engine=name)
+    for name, healthy in replica_set.healthy().items():
+        db_replica_healthy.set(1 if healthy else 0, engine=name)
+
+    # only loaded (with APScheduler) when the scheduler is enabled
+    scheduling = sys.modules.get("app.core.scheduling")
+    run = scheduling.last_expiry_run if scheduling is not None else None
+    if run is not None:
+        job = "policy-expiry-logger"
+        scheduler_job_duration_seconds.set(run.duration_ms / 1000, job=job)
+        scheduler_job_rows.set(run.processed, job=job)
+        scheduler_job_backlog.set(1 if run.backlog_remaining else 0, job=job)
+        scheduler_job_last_run_timestamp.set(run.started_at.timestamp(), job=job)
+
+    run = rollup_service.last_rollup_run
+    if run is not None:
+        job = "claim-rollup-refresh"
+        scheduler_job_duration_seconds.set(run.duration_ms / 1000, job=job)
+        scheduler_job_rows.set(run.processed, job=job)
+        scheduler_job_last_run_timestamp.set(run.started_at.timestamp(), job=job)
+
+    for cache, stats in (("car_registry", car_registry.stats()), ("validity_index", validity_index.stats())):
+        for stat, value in stats.items():
+            cache_stat.set(value, cache=cache, stat=stat)
+    for stat, value in log_pipeline_stats().items():
+        log_pipeline.set(value, stat=stat)
+
+
+def render() -> str:
+    """All metrics in Prometheus text format (version 0.0.4)."""
+    _collect_runtime()
+    lines: list[str] = []
+    for metric in _registry:
+        samples = metric.samples()
+        if samples:
+            lines.extend(metric.header())
+            lines.extend(samples)
+    return "\n".join(lines) + "\n"
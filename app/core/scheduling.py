@@ -1,21 +1,27 @@
 # app/core/scheduling.py
 from __future__ import annotations
 
-from datetime import datetime, date, time, timedelta
+from dataclasses import dataclass
+from functools import wraps
+from datetime import datetime, date, time
+from time import perf_counter
 from typing import Optional
 
 import structlog
 from apscheduler.schedulers.background import BackgroundScheduler
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.leader import LeaderLease
+from app.db.shards import shard_session, shard_set
 from app.db.models import InsurancePolicy  # NOTE: exact casing matters
 
 log = structlog.get_logger()
 
 # Keep a single BackgroundScheduler instance
 _scheduler: Optional[BackgroundScheduler] = None
+# Lease deciding which worker runs the jobs (None when leader election is off)
+_lease: Optional[LeaderLease] = None
 
 
 def _within_window(now: datetime) -> bool:
@@ -26,60 +32,184 @@ def _within_window(now: datetime) -> bool:
     return time(0, 0) <= t < time(1, 0)
 
 
-def detect_and_log_expired_policies(now: Optional[datetime] = None) -> int:
+@dataclass
+class ExpiryRunMetrics:
+    """Outcome of one detect_and_log_expired_policies run."""
+    started_at: datetime
+    processed: int = 0
+    chunks: int = 0
+    oldest_end_date: Optional[date] = None
+    backlog_remaining: bool = False
+    duration_ms: float = 0.0
+
+
+# Metrics of the most recent run (None until the job has run once)
+last_expiry_run: Optional[ExpiryRunMetrics] = None
+
+
+def _pending_expired(today: date, limit: int):
+    """Unlogged policies that ended before today (any past date), oldest first."""
+    return (
+        select(InsurancePolicy.id)
+        .where(InsurancePolicy.logged_expiry_at.is_(None))
+        .where(InsurancePolicy.end_date < today)
+        .order_by(InsurancePolicy.end_date, InsurancePolicy.id)
+        .limit(limit)
+    )
+
+
+def _mark_expired_chunk(db, today: date, now: datetime, limit: int) -> list:
     """
-    Find policies whose end_date was yesterday (inclusive validity), log once,
-    and mark via logged_expiry_at to ensure idempotency. Returns count logged.
+    Claim and mark one chunk in a single set-based statement:
+    UPDATE ... SET logged_expiry_at = now WHERE id IN (<chunk>) RETURNING id, car_id, end_date.
+    Falls back to SELECT + UPDATE on databases without UPDATE ... RETURNING.
     """
-    now = now or datetime.now()
-    if not _within_window(now):
-        return 0
-
-    expired_on = (now.date() - timedelta(days=1))
+    dialect = db.get_bind().dialect
+    pending = _pending_expired(today, limit)
+    if dialect.name == "postgresql":
+        pending = pending.with_for_update(skip_locked=True)
 
-    with SessionLocal() as db:
+    if dialect.update_returning:
         stmt = (
-            select(InsurancePolicy)
-            .where(InsurancePolicy.end_date == expired_on)
+            update(InsurancePolicy)
+            .where(InsurancePolicy.id.in_(pending))
             .where(InsurancePolicy.logged_expiry_at.is_(None))
+            .values(logged_expiry_at=now)
+            .returning(InsurancePolicy.id, InsurancePolicy.car_id, InsurancePolicy.end_date)
+            .execution_options(synchronize_session=False)
         )
-        policies = db.execute(stmt).scalars().all()
+        return db.execute(stmt).all()
+
+    rows = db.execute(
+        select(InsurancePolicy.id, InsurancePolicy.car_id, InsurancePolicy.end_date)
+        .where(InsurancePolicy.id.in_(pending))
+    ).all()
+    if rows:
+        db.execute(
+            update(InsurancePolicy)
+            .where(InsurancePolicy.id.in_([r.id for r in rows]))
+            .values(logged_expiry_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    return rows
+
 
-        for p in policies:
-            log.info("policy_expired", policyId=p.id, carId=p.car_id, endDate=str(p.end_date))
-            log.info("policy_expired_msg", message=f"Policy {p.id} for car {p.car_id} expired on {p.end_date}")
-            p.logged_expiry_at = now
+def detect_and_log_expired_policies(now: Optional[datetime] = None) -> int:
+    """
+    Log every policy whose end_date has passed (inclusive validity) exactly once,
+    including any backlog from missed runs, and mark it via logged_expiry_at.
+    Works in chunks of EXPIRY_CHUNK_SIZE rows, each its own transaction, up to
+    EXPIRY_MAX_CHUNKS_PER_RUN chunks per shard; the next run picks up any remainder.
+    Returns count logged.
+    """
+    global last_expiry_run
+    now = now or datetime.now()
+    if not _within_window(now):
+        return 0
 
-        if policies:
-            db.commit()
+    today = now.date()
+    metrics = ExpiryRunMetrics(started_at=now)
+    started = perf_counter()
+
+    for index in range(shard_set.count):
+        with shard_session(index) as db:
+            chunks = 0
+            while chunks < settings.EXPIRY_MAX_CHUNKS_PER_RUN:
+                rows = _mark_expired_chunk(db, today, now, settings.EXPIRY_CHUNK_SIZE)
+                db.commit()
+                if not rows:
+                    break
+                chunks += 1
+                metrics.processed += len(rows)
+                for policy_id, car_id, end_date in rows:
+                    log.info("policy_expired", policyId=policy_id, carId=car_id, endDate=str(end_date))
+                    log.info("policy_expired_msg", message=f"Policy {policy_id} for car {car_id} expired on {end_date}")
+                    if metrics.oldest_end_date is None or end_date < metrics.oldest_end_date:
+                        metrics.oldest_end_date = end_date
+                if len(rows) < settings.EXPIRY_CHUNK_SIZE:
+                    break
+            else:
+                metrics.backlog_remaining = True
+            metrics.chunks += chunks
+
+    metrics.duration_ms = round((perf_counter() - started) * 1000, 2)
+    last_expiry_run = metrics
+    log.info(
+        "policy_expiry_run",
+        processed=metrics.processed,
+        chunks=metrics.chunks,
+        oldestEndDate=str(metrics.oldest_end_date) if metrics.oldest_end_date else None,
+        backlogRemaining=metrics.backlog_remaining,
+        durationMs=metrics.duration_ms,
+    )
+    return metrics.processed
 
-        return len(policies)
 
+def _leader_only(job):
+    """Run `job` only on the worker currently holding the scheduler lease."""
+    @wraps(job)
+    def run():
+        if _lease is not None and not _lease.is_leader():
+            return None
+        return job()
+    return run
 
-def start_scheduler() -> None:
-    """Create and start the background scheduler (interval = 10 min)."""
-    global _scheduler
-    if _scheduler is not None:
-        return
 
-    _scheduler = BackgroundScheduler()
+def _add_job(func, job_id: str, **trigger_args) -> None:
+    """Register a scheduled job; every job added here is leader-only."""
     _scheduler.add_job(
-        detect_and_log_expired_policies,
+        _leader_only(func),
         trigger="interval",
-        minutes=10,
-        id="policy-expiry-logger",
+        id=job_id,
         coalesce=True,
         max_instances=1,
         replace_existing=True,
+        **trigger_args,
     )
+
+
+def start_scheduler() -> None:
+    """
+    Create and start the background scheduler (interval = 10 min).
+    With SCHEDULER_LEADER_ELECTION on, every worker runs the scheduler but only the
+    lease holder executes job bodies; the others keep heartbeating as standbys.
+    """
+    global _scheduler, _lease
+    if _scheduler is not None:
+        return
+
+    _scheduler = BackgroundScheduler()
+    if settings.SCHEDULER_LEADER_ELECTION:
+        _lease = LeaderLease("scheduler", ttl_seconds=settings.SCHEDULER_LEASE_TTL_SECONDS)
+        _scheduler.add_job(
+            _lease.heartbeat,
+            trigger="interval",
+            seconds=settings.SCHEDULER_HEARTBEAT_SECONDS,
+            id="scheduler-lease-heartbeat",
+            next_run_time=datetime.now(),
+            coalesce=True,
+            max_instances=1,
+            replace_existing=True,
+        )
+
+    _add_job(detect_and_log_expired_policies, "policy-expiry-logger", minutes=10)
+    if settings.ROLLUP_ENABLED:
+        from app.services.rollup_service import refresh_claim_rollups
+        _add_job(refresh_claim_rollups, "claim-rollup-refresh", minutes=settings.ROLLUP_REFRESH_MINUTES)
+        if settings.ROLLUP_RECONCILE_HOURS > 0:
+            from app.services.rollup_service import reconcile_claim_rollups
+            _add_job(reconcile_claim_rollups, "claim-rollup-reconcile", hours=settings.ROLLUP_RECONCILE_HOURS)
     _scheduler.start()
-    log.info("scheduler_started", job_id="policy-expiry-logger")
+    log.info("scheduler_started", job_id="policy-expiry-logger", leaderElection=settings.SCHEDULER_LEADER_ELECTION)
 
 
 def shutdown_scheduler() -> None:
     """Stop the scheduler on app shutdown."""
-    global _scheduler
+    global _scheduler, _lease
     if _scheduler is not None:
         _scheduler.shutdown(wait=False)
         _scheduler = None
+        if _lease is not None:
+            _lease.release()
+            _lease = None
         log.info("scheduler_stopped")
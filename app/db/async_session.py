@@ -0,0 +1,62 @@
+# app/db/async_session.py
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.session import engine_options, install_query_metrics, install_sqlite_pragmas, log_engine_config
+
+# sync driver -> async driver for the same database (both in requirements.txt)
+_ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "psycopg",
+}
+# drivers that already speak asyncio under the same dialect name
+_ASYNC_CAPABLE = {"aiosqlite", "asyncpg", "psycopg"}
+
+
+def async_url(url: str) -> str:
+    """Derive an async SQLAlchemy URL (aiosqlite / psycopg async) from a sync one; async URLs pass through."""
+    u = make_url(url)
+    backend, driver = u.get_backend_name(), u.get_driver_name()
+    if driver in _ASYNC_CAPABLE:
+        return u.render_as_string(hide_password=False)
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for database backend '{backend}'")
+    return u.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Created on first use, so the async driver is only imported when ASYNC_DB_ENABLED is on."""
+    global _engine
+    if _engine is None:
+        url = settings.ASYNC_DATABASE_URL or async_url(settings.DATABASE_URL)
+        _engine = create_async_engine(url, echo=False, **engine_options(url, is_async=True))
+        if url.startswith("sqlite"):
+            install_sqlite_pragmas(_engine.sync_engine)
+        if settings.METRICS_ENABLED:
+            install_query_metrics(_engine.sync_engine, name="async")
+        log_engine_config(_engine.sync_engine, name="async", read_pragmas=False)
+    return _engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _sessionmaker
+
+
+async def dispose_async_engine() -> None:
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _sessionmaker = None
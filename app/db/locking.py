@@ -0,0 +1,140 @@
+"""
+Per-car write locks for invariants checked in application code (no two
+policies of a car may overlap).
+
+PostgreSQL: SELECT ... FOR UPDATE on the car rows. Writers of the same car
+queue behind each other, writers of other cars are unaffected; the wait is
+bounded by lock_timeout (CAR_LOCK_TIMEOUT_MS).
+
+SQLite has a single writer per database. The transaction is opened with
+BEGIN IMMEDIATE, so the write lock is held before the overlap check runs;
+without it two requests can both pass the check and both insert. The wait
+is bounded by busy_timeout (SQLITE_BUSY_TIMEOUT_MS).
+
+Every write path that touches a car's rows (policies, claims, imports) takes
+this lock first, before car_summary or the car version bump, so concurrent
+writers of one car always lock in the same order.
+
+Lock timeouts and deadlocks are retried with jittered exponential backoff
+(CAR_LOCK_RETRIES, CAR_LOCK_BACKOFF_MS) and surface as LockTimeoutError (503).
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.errors import LockTimeoutError
+from app.core.config import settings
+from app.db.models import Car
+
+log = structlog.get_logger()
+
+T = TypeVar("T")
+
+# lock_not_available, deadlock_detected, serialization_failure
+_PG_RETRYABLE = {"55P03", "40P01", "40001"}
+_SQLITE_RETRYABLE = ("database is locked", "database is busy")
+
+
+def _lock_cars_stmt(dialect: str, car_ids: list[int]):
+    stmt = select(Car.id).where(Car.id.in_(car_ids)).order_by(Car.id)  # fixed order: no lock-order deadlocks
+    if dialect == "postgresql":
+        stmt = stmt.with_for_update()
+    return stmt
+
+
+def _lock_timeout_stmt():
+    # transaction-local, like SET LOCAL, but takes a bind parameter
+    return select(func.set_config("lock_timeout", f"{settings.CAR_LOCK_TIMEOUT_MS}ms", True))
+
+
+def _sqlite_in_transaction(dbapi_connection) -> bool:
+    # pysqlite exposes in_transaction; the aiosqlite adapter wraps the aiosqlite connection
+    return bool(getattr(getattr(dbapi_connection, "_connection", dbapi_connection), "in_transaction", False))
+
+
+def lock_cars(db: Session, car_ids: Iterable[int]) -> set[int]:
+    """Take the write lock for `car_ids` in the current transaction; returns the ids that exist."""
+    ids = sorted(set(car_ids))
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(_lock_timeout_stmt())
+    elif dialect == "sqlite":
+        conn = db.connection()
+        # pysqlite only opens a transaction at the first write; take the write lock up front
+        if not _sqlite_in_transaction(conn.connection.dbapi_connection):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    return set(db.execute(_lock_cars_stmt(dialect, ids)).scalars())
+
+
+async def lock_cars_async(db: AsyncSession, car_ids: Iterable[int]) -> set[int]:
+    ids = sorted(set(car_ids))
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        await db.execute(_lock_timeout_stmt())
+    elif dialect == "sqlite":
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        if not _sqlite_in_transaction(raw.dbapi_connection):
+            await conn.exec_driver_sql("BEGIN IMMEDIATE")
+    return set((await db.execute(_lock_cars_stmt(dialect, ids))).scalars())
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    """Lock wait timed out, deadlock or serialization failure (safe to retry the transaction)."""
+    if not isinstance(exc, DBAPIError):
+        return False
+    orig = exc.orig
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if code in _PG_RETRYABLE:
+        return True
+    message = str(orig).lower()
+    return any(m in message for m in _SQLITE_RETRYABLE)
+
+
+def _backoff(attempt: int) -> float:
+    """Seconds to wait before retry `attempt` (1-based): exponential with full jitter."""
+    return settings.CAR_LOCK_BACKOFF_MS / 1000 * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+
+def run_with_lock_retry(db: Session, op: str, fn: Callable[[], T]) -> T:
+    """Run the transaction `fn` (which commits), retrying it from scratch on lock errors."""
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            db.rollback()  # releases the lock on any failure, not only lock errors
+            if not is_lock_error(e):
+                raise
+            attempt += 1
+            if attempt > settings.CAR_LOCK_RETRIES:
+                raise LockTimeoutError(f"{op}: write lock not acquired, retry later") from e
+            delay = _backoff(attempt)
+            log.warning("write_lock_retry", op=op, attempt=attempt, delayMs=round(delay * 1000, 1))
+            time.sleep(delay)
+
+
+async def run_with_lock_retry_async(db: AsyncSession, op: str, fn: Callable[[], Awaitable[T]]) -> T:
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except Exception as e:
+            await db.rollback()  # releases the lock on any failure, not only lock errors
+            if not is_lock_error(e):
+                raise
+            attempt += 1
+            if attempt > settings.CAR_LOCK_RETRIES:
+                raise LockTimeoutError(f"{op}: write lock not acquired, retry later") from e
+            delay = _backoff(attempt)
+            log.warning("write_lock_retry", op=op, attempt=attempt, delayMs=round(delay * 1000, 1))
+            await asyncio.sleep(delay)
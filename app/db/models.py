@@ -6,6 +6,7 @@ from decimal import Decimal
 from typing import Optional
 
 from sqlalchemy import (
+    BigInteger,
     Date,
     DateTime,
     ForeignKey,
@@ -14,6 +15,7 @@ from sqlalchemy import (
     String,
     func,
     Index,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -43,6 +45,8 @@ class Car(Base):
     model: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     year_of_manufacture: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     owner_id: Mapped[int] = mapped_column(ForeignKey("owner.id", ondelete="RESTRICT"), nullable=False)
+    # bumped with every policy/claim write of this car; basis of the per-car ETags
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default=text("1"))
 
     # relationships
     owner: Mapped["Owner"] = relationship(back_populates="cars")
@@ -76,6 +80,13 @@ class InsurancePolicy(Base):
 
     __table_args__ = (
         Index("ix_policy_car_dates", "car_id", "start_date", "end_date"),
+        # partial index backing the expiry scheduler scan
+        Index(
+            "ix_policy_expiry_pending",
+            "end_date",
+            postgresql_where=text("logged_expiry_at IS NULL"),
+            sqlite_where=text("logged_expiry_at IS NULL"),
+        ),
     )
 
 
@@ -99,3 +110,57 @@ class Claim(Base):
     __table_args__ = (
         Index("ix_claim_car_date", "car_id", "claim_date"),
     )
+
+
+class SchedulerLease(Base):
+    """Leader-election lease: one row per lease name, held by one worker at a time."""
+    __tablename__ = "scheduler_lease"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(200), nullable=False)
+    acquired_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class VersionCounter(Base):
+    """Named global counters (e.g. "cars": bumped whenever car/owner rows change)."""
+    __tablename__ = "version_counter"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class CarSummary(Base):
+    """
+    Per-car rollup kept up to date by the write paths (see summary_service):
+    claim count/total/last date, policy count and the latest policy by start date.
+    """
+    __tablename__ = "car_summary"
+
+    car_id: Mapped[int] = mapped_column(ForeignKey("car.id", ondelete="CASCADE"), primary_key=True)
+    claim_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    claim_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    last_claim_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    policy_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latest_policy_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    latest_policy_provider: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    latest_policy_start: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    latest_policy_end: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class ClaimRollup(Base):
+    """
+    Claim count / amount per period (grain "day" or "month") by car make, model and
+    the provider of the policy active on claim_date. Unknown dimensions are stored
+    as "" (primary-key columns cannot be NULL). Maintained by rollup_service.
+    """
+    __tablename__ = "claim_rollup"
+
+    grain: Mapped[str] = mapped_column(String(5), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    make: Mapped[str] = mapped_column(String(100), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    provider: Mapped[str] = mapped_column(String(200), primary_key=True)
+    claim_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    amount_total: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False)
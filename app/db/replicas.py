@@ -0,0 +1,134 @@
+"""
+Read-replica routing for read-only endpoints.
+
+READ_DATABASE_URLS lists replicas (PostgreSQL streaming replicas, or a second
+SQLite file standing in locally). Each gets its own engine and pool, created on
+first use. read_session() hands out sessions round-robin across healthy
+replicas; a replica whose connection fails is skipped for
+READ_REPLICA_RETRY_SECONDS and its requests fall back to the next replica, then
+to the primary. With no replicas configured every read goes to the primary.
+
+Read sessions refuse ORM flushes, and replica connections are read-only at the
+database level (PostgreSQL transaction characteristic, SQLite query_only).
+Replicas lag the primary: a read right after a write may not see it yet.
+"""
+from __future__ import annotations
+
+import threading
+from time import monotonic
+from typing import Optional
+
+import structlog
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import db_read_fallbacks_total
+from app.db.session import engine_options, get_engine, install_query_metrics, install_sqlite_pragmas
+
+log = structlog.get_logger()
+
+
+class ReadOnlySessionError(RuntimeError):
+    pass
+
+
+ReadSessionLocal = sessionmaker(autoflush=False, autocommit=False, future=True)
+
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _refuse_flush(session, flush_context, instances):
+    raise ReadOnlySessionError("read session is read-only; use get_db for writes")
+
+
+def _install_query_only(target: Engine) -> None:
+    @event.listens_for(target, "connect")
+    def _query_only(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+class ReplicaSet:
+    """Lazily created replica engines with round-robin selection and a per-replica cooldown."""
+
+    def __init__(self, urls: list[str], retry_seconds: float):
+        self.urls = list(urls)
+        self.retry_seconds = retry_seconds
+        self._engines: dict[str, Engine] = {}
+        self._down_until: dict[str, float] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _name(self, index: int) -> str:
+        return f"replica{index}"
+
+    def engine(self, index: int) -> Engine:
+        name = self._name(index)
+        with self._lock:
+            target = self._engines.get(name)
+            if target is None:
+                url = self.urls[index]
+                target = create_engine(url, echo=False, future=True, **engine_options(url))
+                if settings.METRICS_ENABLED:
+                    install_query_metrics(target, name=name)
+                if url.startswith("sqlite"):
+                    install_sqlite_pragmas(target)
+                    _install_query_only(target)
+                else:
+                    target = target.execution_options(postgresql_readonly=True)
+                self._engines[name] = target
+            return target
+
+    def candidates(self) -> list[tuple[str, int]]:
+        """Healthy replicas, starting with the next one in round-robin order."""
+        now = monotonic()
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.urls), 1)
+            order = [(start + i) % len(self.urls) for i in range(len(self.urls))]
+            return [(self._name(i), i) for i in order if self._down_until.get(self._name(i), 0) <= now]
+
+    def mark_down(self, name: str, error: BaseException) -> None:
+        with self._lock:
+            self._down_until[name] = monotonic() + self.retry_seconds
+        log.warning("read_replica_unhealthy", replica=name, retryInSeconds=self.retry_seconds, error=str(error))
+
+    def healthy(self) -> dict[str, bool]:
+        now = monotonic()
+        return {self._name(i): self._down_until.get(self._name(i), 0) <= now for i in range(len(self.urls))}
+
+    def engines(self) -> dict[str, Engine]:
+        with self._lock:
+            return dict(self._engines)
+
+
+replica_set = ReplicaSet(settings.READ_DATABASE_URLS, settings.READ_REPLICA_RETRY_SECONDS)
+
+
+def read_session() -> Session:
+    """
+    A read-only session on a healthy replica (connection checked out here, so a
+    dead replica falls back before any query runs), else on the primary.
+    """
+    if replica_set.urls:
+        for name, index in replica_set.candidates():
+            db = ReadSessionLocal(bind=replica_set.engine(index))
+            try:
+                db.connection()
+                db.info["replica"] = name
+                return db
+            except DBAPIError as e:
+                db.close()
+                replica_set.mark_down(name, e)
+        db_read_fallbacks_total.inc()
+    return ReadSessionLocal(bind=get_engine())
+
+
+def mark_session_failed(db: Session, error: DBAPIError) -> None:
+    """Connection-level failure during a request: take the session's replica out of rotation."""
+    name: Optional[str] = db.info.get("replica")
+    if name is not None and error.connection_invalidated:
+        replica_set.mark_down(name, error)
@@ -1,17 +1,136 @@
+import threading
+from time import perf_counter
+from typing import Optional
+
+import structlog
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import record_query
+
+log = structlog.get_logger()
+
+
+def _uses_queue_pool(url: str, is_async: bool = False) -> bool:
+    u = make_url(url)
+    if is_async:
+        # aiosqlite runs on NullPool; async Postgres drivers on AsyncAdaptedQueuePool
+        return u.get_backend_name() != "sqlite"
+    return issubclass(u.get_dialect().get_pool_class(u), QueuePool)
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine() pool arguments from Settings; sizing only applies to queue pools."""
+    opts = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if _uses_queue_pool(url, is_async):
+        opts.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return opts
 
-engine = create_engine(settings.DATABASE_URL, echo=False, future=True)
 
-# Ensure SQLite enforces FK constraints
-if settings.DATABASE_URL.startswith("sqlite"):
-    @event.listens_for(engine, "connect")
+def sqlite_pragmas() -> dict:
+    return {
+        "foreign_keys": "ON",
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+
+
+def install_sqlite_pragmas(target: Engine) -> None:
+    """Apply the configured PRAGMAs on every new DBAPI connection of a SQLite engine."""
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(target, "connect")
     def _set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
         cursor.close()
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False,
-future=True)
 
+def install_query_metrics(target: Engine, name: str = "primary") -> None:
+    """Count statements and DB time (globally and for the current request)."""
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(perf_counter())
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start_time"].pop()
+        record_query(name, perf_counter() - started)
+
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """
+    The primary engine, created on first use: importing the app does not load the
+    database driver; the app lifespan creates it at startup.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                target = create_engine(settings.DATABASE_URL, echo=False, future=True,
+                                       **engine_options(settings.DATABASE_URL))
+                # Ensure SQLite enforces FK constraints (plus WAL / busy_timeout / cache tuning)
+                if settings.DATABASE_URL.startswith("sqlite"):
+                    install_sqlite_pragmas(target)
+                if settings.METRICS_ENABLED:
+                    install_query_metrics(target)
+                SessionLocal.configure(bind=target)
+                _engine = target
+    return _engine
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to the primary engine on first call."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autoflush=False, autocommit=False, future=True)
+
+
+def __getattr__(name: str):
+    # `from app.db.session import engine` keeps working, creating the engine on access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def log_engine_config(target: Optional[Engine] = None, name: str = "primary", read_pragmas: bool = True) -> None:
+    """Log the effective pool settings and, for SQLite, the PRAGMA values read back."""
+    target = target or get_engine()
+    pool = target.pool
+    info = {
+        "engine": name,
+        "dialect": f"{target.dialect.name}+{target.dialect.driver}",
+        "poolClass": type(pool).__name__,
+        "poolPrePing": settings.DB_POOL_PRE_PING,
+        "poolRecycle": settings.DB_POOL_RECYCLE,
+    }
+    if isinstance(pool, QueuePool):
+        info.update(poolSize=pool.size(), maxOverflow=pool._max_overflow, poolTimeout=pool.timeout())
+    if target.dialect.name == "sqlite" and read_pragmas:
+        with target.connect() as conn:
+            for pragma in sqlite_pragmas():
+                info[f"pragma_{pragma}"] = conn.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+    log.info("db_engine_configured", **info)
@@ -0,0 +1,232 @@
+"""
+Hash sharding of car-scoped data.
+
+SHARD_DATABASE_URLS lists N databases, each with the full schema (alembic
+migrates all of them). shard_for(car_id) picks one with a stable hash; a car,
+its policies, claims, car_summary row and claim rollups live on that shard, and
+its owner row is copied to every shard holding one of the owner's cars. Car and
+owner ids are assigned before the rows are written (see scripts.split_shards), so
+they stay unique across shards; policy and claim ids are per shard and always
+addressed through their car.
+
+Car-scoped endpoints get the car's session (get_car_db / get_car_read_db).
+Fleet-wide reads scatter to every shard, one thread per shard, and merge by car
+id. DATABASE_URL keeps the scheduler lease. With no shards configured there is
+one shard: the primary, with reads going through read_session() (replicas).
+"""
+from __future__ import annotations
+
+import contextvars
+import heapq
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Sequence, TypeVar, Union
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.replicas import ReadSessionLocal, read_session
+from app.db.session import (
+    SessionLocal,
+    engine_options,
+    get_engine,
+    install_query_metrics,
+    install_sqlite_pragmas,
+)
+from app.utils.bulk_io import RecordError, raw_car_id
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+ShardSessionLocal = sessionmaker(autoflush=False, autocommit=False, future=True)
+
+
+def shard_index(car_id: int, count: int) -> int:
+    # crc32 of the id bytes: stable across processes and versions, and spreads
+    # consecutive ids instead of striping them like car_id % count
+    return zlib.crc32(int(car_id).to_bytes(8, "big", signed=True)) % count
+
+
+class ShardSet:
+    """Lazily created engines of the configured shards."""
+
+    def __init__(self, urls: list[str]):
+        self.urls = list(urls)
+        self._engines: dict[int, Engine] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def sharded(self) -> bool:
+        return bool(self.urls)
+
+    @property
+    def count(self) -> int:
+        return len(self.urls) or 1
+
+    def shard_for(self, car_id: int) -> int:
+        return shard_index(car_id, len(self.urls)) if self.urls else 0
+
+    def name(self, index: int) -> str:
+        return f"shard{index}"
+
+    def engine(self, index: int) -> Engine:
+        if not self.urls:
+            return get_engine()
+        with self._lock:
+            target = self._engines.get(index)
+            if target is None:
+                url = self.urls[index]
+                target = create_engine(url, echo=False, future=True, **engine_options(url))
+                if url.startswith("sqlite"):
+                    install_sqlite_pragmas(target)
+                if settings.METRICS_ENABLED:
+                    install_query_metrics(target, name=self.name(index))
+                self._engines[index] = target
+            return target
+
+    def engines(self) -> dict[str, Engine]:
+        with self._lock:
+            return {self.name(i): e for i, e in self._engines.items()}
+
+
+shard_set = ShardSet(settings.SHARD_DATABASE_URLS)
+
+
+def shard_session(index: int) -> Session:
+    """Read-write session on one shard (the primary when unsharded)."""
+    if not shard_set.sharded:
+        return SessionLocal()
+    return ShardSessionLocal(bind=shard_set.engine(index))
+
+
+def shard_read_session(index: int) -> Session:
+    """Read-only session on one shard; unsharded reads go through the replicas."""
+    if not shard_set.sharded:
+        return read_session()
+    return ReadSessionLocal(bind=shard_set.engine(index))
+
+
+def car_session(car_id: int) -> Session:
+    return shard_session(shard_set.shard_for(car_id))
+
+
+def car_read_session(car_id: int) -> Session:
+    return shard_read_session(shard_set.shard_for(car_id))
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _map_shards(fn: Callable[[int], R], indexes: Sequence[int]) -> list[R]:
+    """
+    fn(index) for every index, concurrently when there is more than one. Each call
+    runs in a copy of the caller's context, so the request id and per-request query
+    stats (contextvars) follow the query into the worker thread.
+    """
+    global _executor
+    if len(indexes) <= 1:
+        return [fn(i) for i in indexes]
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=shard_set.count, thread_name_prefix="shard")
+    # one copy per call: a Context cannot be entered by two threads at once
+    futures = [_executor.submit(contextvars.copy_context().run, fn, i) for i in indexes]
+    return [f.result() for f in futures]
+
+
+def scatter(fn: Callable[[Session], R], read: bool = True) -> list[R]:
+    """Run fn(db) on every shard (read-only sessions unless read=False); results in shard order."""
+    opener = shard_read_session if read else shard_session
+
+    def run(index: int) -> R:
+        with opener(index) as db:
+            return fn(db)
+
+    return _map_shards(run, list(range(shard_set.count)))
+
+
+def scatter_by_car(items: Sequence[T], car_id: Callable[[T], int], fn: Callable[[Session, list[T]], list[R]]) -> list[R]:
+    """
+    Split `items` by their car's shard and run fn(db, shard_items) on each shard
+    (read-only); fn returns one result per item. Results come back in input order.
+    """
+    groups: dict[int, list[int]] = {}
+    for pos, item in enumerate(items):
+        groups.setdefault(shard_set.shard_for(car_id(item)), []).append(pos)
+
+    def run(index: int) -> list[R]:
+        with shard_read_session(index) as db:
+            return fn(db, [items[pos] for pos in groups[index]])
+
+    out: list = [None] * len(items)
+    indexes = sorted(groups)
+    for index, results in zip(indexes, _map_shards(run, indexes)):
+        for pos, result in zip(groups[index], results):
+            out[pos] = result
+    return out
+
+
+def merge_pages(
+    pages: Iterable[tuple[list[T], Optional[int]]], limit: int, key: Callable[[T], int]
+) -> tuple[list[T], Optional[int]]:
+    """
+    Combine per-shard keyset pages (items, next_cursor), each sorted by `key`, into
+    one page of at most `limit` items; the cursor is the key of its last item when
+    any shard has more.
+    """
+    pages = list(pages)
+    merged = list(islice(heapq.merge(*(items for items, _ in pages), key=key), limit + 1))
+    more = len(merged) > limit or any(cursor is not None for _, cursor in pages)
+    merged = merged[:limit]
+    return merged, (key(merged[-1]) if more and merged else None)
+
+
+@contextmanager
+def merged_stream(iter_fn: Callable[[Session], Iterator[T]], key: Callable[[T], int]) -> Iterator[Iterator[T]]:
+    """
+    iter_fn(db) on a read session per shard, merged lazily in `key` order; the
+    sessions stay open until the block exits. For streaming exports.
+    """
+    with ExitStack() as stack:
+        streams = [iter_fn(stack.enter_context(shard_read_session(i))) for i in range(shard_set.count)]
+        yield streams[0] if len(streams) == 1 else heapq.merge(*streams, key=key)
+
+
+def run_partitioned(
+    records: Iterable[tuple[int, Union[dict, RecordError]]],
+    fn: Callable[[Session, Iterable[tuple[int, Union[dict, RecordError]]]], R],
+    chunk_size: Optional[int] = None,
+) -> list[R]:
+    """
+    Bulk import across shards: route (row_no, record) pairs by their carId and run
+    fn(db, shard_records) on each shard in turn (one report per call). Records
+    without a readable carId go to shard 0, where they are reported as errors.
+    Unsharded, `records` is passed through unbuffered. Sharded, the whole input is
+    routed at once, or windows of `chunk_size` records when fn has no cross-row
+    checks (claims), which bounds memory to one window.
+    """
+    if not shard_set.sharded:
+        with SessionLocal() as db:
+            return [fn(db, records)]
+    records = iter(records)
+    reports = []
+    while True:
+        window = list(islice(records, chunk_size)) if chunk_size else list(records)
+        if not window:
+            return reports
+        parts: dict[int, list] = {}
+        for row_no, record in window:
+            car_id = raw_car_id(record) if isinstance(record, dict) else None
+            parts.setdefault(shard_set.shard_for(car_id) if car_id is not None else 0, []).append((row_no, record))
+        for index in sorted(parts):
+            with shard_session(index) as db:
+                reports.append(fn(db, parts[index]))
+        if not chunk_size:
+            return reports
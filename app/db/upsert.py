@@ -0,0 +1,11 @@
+def dialect_insert(db):
+    """insert() of the session's dialect, which supports on_conflict_do_update (SQLite, PostgreSQL)."""
+    # imported here so only the dialect in use is loaded
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    raise NotImplementedError(f"upsert not implemented for {name}")
@@ -1,34 +1,76 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.core.logging import setup_logging
 from app.core.config import settings
-from app.core.scheduling import start_scheduler, shutdown_scheduler
 from app.api.errors import register_exception_handlers
-from app.api.routers import health, cars, policies, claims, history
-from app.api.middleware import RequestIDMiddleware
+from app.api.middleware import MetricsMiddleware, RequestIDMiddleware
 
 
-setup_logging()
-app = FastAPI(title="Car Insurance API")
-register_exception_handlers(app)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engine (and driver) are created here, not at import
+    from app.db.session import log_engine_config
+    log_engine_config()
+    from app.services.car_registry import warm_car_registry
+    warm_car_registry()
+    if settings.SCHEDULER_ENABLED:
+        # APScheduler is only imported when the scheduler runs
+        from app.core.scheduling import start_scheduler
+        start_scheduler()
+    try:
+        yield
+    finally:
+        if settings.SCHEDULER_ENABLED:
+            from app.core.scheduling import shutdown_scheduler
+            shutdown_scheduler()
+        if settings.ASYNC_DB_ENABLED:
+            from app.db.async_session import dispose_async_engine
+            await dispose_async_engine()
 
 
-# Routers
-app.include_router(health.router)
-app.include_router(cars.router)
-app.include_router(policies.router)
-app.include_router(claims.router)
-app.include_router(history.router)
+def create_app() -> FastAPI:
+    """
+    Build the API from app.core.config.settings (environment / .env): the engines,
+    replicas, shards and services all read that one object, so there is no
+    per-app settings argument. Optional subsystems are imported only when enabled.
+    """
+    if settings.ASYNC_DB_ENABLED and settings.SHARD_DATABASE_URLS:
+        # the async routers only know the single AsyncEngine
+        raise ValueError("ASYNC_DB_ENABLED cannot be combined with SHARD_DATABASE_URLS")
+    setup_logging(settings.LOG_LEVEL)
+    app = FastAPI(title="Car Insurance API", lifespan=lifespan)
+    register_exception_handlers(app)
 
-app.add_middleware(RequestIDMiddleware)
+    # Routers
+    from app.api.routers import health, cars, policies, claims, history, coverage, reports, summary, analytics
+    if settings.ASYNC_DB_ENABLED:
+        # Registered first so its async handlers win over the sync ones on the same paths
+        from app.api.routers import async_api
+        app.include_router(async_api.router)
+    app.include_router(health.router)
+    app.include_router(cars.router)
+    app.include_router(policies.router)
+    app.include_router(claims.router)
+    app.include_router(history.router)
+    app.include_router(coverage.router)
+    app.include_router(reports.router)
+    app.include_router(summary.router)
+    app.include_router(analytics.router)
+    if settings.METRICS_ENABLED:
+        from app.api.routers import metrics
+        app.include_router(metrics.router)
 
-
-@app.on_event("startup")
-async def _startup():
-    if settings.SCHEDULER_ENABLED:
-        start_scheduler()
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+    return app
 
 
-@app.on_event("shutdown")
-async def _shutdown():
-    if settings.SCHEDULER_ENABLED:
-        shutdown_scheduler()
+def __getattr__(name: str):
+    # `uvicorn app.main:app` / `from app.main import app`: built on first access
+    # (or run `uvicorn --factory app.main:create_app`)
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
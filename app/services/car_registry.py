@@ -0,0 +1,213 @@
+# app/services/car_registry.py
+from __future__ import annotations
+
+import threading
+from time import perf_counter
+from typing import Iterable
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Car
+from app.api.errors import CarNotFoundError
+
+log = structlog.get_logger()
+
+# ids fetched per query while (re)loading the registry
+_REFRESH_CHUNK = 50_000
+
+
+class CarRegistry:
+    """
+    Compact, in-process set of known car ids: one bit per id up to `max_id`
+    (10M cars ~ 1.25 MB). Positive answers need no DB round trip; unknown ids fall
+    back to the database. Ids above the high-water mark trigger an incremental
+    refresh (`id > high_water`), which also picks up every other new car.
+
+    Cars are never deleted through the API; anything that deletes cars out of band
+    should call discard() (or the worker restarted) to avoid stale positives.
+
+    The app warms it at startup in a background thread (warm_car_registry); while
+    `warming`, ids not loaded yet get a point lookup instead of waiting for the load.
+    Without a warm-up (scripts, tests) the first refresh loads everything.
+
+    History is the one path with a separate existence lookup. Coverage, summary
+    and validity fold the check into the query they run anyway (car LEFT JOIN),
+    and policy/claim writes get it from locking the car row, so none of them would
+    save a round trip here.
+    """
+
+    def __init__(self, max_id: int):
+        self.max_id = max_id
+        self._bits = bytearray()
+        self._high_water = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.warming = False
+
+    @property
+    def high_water(self) -> int:
+        return self._high_water
+
+    def _set(self, car_id: int) -> None:
+        if car_id <= 0 or car_id > self.max_id:
+            return
+        byte = car_id >> 3
+        if byte >= len(self._bits):
+            # grow geometrically, but never past what max_id needs
+            need = byte + 1
+            grow = min(max(need, len(self._bits) * 2), (self.max_id >> 3) + 1)
+            self._bits.extend(bytes(grow - len(self._bits)))
+        self._bits[byte] |= 1 << (car_id & 7)
+
+    def contains(self, car_id: int, count: bool = True) -> bool:
+        with self._lock:
+            byte = car_id >> 3
+            found = car_id > 0 and byte < len(self._bits) and bool(self._bits[byte] >> (car_id & 7) & 1)
+            if count:
+                if found:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            return found
+
+    def add(self, car_id: int) -> None:
+        # only sets the bit: the high-water mark means "every id up to here was scanned"
+        with self._lock:
+            self._set(car_id)
+
+    def discard(self, car_id: int) -> None:
+        with self._lock:
+            byte = car_id >> 3
+            if 0 < car_id and byte < len(self._bits):
+                self._bits[byte] &= ~(1 << (car_id & 7)) & 0xFF
+
+    def _refresh_stmt(self, after: int):
+        return select(Car.id).where(Car.id > after).order_by(Car.id).limit(_REFRESH_CHUNK)
+
+    def _apply(self, ids: Iterable[int]) -> int:
+        last = 0
+        with self._lock:
+            for car_id in ids:
+                self._set(car_id)
+                last = car_id
+            if last > self._high_water:
+                self._high_water = last
+        return last
+
+    def refresh(self, db: Session) -> None:
+        """Load car ids above the high-water mark (everything on first use)."""
+        with self._refresh_lock:
+            self.refreshes += 1
+            while True:
+                ids = db.execute(self._refresh_stmt(self._high_water)).scalars().all()
+                self._apply(ids)
+                if len(ids) < _REFRESH_CHUNK:
+                    return
+
+    def load(self, db: Session) -> None:
+        """Load every car id of `db` (one shard), whatever the high-water mark."""
+        after = 0
+        while True:
+            ids = db.execute(self._refresh_stmt(after)).scalars().all()
+            if ids:
+                after = self._apply(ids)
+            if len(ids) < _REFRESH_CHUNK:
+                return
+
+    async def refresh_async(self, db: AsyncSession) -> None:
+        # no thread lock here: the async stack runs refreshes on one event loop
+        self.refreshes += 1
+        while True:
+            ids = (await db.execute(self._refresh_stmt(self._high_water))).scalars().all()
+            self._apply(ids)
+            if len(ids) < _REFRESH_CHUNK:
+                return
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "highWater": self._high_water,
+                "bitmapBytes": len(self._bits),
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "warming": int(self.warming),
+            }
+
+
+car_registry = CarRegistry(max_id=settings.CAR_REGISTRY_MAX_ID)
+
+
+def warm_car_registry() -> None:
+    """
+    App startup: load every shard's car ids in a background thread, so no request
+    pays for the initial load (up to CAR_REGISTRY_MAX_ID ids). If it fails, the
+    registry falls back to loading on first use.
+    """
+    if not settings.CAR_REGISTRY_ENABLED:
+        return
+    from app.db.shards import scatter
+
+    def run() -> None:
+        started = perf_counter()
+        try:
+            scatter(car_registry.load)
+            log.info("car_registry_warmed", durationMs=round((perf_counter() - started) * 1000, 1),
+                     highWater=car_registry.high_water)
+        except Exception:
+            log.exception("car_registry_warm_failed")
+        finally:
+            car_registry.warming = False
+
+    car_registry.warming = True
+    threading.Thread(target=run, name="car-registry-warm", daemon=True).start()
+
+
+def _exists_stmt(car_id: int):
+    return select(Car.id).where(Car.id == car_id)
+
+
+def ensure_car_exists(db: Session, car_id: int) -> None:
+    """
+    Raise CarNotFoundError unless the car exists. Known cars cost no query; ids
+    above the high-water mark cost one incremental refresh, which is authoritative.
+    Unknown ids below it, and any unknown id while the registry is warming, get a
+    point lookup (a car committed out of id order, or not loaded yet).
+    """
+    if settings.CAR_REGISTRY_ENABLED:
+        if car_registry.contains(car_id):
+            return
+        if car_id > car_registry.high_water and not car_registry.warming:
+            car_registry.refresh(db)
+            if car_registry.contains(car_id, count=False):
+                return
+            # ids above max_id are not representable in the bitmap: point lookup below
+            if car_id <= car_registry.max_id:
+                raise CarNotFoundError(car_id)
+    if db.execute(_exists_stmt(car_id)).first() is None:
+        raise CarNotFoundError(car_id)
+    if settings.CAR_REGISTRY_ENABLED:
+        car_registry.add(car_id)
+
+
+async def ensure_car_exists_async(db: AsyncSession, car_id: int) -> None:
+    if settings.CAR_REGISTRY_ENABLED:
+        if car_registry.contains(car_id):
+            return
+        if car_id > car_registry.high_water and not car_registry.warming:
+            await car_registry.refresh_async(db)
+            if car_registry.contains(car_id, count=False):
+                return
+            if car_id <= car_registry.max_id:
+                raise CarNotFoundError(car_id)
+    if (await db.execute(_exists_stmt(car_id))).first() is None:
+        raise CarNotFoundError(car_id)
+    if settings.CAR_REGISTRY_ENABLED:
+        car_registry.add(car_id)
@@ -0,0 +1,69 @@
+# app/services/car_service.py
+from __future__ import annotations
+
+from typing import AsyncIterator, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Car
+
+
+def _cars_after(after: Optional[int], limit: int):
+    stmt = select(Car).options(selectinload(Car.owner)).order_by(Car.id).limit(limit)
+    if after is not None:
+        stmt = stmt.where(Car.id > after)
+    return stmt
+
+
+def list_cars_page(db: Session, after: Optional[int], limit: int) -> tuple[list[Car], Optional[int]]:
+    """
+    Keyset page over Car.id: cars with id > after, at most `limit` of them.
+    Returns (cars, next_cursor); next_cursor is None on the last page.
+    """
+    cars = list(db.execute(_cars_after(after, limit + 1)).scalars())
+    if len(cars) > limit:
+        cars = cars[:limit]
+        return cars, cars[-1].id
+    return cars, None
+
+
+async def list_cars_page_async(
+    db: AsyncSession, after: Optional[int], limit: int
+) -> tuple[list[Car], Optional[int]]:
+    cars = list((await db.execute(_cars_after(after, limit + 1))).scalars())
+    if len(cars) > limit:
+        cars = cars[:limit]
+        return cars, cars[-1].id
+    return cars, None
+
+
+def iter_cars(db: Session, after: Optional[int] = None, chunk_size: int = 500) -> Iterator[Car]:
+    """
+    Yield every car (with owner) in id order, fetching `chunk_size` rows per query.
+    The session is cleared between chunks so memory stays flat for any fleet size;
+    consume each car before asking for the next one.
+    """
+    while True:
+        chunk = db.execute(_cars_after(after, chunk_size)).scalars().all()
+        if not chunk:
+            return
+        yield from chunk
+        after = chunk[-1].id
+        db.expunge_all()
+        if len(chunk) < chunk_size:
+            return
+
+
+async def iter_cars_async(db: AsyncSession, after: Optional[int] = None, chunk_size: int = 500) -> AsyncIterator[Car]:
+    while True:
+        chunk = (await db.execute(_cars_after(after, chunk_size))).scalars().all()
+        if not chunk:
+            return
+        for car in chunk:
+            yield car
+        after = chunk[-1].id
+        db.expunge_all()
+        if len(chunk) < chunk_size:
+            return
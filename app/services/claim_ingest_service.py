@@ -0,0 +1,124 @@
+# app/services/claim_ingest_service.py
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Union
+
+import structlog
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.api.schemas import ClaimImportRow, ClaimIngestReport, ImportRowError
+from app.db.locking import lock_cars, run_with_lock_retry
+from app.db.models import Claim
+from app.services.summary_service import record_claims
+from app.services.version_service import bump_car_versions
+from app.utils.bulk_io import RecordError, raw_car_id, validation_message
+
+log = structlog.get_logger()
+
+_COPY_SQL = "COPY claim (car_id, claim_date, description, amount, created_at) FROM STDIN"
+
+
+def _use_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg"
+
+
+def _insert_rows(db: Session, rows: list[dict]) -> None:
+    """executemany insert, or COPY FROM STDIN when running on PostgreSQL via psycopg."""
+    if not _use_copy(db):
+        db.execute(insert(Claim), rows)
+        return
+    raw = db.connection().connection.driver_connection
+    with raw.cursor() as cur, cur.copy(_COPY_SQL) as copy:
+        for r in rows:
+            copy.write_row((r["car_id"], r["claim_date"], r["description"], r["amount"], r["created_at"]))
+
+
+def _ingest_chunk(db: Session, chunk: list[tuple[int, Union[dict, RecordError]]], report: ClaimIngestReport) -> None:
+    valid: list[tuple[int, ClaimImportRow]] = []
+    for row_no, record in chunk:
+        if isinstance(record, RecordError):
+            report.errors.append(ImportRowError(row=row_no, detail=str(record)))
+            continue
+        try:
+            valid.append((row_no, ClaimImportRow.model_validate(record)))
+        except ValidationError as e:
+            report.errors.append(ImportRowError(row=row_no, car_id=raw_car_id(record), detail=validation_message(e)))
+
+    if not valid:
+        return
+
+    car_ids = {item.car_id for _, item in valid}
+
+    def attempt() -> tuple[list[dict], list[tuple[int, int]]]:
+        # car rows first, like the policy paths: every writer locks car before car_summary
+        known = lock_cars(db, car_ids)
+        now = datetime.now(timezone.utc)
+        rows: list[dict] = []
+        missing: list[tuple[int, int]] = []
+        for row_no, item in valid:
+            if item.car_id not in known:
+                missing.append((row_no, item.car_id))
+                continue
+            rows.append({
+                "car_id": item.car_id,
+                "claim_date": item.claim_date,
+                "description": item.description,
+                "amount": item.amount,
+                "created_at": now,
+            })
+        if rows:
+            _insert_rows(db, rows)
+            record_claims(db, [(r["car_id"], r["claim_date"], r["amount"]) for r in rows])
+            bump_car_versions(db, {row["car_id"] for row in rows})
+        db.commit()
+        return rows, missing
+
+    rows, missing = run_with_lock_retry(db, "ingest_claims", attempt)
+    for row_no, car_id in missing:
+        report.errors.append(ImportRowError(row=row_no, car_id=car_id, detail="Car not found"))
+    report.inserted += len(rows)
+
+
+def ingest_claims(
+    db: Session,
+    records: Iterable[tuple[int, Union[dict, RecordError]]],
+    chunk_size: int = 2000,
+) -> ClaimIngestReport:
+    """
+    High-throughput claim ingestion. Per chunk of `chunk_size` rows: validate through
+    ClaimCreate rules, lock the chunk's cars (also the existence check), insert in one
+    executemany/COPY and commit. Failed rows are reported, never abort the run.
+    """
+    report = ClaimIngestReport()
+    started = time.perf_counter()
+
+    chunk: list = []
+    for rec in records:
+        report.total += 1
+        chunk.append(rec)
+        if len(chunk) >= chunk_size:
+            _ingest_chunk(db, chunk, report)
+            chunk = []
+    if chunk:
+        _ingest_chunk(db, chunk, report)
+
+    report.errors.sort(key=lambda e: e.row)
+    report.failed = len(report.errors)
+    report.elapsed_seconds = round(time.perf_counter() - started, 3)
+    if report.elapsed_seconds > 0:
+        report.rows_per_second = round(report.inserted / report.elapsed_seconds, 1)
+
+    log.info(
+        "claims_ingested",
+        total=report.total,
+        inserted=report.inserted,
+        failed=report.failed,
+        elapsedSeconds=report.elapsed_seconds,
+        rowsPerSecond=report.rows_per_second,
+    )
+    return report
@@ -1,25 +1,35 @@
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
-from app.db.models import Car, Claim
 from app.api.errors import CarNotFoundError
+from app.db.locking import lock_cars, lock_cars_async, run_with_lock_retry, run_with_lock_retry_async
+from app.db.models import Claim
+from app.services.summary_service import record_claims, record_claims_async
+from app.services.version_service import bump_car_versions, bump_car_versions_async
 
 log = structlog.get_logger()
 
 def create_claim(db: Session, car_id: int, claim_date, description: str, amount) -> Claim:
-    car = db.get(Car, car_id)
-    if not car:
-        raise CarNotFoundError(car_id)
-
-    claim = Claim(
-        car_id=car_id,
-        claim_date=claim_date,
-        description=description,
-        amount=amount,
-        created_at=datetime.now(timezone.utc),
-    )
-    db.add(claim)
-    db.commit()
+    def attempt() -> Claim:
+        # car row first, like create_policy: every writer locks car before car_summary
+        if car_id not in lock_cars(db, [car_id]):
+            raise CarNotFoundError(car_id)
+
+        claim = Claim(
+            car_id=car_id,
+            claim_date=claim_date,
+            description=description,
+            amount=amount,
+            created_at=datetime.now(timezone.utc),
+        )
+        db.add(claim)
+        record_claims(db, [(car_id, claim_date, amount)])
+        bump_car_versions(db, [car_id])
+        db.commit()
+        return claim
+
+    claim = run_with_lock_retry(db, "create_claim", attempt)
     db.refresh(claim)
 
     log.info(
@@ -29,4 +39,35 @@ def create_claim(db: Session, car_id: int, claim_date, description: str, amount)
         claimDate=str(claim_date),
         amount=str(amount)
     )
-    return claim
\ No newline at end of file
+    return claim
+
+
+async def create_claim_async(db: AsyncSession, car_id: int, claim_date, description: str, amount) -> Claim:
+    async def attempt() -> Claim:
+        if car_id not in await lock_cars_async(db, [car_id]):
+            raise CarNotFoundError(car_id)
+
+        claim = Claim(
+            car_id=car_id,
+            claim_date=claim_date,
+            description=description,
+            amount=amount,
+            created_at=datetime.now(timezone.utc),
+        )
+        db.add(claim)
+        await record_claims_async(db, [(car_id, claim_date, amount)])
+        await bump_car_versions_async(db, [car_id])
+        await db.commit()
+        return claim
+
+    claim = await run_with_lock_retry_async(db, "create_claim", attempt)
+    await db.refresh(claim)
+
+    log.info(
+        "claim_created",
+        claimId=claim.id,
+        carId=car_id,
+        claimDate=str(claim_date),
+        amount=str(amount)
+    )
+    return claim
@@ -0,0 +1,108 @@
+# app/services/coverage_service.py
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Iterable, Sequence
+
+import structlog
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.api.errors import CarNotFoundError
+from app.db.models import Car, InsurancePolicy
+
+log = structlog.get_logger()
+
+_ONE_DAY = timedelta(days=1)
+
+Interval = tuple[date, date]
+
+
+def merge_coverage(rows: Iterable[Interval], date_from: date, date_to: date) -> tuple[list[Interval], list[Interval]]:
+    """
+    Single pass over (start, end) policy rows sorted by start: clip them to
+    [date_from, date_to], merge overlapping or adjacent inclusive intervals
+    (end + 1 day == next start) and collect the uncovered gaps in between.
+    Returns (covered, gaps), both sorted and inclusive.
+    """
+    covered: list[Interval] = []
+    gaps: list[Interval] = []
+    cur_start = cur_end = None
+    next_uncovered = date_from  # first day not known to be covered
+
+    for start, end in rows:
+        start, end = max(start, date_from), min(end, date_to)
+        if start > end:
+            continue
+        if cur_end is not None and start <= cur_end + _ONE_DAY:
+            if end > cur_end:
+                cur_end = end
+            continue
+        if cur_end is not None:
+            covered.append((cur_start, cur_end))
+            next_uncovered = cur_end + _ONE_DAY
+        if start > next_uncovered:
+            gaps.append((next_uncovered, start - _ONE_DAY))
+        cur_start, cur_end = start, end
+
+    if cur_end is not None:
+        covered.append((cur_start, cur_end))
+        next_uncovered = cur_end + _ONE_DAY
+    if next_uncovered <= date_to:
+        gaps.append((next_uncovered, date_to))
+    return covered, gaps
+
+
+def _coverage_stmt(car_ids: Sequence[int], date_from: date, date_to: date):
+    """
+    car LEFT JOIN policies overlapping the range, ordered by (car_id, start_date):
+    walks ix_policy_car_dates; a car without policies yields one NULL row,
+    a missing car yields none.
+    """
+    return (
+        select(Car.id, InsurancePolicy.start_date, InsurancePolicy.end_date)
+        .select_from(Car)
+        .outerjoin(
+            InsurancePolicy,
+            and_(
+                InsurancePolicy.car_id == Car.id,
+                InsurancePolicy.start_date <= date_to,
+                InsurancePolicy.end_date >= date_from,
+            ),
+        )
+        .where(Car.id.in_(car_ids))
+        .order_by(Car.id, InsurancePolicy.start_date)
+    )
+
+
+def _rows_by_car(db: Session, car_ids: Sequence[int], date_from: date, date_to: date) -> dict[int, list[Interval]]:
+    rows_by_car: dict[int, list[Interval]] = {}
+    for car_id, start, end in db.execute(_coverage_stmt(car_ids, date_from, date_to)):
+        bucket = rows_by_car.setdefault(car_id, [])
+        if start is not None:
+            bucket.append((start, end))
+    return rows_by_car
+
+
+def get_coverage(db: Session, car_id: int, date_from: date, date_to: date) -> tuple[list[Interval], list[Interval]]:
+    """(covered, gaps) of one car within [date_from, date_to]; 404 if the car does not exist."""
+    rows_by_car = _rows_by_car(db, [car_id], date_from, date_to)
+    if car_id not in rows_by_car:
+        raise CarNotFoundError(car_id)
+    covered, gaps = merge_coverage(rows_by_car[car_id], date_from, date_to)
+    log.info("coverage_computed", carId=car_id, intervals=len(covered), gaps=len(gaps))
+    return covered, gaps
+
+
+def get_coverage_batch(
+    db: Session, car_ids: Sequence[int], date_from: date, date_to: date
+) -> dict[int, tuple[list[Interval], list[Interval]]]:
+    """
+    Coverage of many cars with one query. Cars that do not exist are absent
+    from the returned mapping.
+    """
+    unique_ids = list(dict.fromkeys(car_ids))
+    rows_by_car = _rows_by_car(db, unique_ids, date_from, date_to)
+    result = {car_id: merge_coverage(rows, date_from, date_to) for car_id, rows in rows_by_car.items()}
+    log.info("coverage_batch_computed", cars=len(unique_ids), notFound=len(unique_ids) - len(result))
+    return result
@@ -1,50 +1,206 @@
-from sqlalchemy import select
+import heapq
+from contextlib import aclosing
+from datetime import date
+from itertools import islice
+from typing import AsyncIterator, Iterator, NamedTuple, Optional, Union
+
+from sqlalchemy import select, or_, and_
 from sqlalchemy.orm import Session
-from app.db.models import Car, InsurancePolicy, Claim
-from app.api.errors import CarNotFoundError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import InsurancePolicy, Claim
+from app.api.errors import BadRequestError
+from app.api.schemas import HistoryPolicyItem, HistoryClaimItem
+from app.services.car_registry import ensure_car_exists, ensure_car_exists_async
+
+HistoryEvent = Union[HistoryPolicyItem, HistoryClaimItem]
+
+# Tie-break on the same date: policies first, then claims, then by id
+_POLICY = 0
+_CLAIM = 1
+_KIND_CODES = {"P": _POLICY, "C": _CLAIM}
+
 
+class HistoryCursor(NamedTuple):
+    """Position of the last event returned: (event date, kind, row id)."""
+    on_date: date
+    kind: int
+    id: int
 
-def get_car_history(db: Session, car_id: int) -> list[dict]:
-    car = db.get(Car, car_id)
-    if not car:
-        raise CarNotFoundError(car_id)
+    def encode(self) -> str:
+        return f"{self.on_date.isoformat()}.{'P' if self.kind == _POLICY else 'C'}.{self.id}"
 
-    policies = db.execute(
-        select(InsurancePolicy)
+    @classmethod
+    def decode(cls, token: str) -> "HistoryCursor":
+        try:
+            d, kind, row_id = token.split(".")
+            return cls(date.fromisoformat(d), _KIND_CODES[kind], int(row_id))
+        except (ValueError, KeyError) as e:
+            raise BadRequestError("Invalid history cursor") from e
+
+
+def _policy_stmt(car_id: int, date_from, date_to, after, chunk_size):
+    stmt = (
+        select(InsurancePolicy.id, InsurancePolicy.start_date, InsurancePolicy.end_date, InsurancePolicy.provider)
         .where(InsurancePolicy.car_id == car_id)
-        .order_by(InsurancePolicy.start_date)
-    ).scalars().all()
+        .order_by(InsurancePolicy.start_date, InsurancePolicy.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    if date_from is not None:
+        stmt = stmt.where(InsurancePolicy.start_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(InsurancePolicy.start_date <= date_to)
+    if after is not None:
+        if after.kind == _POLICY:
+            stmt = stmt.where(or_(
+                InsurancePolicy.start_date > after.on_date,
+                and_(InsurancePolicy.start_date == after.on_date, InsurancePolicy.id > after.id),
+            ))
+        else:
+            stmt = stmt.where(InsurancePolicy.start_date > after.on_date)
+    return stmt
+
 
-    claims = db.execute(
-        select(Claim)
+def _claim_stmt(car_id: int, date_from, date_to, after, chunk_size):
+    stmt = (
+        select(Claim.id, Claim.claim_date, Claim.amount, Claim.description)
         .where(Claim.car_id == car_id)
-        .order_by(Claim.claim_date)
-    ).scalars().all()
-
-    events: list[dict] = []
-
-    for p in policies:
-        events.append({
-            "type": "POLICY",
-            "policy_id": p.id,
-            "start_date": p.start_date,
-            "end_date": p.end_date,
-            "provider": p.provider,
-            "_sort": p.start_date,
-        })
-
-    for c in claims:
-        events.append({
-            "type": "CLAIM",
-            "claim_id": c.id,
-            "claim_date": c.claim_date,
-            "amount": c.amount,
-            "description": c.description,
-            "_sort": c.claim_date,
-        })
-
-    events.sort(key=lambda e: e["_sort"])  # ascending chronological order
-    for e in events:
-        e.pop("_sort", None)
-
-    return events
+        .order_by(Claim.claim_date, Claim.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    if date_from is not None:
+        stmt = stmt.where(Claim.claim_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Claim.claim_date <= date_to)
+    if after is not None:
+        if after.kind == _CLAIM:
+            stmt = stmt.where(or_(
+                Claim.claim_date > after.on_date,
+                and_(Claim.claim_date == after.on_date, Claim.id > after.id),
+            ))
+        else:
+            stmt = stmt.where(Claim.claim_date >= after.on_date)
+    return stmt
+
+
+def _policy_event(row) -> tuple:
+    policy_id, start, end, provider = row
+    item = HistoryPolicyItem.model_construct(policy_id=policy_id, start_date=start, end_date=end, provider=provider)
+    return start, _POLICY, policy_id, item
+
+
+def _claim_event(row) -> tuple:
+    claim_id, claim_date, amount, description = row
+    item = HistoryClaimItem.model_construct(
+        claim_id=claim_id, claim_date=claim_date, amount=amount, description=description
+    )
+    return claim_date, _CLAIM, claim_id, item
+
+
+def iter_car_history(
+    db: Session,
+    car_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[HistoryCursor] = None,
+    chunk_size: int = 500,
+) -> Iterator[tuple[HistoryCursor, HistoryEvent]]:
+    """
+    Lazily merge the two date-ordered cursors (policies by start_date, claims by
+    claim_date) into one ascending stream. Events are filtered on their own date
+    (policy start / claim date) and resume strictly after `after`.
+    Does not check that the car exists; see car_registry.ensure_car_exists.
+    """
+    merged = heapq.merge(
+        map(_policy_event, db.execute(_policy_stmt(car_id, date_from, date_to, after, chunk_size))),
+        map(_claim_event, db.execute(_claim_stmt(car_id, date_from, date_to, after, chunk_size))),
+    )
+    for on_date, kind, row_id, item in merged:
+        yield HistoryCursor(on_date, kind, row_id), item
+
+
+def get_car_history(
+    db: Session,
+    car_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[HistoryCursor] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[HistoryEvent], Optional[HistoryCursor]]:
+    """
+    Return up to `limit` events in ascending chronological order, plus the cursor of
+    the last returned event when more events follow (None otherwise).
+    """
+    ensure_car_exists(db, car_id)
+
+    stream = iter_car_history(db, car_id, date_from, date_to, after)
+    if limit is None:
+        return [item for _, item in stream], None
+
+    page = list(islice(stream, limit + 1))
+    has_more = len(page) > limit
+    page = page[:limit]
+    next_cursor = page[-1][0] if has_more else None
+    return [item for _, item in page], next_cursor
+
+
+async def _amerge(a: AsyncIterator[tuple], b: AsyncIterator[tuple]) -> AsyncIterator[tuple]:
+    """Two-way merge of ascending async streams of (date, kind, id, item) tuples."""
+    x = await anext(a, None)
+    y = await anext(b, None)
+    while x is not None and y is not None:
+        if x[:3] <= y[:3]:
+            yield x
+            x = await anext(a, None)
+        else:
+            yield y
+            y = await anext(b, None)
+    rest, tail = (x, a) if x is not None else (y, b)
+    if rest is not None:
+        yield rest
+        async for e in tail:
+            yield e
+
+
+async def iter_car_history_async(
+    db: AsyncSession,
+    car_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[HistoryCursor] = None,
+    chunk_size: int = 500,
+) -> AsyncIterator[tuple[HistoryCursor, HistoryEvent]]:
+    policies = await db.stream(_policy_stmt(car_id, date_from, date_to, after, chunk_size))
+    claims = await db.stream(_claim_stmt(car_id, date_from, date_to, after, chunk_size))
+    try:
+        merged = _amerge(
+            (_policy_event(r) async for r in policies),
+            (_claim_event(r) async for r in claims),
+        )
+        async for on_date, kind, row_id, item in merged:
+            yield HistoryCursor(on_date, kind, row_id), item
+    finally:
+        await policies.close()
+        await claims.close()
+
+
+async def get_car_history_async(
+    db: AsyncSession,
+    car_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[HistoryCursor] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[HistoryEvent], Optional[HistoryCursor]]:
+    await ensure_car_exists_async(db, car_id)
+
+    page: list[tuple[HistoryCursor, HistoryEvent]] = []
+    async with aclosing(iter_car_history_async(db, car_id, date_from, date_to, after)) as stream:
+        async for entry in stream:
+            page.append(entry)
+            if limit is not None and len(page) > limit:
+                break
+
+    if limit is None or len(page) <= limit:
+        return [item for _, item in page], None
+    page = page[:limit]
+    return [item for _, item in page], page[-1][0]
@@ -0,0 +1,154 @@
+# app/services/policy_import_service.py
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, NamedTuple, Optional, Union
+
+import structlog
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.api.schemas import ImportReport, ImportRowError, PolicyImportRow
+from app.db.locking import lock_cars
+from app.db.models import Car, InsurancePolicy
+from app.services.summary_service import record_policies
+from app.services.validity_index import validity_index
+from app.services.version_service import bump_car_versions
+from app.utils.bulk_io import RecordError, raw_car_id, validation_message
+
+log = structlog.get_logger()
+
+# Upper bound on cars per lock group: keeps the IN (...) lists well below driver parameter limits
+PREFETCH_CHUNK = 500
+
+
+class _Row(NamedTuple):
+    start_date: date
+    end_date: date
+    row: int
+    provider: Optional[str]
+
+
+def _sweep(existing: list[tuple[date, date]], rows: list[_Row]):
+    """
+    Single sweep over one car's new rows (sorted by start) against its existing
+    policies (sorted by start, non-overlapping). Inclusive ranges.
+    Yields (row, error) where error is None for accepted rows.
+    """
+    j = 0
+    last_accepted: Optional[_Row] = None
+    for r in rows:
+        # existing policies that end before this row starts can never overlap later rows
+        while j < len(existing) and existing[j][1] < r.start_date:
+            j += 1
+        if j < len(existing) and existing[j][0] <= r.end_date:
+            yield r, "Policy date range overlaps an existing policy."
+        elif last_accepted is not None and last_accepted.end_date >= r.start_date:
+            yield r, f"Policy date range overlaps row {last_accepted.row} of this import."
+        else:
+            last_accepted = r
+            yield r, None
+
+
+def import_policies(
+    db: Session,
+    records: Iterable[tuple[int, Union[dict, RecordError]]],
+    batch_size: int = 1000,
+    group_size: int = 100,
+) -> ImportReport:
+    """
+    Validate, overlap-check and insert many policies.
+
+    Rows are grouped by car and sorted by start date. Each group of `group_size`
+    cars (capped at PREFETCH_CHUNK) is write-locked (see app.db.locking),
+    prefetched with one query (car existence + existing policies), checked with a
+    sweep-line pass, and its accepted rows are inserted in statements of
+    `batch_size` rows; the group commits as one transaction, so concurrent policy
+    writes for those cars cannot slip between check and insert. Smaller groups
+    hold fewer locks for less time at the cost of more round trips.
+    Every rejected row is reported with its row number.
+    """
+    report = ImportReport()
+    by_car: dict[int, list[_Row]] = {}
+
+    for row_no, record in records:
+        report.total += 1
+        if isinstance(record, RecordError):
+            report.errors.append(ImportRowError(row=row_no, detail=str(record)))
+            continue
+        try:
+            item = PolicyImportRow.model_validate(record)
+        except ValidationError as e:
+            report.errors.append(ImportRowError(
+                row=row_no,
+                car_id=raw_car_id(record),
+                detail=validation_message(e),
+            ))
+            continue
+        by_car.setdefault(item.car_id, []).append(_Row(item.start_date, item.end_date, row_no, item.provider))
+
+    pending: list[dict] = []
+
+    def flush() -> None:
+        if not pending:
+            return
+        inserted = db.execute(
+            insert(InsurancePolicy).returning(
+                InsurancePolicy.id, InsurancePolicy.car_id, InsurancePolicy.provider,
+                InsurancePolicy.start_date, InsurancePolicy.end_date,
+            ),
+            pending,
+        ).all()
+        record_policies(db, inserted)
+        bump_car_versions(db, {row["car_id"] for row in pending})
+        report.inserted += len(pending)
+        pending.clear()
+
+    group_size = max(1, min(group_size, PREFETCH_CHUNK))
+    car_ids = sorted(by_car)
+    for i in range(0, len(car_ids), group_size):
+        chunk = car_ids[i:i + group_size]
+        touched: set[int] = set()
+        lock_cars(db, chunk)
+        existing: dict[int, list[tuple[date, date]]] = {}
+        prefetch = (
+            select(Car.id, InsurancePolicy.start_date, InsurancePolicy.end_date)
+            .select_from(Car)
+            .outerjoin(InsurancePolicy, InsurancePolicy.car_id == Car.id)
+            .where(Car.id.in_(chunk))
+            .order_by(Car.id, InsurancePolicy.start_date)
+        )
+        for car_id, start, end in db.execute(prefetch):
+            bucket = existing.setdefault(car_id, [])
+            if start is not None:
+                bucket.append((start, end))
+
+        for car_id in chunk:
+            rows = sorted(by_car[car_id])
+            if car_id not in existing:
+                report.errors.extend(ImportRowError(row=r.row, car_id=car_id, detail="Car not found") for r in rows)
+                continue
+            for r, error in _sweep(existing[car_id], rows):
+                if error is not None:
+                    report.errors.append(ImportRowError(row=r.row, car_id=car_id, detail=error))
+                    continue
+                pending.append({
+                    "car_id": car_id,
+                    "provider": r.provider,
+                    "start_date": r.start_date,
+                    "end_date": r.end_date,
+                })
+                touched.add(car_id)
+                if len(pending) >= batch_size:
+                    flush()
+        flush()
+        db.commit()
+        # right after each group's commit: a later group may still fail or take a while
+        for car_id in touched:
+            validity_index.invalidate(car_id)
+
+    report.errors.sort(key=lambda e: e.row)
+    report.failed = len(report.errors)
+    log.info("policies_imported", total=report.total, inserted=report.inserted, failed=report.failed)
+    return report
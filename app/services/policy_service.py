@@ -7,9 +7,14 @@ from typing import Optional
 import structlog
 from sqlalchemy import select, or_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Car, InsurancePolicy
-from app.api.errors import CarNotFoundError, BadRequestError
+from app.db.models import InsurancePolicy
+from app.api.errors import BadRequestError, CarNotFoundError
+from app.db.locking import lock_cars, lock_cars_async, run_with_lock_retry, run_with_lock_retry_async
+from app.services.summary_service import record_policies, record_policies_async
+from app.services.validity_index import validity_index
+from app.services.version_service import bump_car_versions, bump_car_versions_async
 
 log = structlog.get_logger()
 
@@ -19,18 +24,24 @@ def _ranges_overlap(a_start: date, a_end: date, b_start: date, b_end: date) -> b
     return not (a_end < b_start or a_start > b_end)
 
 
-def assert_no_overlap(db: Session, car_id: int, start: date, end: date) -> None:
-    """
-    Check if any existing policy for this car overlaps [start, end].
-    SQL form: NOT (existing.end < start OR existing.start > end)
-    """
-    overlap_stmt = (
+def _overlap_stmt(car_id: int, start: date, end: date):
+    """SQL form: NOT (existing.end < start OR existing.start > end)"""
+    return (
         select(InsurancePolicy.id)
         .where(InsurancePolicy.car_id == car_id)
         .where(~( (InsurancePolicy.end_date < start) | (InsurancePolicy.start_date > end) ))
         .limit(1)
     )
-    if db.execute(overlap_stmt).first():
+
+
+def assert_no_overlap(db: Session, car_id: int, start: date, end: date) -> None:
+    """Check if any existing policy for this car overlaps [start, end]."""
+    if db.execute(_overlap_stmt(car_id, start, end)).first():
+        raise BadRequestError("Policy date range overlaps an existing policy.")
+
+
+async def assert_no_overlap_async(db: AsyncSession, car_id: int, start: date, end: date) -> None:
+    if (await db.execute(_overlap_stmt(car_id, start, end))).first():
         raise BadRequestError("Policy date range overlaps an existing policy.")
 
 
@@ -41,28 +52,79 @@ def create_policy(
     start_date: date,
     end_date: date,
 ) -> InsurancePolicy:
-    # Car must exist
-    car = db.get(Car, car_id)
-    if not car:
-        raise CarNotFoundError(car_id)
-
     # Date sanity
     if end_date < start_date:
         raise BadRequestError("endDate must be on or after startDate")
 
-    # Overlap guard
-    assert_no_overlap(db, car_id, start_date, end_date)
+    def attempt() -> InsurancePolicy:
+        # Car must exist; holding its write lock makes the overlap check and insert atomic
+        if car_id not in lock_cars(db, [car_id]):
+            raise CarNotFoundError(car_id)
+
+        # Overlap guard
+        assert_no_overlap(db, car_id, start_date, end_date)
 
-    # Create
-    policy = InsurancePolicy(
-        car_id=car_id,
+        # Create
+        policy = InsurancePolicy(
+            car_id=car_id,
+            provider=provider,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        db.add(policy)
+        db.flush()  # policy.id for the summary row
+        record_policies(db, [(policy.id, car_id, provider, start_date, end_date)])
+        bump_car_versions(db, [car_id])
+        db.commit()
+        return policy
+
+    policy = run_with_lock_retry(db, "create_policy", attempt)
+    db.refresh(policy)
+    validity_index.add_policy(car_id, start_date, end_date)
+
+    log.info(
+        "policy_created",
+        policyId=policy.id,
+        carId=car_id,
         provider=provider,
-        start_date=start_date,
-        end_date=end_date,
+        startDate=str(start_date),
+        endDate=str(end_date),
     )
-    db.add(policy)
-    db.commit()
-    db.refresh(policy)
+    return policy
+
+
+async def create_policy_async(
+    db: AsyncSession,
+    car_id: int,
+    provider: Optional[str],
+    start_date: date,
+    end_date: date,
+) -> InsurancePolicy:
+    if end_date < start_date:
+        raise BadRequestError("endDate must be on or after startDate")
+
+    async def attempt() -> InsurancePolicy:
+        if car_id not in await lock_cars_async(db, [car_id]):
+            raise CarNotFoundError(car_id)
+
+        await assert_no_overlap_async(db, car_id, start_date, end_date)
+
+        policy = InsurancePolicy(
+            car_id=car_id,
+            provider=provider,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        db.add(policy)
+        await db.flush()
+        await record_policies_async(db, [(policy.id, car_id, provider, start_date, end_date)])
+        await bump_car_versions_async(db, [car_id])
+        await db.commit()
+        return policy
+
+    policy = await run_with_lock_retry_async(db, "create_policy", attempt)
+    await db.refresh(policy)
+    validity_index.add_policy(car_id, start_date, end_date)
 
     log.info(
         "policy_created",
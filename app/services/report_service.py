@@ -0,0 +1,50 @@
+# app/services/report_service.py
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterator
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Car, InsurancePolicy, Owner
+
+# Column names of the uninsured-cars export, in row order
+UNINSURED_COLUMNS = (
+    "carId", "vin", "make", "model", "yearOfManufacture", "ownerId", "ownerName", "ownerEmail",
+)
+
+
+def _uninsured_stmt(on_date: date):
+    """
+    Anti-join: cars with no policy covering on_date (inclusive), owner joined in.
+    Each car probes ix_policy_car_dates once; ordered by car id for stable exports.
+    """
+    return (
+        select(
+            Car.id, Car.vin, Car.make, Car.model, Car.year_of_manufacture,
+            Owner.id, Owner.name, Owner.email,
+        )
+        .join(Owner, Owner.id == Car.owner_id)
+        .outerjoin(
+            InsurancePolicy,
+            and_(
+                InsurancePolicy.car_id == Car.id,
+                InsurancePolicy.start_date <= on_date,
+                InsurancePolicy.end_date >= on_date,
+            ),
+        )
+        .where(InsurancePolicy.id.is_(None))
+        .order_by(Car.id)
+    )
+
+
+def iter_uninsured_cars(db: Session, on_date: date, chunk_size: int = 1000) -> Iterator[tuple]:
+    """
+    Yield one tuple per uninsured car (see UNINSURED_COLUMNS), read through a
+    server-side cursor (yield_per -> stream_results) `chunk_size` rows at a time,
+    so memory stays flat for any fleet size.
+    """
+    result = db.execute(_uninsured_stmt(on_date).execution_options(yield_per=chunk_size))
+    for row in result:
+        yield tuple(row)
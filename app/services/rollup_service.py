@@ -0,0 +1,305 @@
+# app/services/rollup_service.py
+"""
+Claim analytics rollups (claim_rollup): claim count and amount per day and per
+month, by car make/model and the provider of the policy active on claim_date.
+
+Incremental refresh follows a watermark (last rolled-up claim id, stored in
+version_counter). Each chunk of new claims is aggregated with one GROUP BY
+over an id range, upserted, and the watermark moves in the same transaction,
+so no claim is counted twice. Claims younger than ROLLUP_SAFETY_LAG_SECONDS
+(by created_at, stamped by the application) are left for the next run, so an id
+committed out of order by a slow concurrent transaction is normally not skipped.
+A claim whose transaction commits more than the lag after its created_at, below
+an id the watermark already passed, is skipped by every later refresh; the
+reconcile job (ROLLUP_RECONCILE_HOURS) rebuilds each shard's rollups to pick
+such claims up, so the gap lasts at most one reconcile period.
+
+Attribution uses the policies as they are at refresh time. Policies added
+later for past dates are picked up by the next rebuild too.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from time import perf_counter
+from typing import Iterable, Optional, Sequence
+
+import structlog
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Car, Claim, ClaimRollup, InsurancePolicy, VersionCounter
+from app.db.shards import scatter
+from app.db.upsert import dialect_insert
+
+log = structlog.get_logger()
+
+WATERMARK = "claim_rollup_watermark"
+DIMENSIONS = ("make", "model", "provider")
+
+
+@dataclass
+class RollupRunMetrics:
+    """Outcome of one refresh_claim_rollups run."""
+    started_at: datetime
+    processed: int = 0
+    chunks: int = 0
+    watermark: int = 0
+    duration_ms: float = 0.0
+
+
+# Metrics of the most recent refresh (None until the job has run once)
+last_rollup_run: Optional[RollupRunMetrics] = None
+
+
+def _watermark(db: Session, lock: bool = False) -> int:
+    stmt = select(VersionCounter.value).where(VersionCounter.name == WATERMARK)
+    if lock:
+        # serializes refresh and rebuild on PostgreSQL (no-op on SQLite, where writers serialize anyway)
+        stmt = stmt.with_for_update()
+    return db.execute(stmt).scalar() or 0
+
+
+def _set_watermark(db: Session, value: int) -> None:
+    stmt = dialect_insert(db)(VersionCounter).values(name=WATERMARK, value=value)
+    db.execute(stmt.on_conflict_do_update(index_elements=[VersionCounter.name], set_={"value": value}))
+
+
+def _daily_stmt(after_id: int, upto_id: int):
+    """Claims with after_id < id <= upto_id grouped by (claim_date, make, model, provider)."""
+    provider = (
+        select(InsurancePolicy.provider)
+        .where(InsurancePolicy.car_id == Claim.car_id)
+        .where(InsurancePolicy.start_date <= Claim.claim_date)
+        .where(InsurancePolicy.end_date >= Claim.claim_date)
+        .order_by(InsurancePolicy.start_date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    claims = (
+        select(
+            Claim.claim_date.label("day"),
+            Car.make.label("make"),
+            Car.model.label("model"),
+            provider.label("provider"),
+            Claim.amount.label("amount"),
+        )
+        .join(Car, Car.id == Claim.car_id)
+        .where(Claim.id > after_id, Claim.id <= upto_id)
+        .subquery()
+    )
+    keys = (claims.c.day, claims.c.make, claims.c.model, claims.c.provider)
+    return (
+        select(*keys, func.count().label("n"), func.sum(claims.c.amount).label("total"))
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+
+
+def _add(acc: dict, key: tuple, n: int, total) -> None:
+    entry = acc.get(key)
+    if entry is None:
+        acc[key] = [n, Decimal(total)]
+    else:
+        entry[0] += n
+        entry[1] += Decimal(total)
+
+
+def _upsert(db: Session, acc: dict) -> None:
+    """One executemany of a cached INSERT ... ON CONFLICT statement (adds to existing rows)."""
+    if not acc:
+        return
+    table = ClaimRollup.__table__
+    stmt = dialect_insert(db)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.grain, table.c.period_start, table.c.make, table.c.model, table.c.provider],
+        set_={
+            "claim_count": table.c.claim_count + stmt.excluded.claim_count,
+            "amount_total": table.c.amount_total + stmt.excluded.amount_total,
+        },
+    )
+    db.execute(stmt, [
+        {
+            "grain": grain, "period_start": period, "make": make, "model": model, "provider": provider,
+            "claim_count": n, "amount_total": total,
+        }
+        for (grain, period, make, model, provider), (n, total) in acc.items()
+    ])
+
+
+def _roll(db: Session, after_id: int, upto_id: int, day_flush: int = 10_000) -> int:
+    """Aggregate claims in (after_id, upto_id] into day and month rows; returns claims counted."""
+    days: dict = {}
+    months: dict = {}
+    counted = 0
+    result = db.execute(_daily_stmt(after_id, upto_id).execution_options(yield_per=day_flush))
+    for day, make, model, provider, n, total in result:
+        dims = (make or "", model or "", provider or "")
+        _add(days, ("day", day, *dims), n, total)
+        _add(months, ("month", day.replace(day=1), *dims), n, total)
+        counted += n
+        if len(days) >= day_flush:
+            _upsert(db, days)
+            days = {}
+    _upsert(db, days)
+    _upsert(db, months)
+    return counted
+
+
+def _cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.ROLLUP_SAFETY_LAG_SECONDS)
+
+
+def _chunk_end(db: Session, after_id: int, cutoff: datetime, chunk_size: int) -> Optional[int]:
+    ids = (
+        select(Claim.id)
+        .where(Claim.id > after_id, Claim.created_at <= cutoff)
+        .order_by(Claim.id)
+        .limit(chunk_size)
+        .subquery()
+    )
+    return db.execute(select(func.max(ids.c.id))).scalar()
+
+
+def refresh(db: Session, chunk_size: int, max_chunks: Optional[int] = None) -> RollupRunMetrics:
+    """Roll up claims past the watermark, one transaction per chunk of `chunk_size` claim ids."""
+    metrics = RollupRunMetrics(started_at=datetime.now())
+    started = perf_counter()
+    cutoff = _cutoff()
+    while max_chunks is None or metrics.chunks < max_chunks:
+        after_id = _watermark(db, lock=True)
+        upto_id = _chunk_end(db, after_id, cutoff, chunk_size)
+        if upto_id is None:
+            db.rollback()
+            metrics.watermark = after_id
+            break
+        metrics.processed += _roll(db, after_id, upto_id)
+        _set_watermark(db, upto_id)
+        db.commit()
+        metrics.chunks += 1
+        metrics.watermark = upto_id
+    metrics.duration_ms = round((perf_counter() - started) * 1000, 2)
+    return metrics
+
+
+def refresh_claim_rollups() -> int:
+    """Scheduler job: incremental refresh of every shard. Returns the number of claims rolled up."""
+    global last_rollup_run
+    runs = scatter(lambda db: refresh(db, settings.ROLLUP_CHUNK_SIZE), read=False)
+    metrics = runs[0]
+    if len(runs) > 1:
+        # shards refresh concurrently; the watermark shown is the lowest shard's
+        metrics = RollupRunMetrics(
+            started_at=min(r.started_at for r in runs),
+            processed=sum(r.processed for r in runs),
+            chunks=sum(r.chunks for r in runs),
+            watermark=min(r.watermark for r in runs),
+            duration_ms=max(r.duration_ms for r in runs),
+        )
+    last_rollup_run = metrics
+    log.info(
+        "claim_rollup_refreshed",
+        processed=metrics.processed,
+        chunks=metrics.chunks,
+        watermark=metrics.watermark,
+        durationMs=metrics.duration_ms,
+    )
+    return metrics.processed
+
+
+def reconcile_claim_rollups() -> int:
+    """Scheduler job: full rebuild of every shard's rollups. Returns the number of claims rolled up."""
+    runs = scatter(rebuild, read=False)
+    return sum(r.processed for r in runs)
+
+
+def rebuild(db: Session) -> RollupRunMetrics:
+    """Recompute every rollup row from the claim table in one transaction."""
+    metrics = RollupRunMetrics(started_at=datetime.now())
+    started = perf_counter()
+    _watermark(db, lock=True)
+    upto_id = db.execute(select(func.max(Claim.id)).where(Claim.created_at <= _cutoff())).scalar() or 0
+    db.execute(delete(ClaimRollup))
+    if upto_id:
+        metrics.processed = _roll(db, 0, upto_id)
+    _set_watermark(db, upto_id)
+    db.commit()
+    metrics.chunks = 1
+    metrics.watermark = upto_id
+    metrics.duration_ms = round((perf_counter() - started) * 1000, 2)
+    log.info("claim_rollup_rebuilt", processed=metrics.processed, watermark=upto_id, durationMs=metrics.duration_ms)
+    return metrics
+
+
+def query_rollups(
+    db: Session,
+    grain: str,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    group_by: Sequence[str],
+) -> tuple[list[dict], int]:
+    """
+    Rollup rows for `grain` ("day" | "month") with period_start in [date_from, date_to],
+    summed over the dimensions not in `group_by`. Returns (rows, watermark).
+    Unknown make/model/provider come back as None.
+    """
+    dims = [getattr(ClaimRollup, d) for d in DIMENSIONS if d in group_by]
+    stmt = (
+        select(
+            ClaimRollup.period_start,
+            *dims,
+            func.sum(ClaimRollup.claim_count).label("claim_count"),
+            func.sum(ClaimRollup.amount_total).label("amount_total"),
+        )
+        .where(ClaimRollup.grain == grain)
+        .group_by(ClaimRollup.period_start, *dims)
+        .order_by(ClaimRollup.period_start, *dims)
+    )
+    if date_from is not None:
+        stmt = stmt.where(ClaimRollup.period_start >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(ClaimRollup.period_start <= date_to)
+
+    names = [d for d in DIMENSIONS if d in group_by]
+    rows = []
+    for row in db.execute(stmt):
+        item = {"period_start": row.period_start, "claim_count": row.claim_count, "amount_total": row.amount_total}
+        for name in names:
+            item[name] = getattr(row, name) or None
+        rows.append(item)
+    return rows, _watermark(db)
+
+
+def merge_rollups(results: list[tuple[list[dict], int]], group_by: Sequence[str]) -> tuple[list[dict], int]:
+    """
+    Combine query_rollups results of several shards: rows with the same period and
+    dimensions are summed, in query_rollups order. The watermark of a sharded
+    result is the lowest shard watermark (claim ids are per shard).
+    """
+    if len(results) == 1:
+        return results[0]
+    names = [d for d in DIMENSIONS if d in group_by]
+    merged: dict[tuple, dict] = {}
+    for rows, _ in results:
+        for row in rows:
+            key = (row["period_start"], *(row[name] for name in names))
+            item = merged.get(key)
+            if item is None:
+                merged[key] = dict(row)
+            else:
+                item["claim_count"] += row["claim_count"]
+                item["amount_total"] += row["amount_total"]
+    # unknown (None) dimension values sort first, like the '' they are stored as
+    order = sorted(merged, key=lambda k: (k[0], *(v or "" for v in k[1:])))
+    return [merged[k] for k in order], min(watermark for _, watermark in results)
+
+
+def rollup_dimensions(values: Iterable[str]) -> list[str]:
+    """Validate a groupBy list; raises ValueError on unknown names."""
+    dims = [v.strip() for v in values if v.strip()]
+    unknown = [d for d in dims if d not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"groupBy must be a subset of {', '.join(DIMENSIONS)}; got {', '.join(unknown)}")
+    return dims
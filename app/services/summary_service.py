@@ -0,0 +1,293 @@
+# app/services/summary_service.py
+"""
+car_summary maintenance and reads.
+
+Writes go through one INSERT ... ON CONFLICT DO UPDATE per batch (SQLite and
+PostgreSQL), executed in the caller's transaction so the summary commits with
+the claim/policy rows. Increments are applied in SQL, so concurrent writers for
+the same car never lose updates.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Iterable, Optional, Sequence
+
+import structlog
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.errors import CarNotFoundError
+from app.api.schemas import CarSummaryOut, PolicyOut
+from app.db.models import Car, CarSummary, Claim, InsurancePolicy
+from app.db.upsert import dialect_insert
+
+log = structlog.get_logger()
+
+# rows per INSERT ... VALUES statement (10 bind params per row)
+_UPSERT_CHUNK = 500
+
+_t = CarSummary.__table__.c
+
+
+def _empty_row(car_id: int, now: datetime) -> dict:
+    return {
+        "car_id": car_id,
+        "claim_count": 0,
+        "claim_total": Decimal(0),
+        "last_claim_date": None,
+        "policy_count": 0,
+        "latest_policy_id": None,
+        "latest_policy_provider": None,
+        "latest_policy_start": None,
+        "latest_policy_end": None,
+        "updated_at": now,
+    }
+
+
+def _claims_upserts(insert_fn, claims: Iterable[tuple[int, date, Decimal]]):
+    """(car_id, claim_date, amount) rows -> upsert statements adding counts/totals per car."""
+    now = datetime.now(timezone.utc)
+    per_car: dict[int, dict] = {}
+    for car_id, claim_date, amount in claims:
+        row = per_car.get(car_id)
+        if row is None:
+            row = per_car[car_id] = _empty_row(car_id, now)
+        row["claim_count"] += 1
+        row["claim_total"] += Decimal(amount)
+        if row["last_claim_date"] is None or claim_date > row["last_claim_date"]:
+            row["last_claim_date"] = claim_date
+
+    rows = list(per_car.values())
+    for i in range(0, len(rows), _UPSERT_CHUNK):
+        stmt = insert_fn(CarSummary).values(rows[i:i + _UPSERT_CHUNK])
+        ex = stmt.excluded
+        yield stmt.on_conflict_do_update(
+            index_elements=[_t.car_id],
+            set_={
+                "claim_count": _t.claim_count + ex.claim_count,
+                "claim_total": _t.claim_total + ex.claim_total,
+                "last_claim_date": case(
+                    (or_(_t.last_claim_date.is_(None), ex.last_claim_date > _t.last_claim_date), ex.last_claim_date),
+                    else_=_t.last_claim_date,
+                ),
+                "updated_at": ex.updated_at,
+            },
+        )
+
+
+def _policies_upserts(insert_fn, policies: Iterable[tuple[int, int, Optional[str], date, date]]):
+    """(policy_id, car_id, provider, start, end) rows -> upserts bumping counts and the latest policy."""
+    now = datetime.now(timezone.utc)
+    per_car: dict[int, dict] = {}
+    for policy_id, car_id, provider, start, end in policies:
+        row = per_car.get(car_id)
+        if row is None:
+            row = per_car[car_id] = _empty_row(car_id, now)
+        row["policy_count"] += 1
+        if row["latest_policy_start"] is None or (start, policy_id) > (row["latest_policy_start"], row["latest_policy_id"]):
+            row.update(
+                latest_policy_id=policy_id,
+                latest_policy_provider=provider,
+                latest_policy_start=start,
+                latest_policy_end=end,
+            )
+
+    rows = list(per_car.values())
+    for i in range(0, len(rows), _UPSERT_CHUNK):
+        stmt = insert_fn(CarSummary).values(rows[i:i + _UPSERT_CHUNK])
+        ex = stmt.excluded
+        newer = or_(
+            _t.latest_policy_start.is_(None),
+            ex.latest_policy_start > _t.latest_policy_start,
+            and_(ex.latest_policy_start == _t.latest_policy_start, ex.latest_policy_id > _t.latest_policy_id),
+        )
+        latest = {
+            col: case((newer, getattr(ex, col)), else_=getattr(_t, col))
+            for col in ("latest_policy_id", "latest_policy_provider", "latest_policy_start", "latest_policy_end")
+        }
+        yield stmt.on_conflict_do_update(
+            index_elements=[_t.car_id],
+            set_={"policy_count": _t.policy_count + ex.policy_count, "updated_at": ex.updated_at, **latest},
+        )
+
+
+def record_claims(db: Session, claims: Iterable[tuple[int, date, Decimal]]) -> None:
+    for stmt in _claims_upserts(dialect_insert(db), claims):
+        db.execute(stmt)
+
+
+async def record_claims_async(db: AsyncSession, claims: Iterable[tuple[int, date, Decimal]]) -> None:
+    for stmt in _claims_upserts(dialect_insert(db), claims):
+        await db.execute(stmt)
+
+
+def record_policies(db: Session, policies: Iterable[tuple[int, int, Optional[str], date, date]]) -> None:
+    for stmt in _policies_upserts(dialect_insert(db), policies):
+        db.execute(stmt)
+
+
+async def record_policies_async(db: AsyncSession, policies: Iterable[tuple[int, int, Optional[str], date, date]]) -> None:
+    for stmt in _policies_upserts(dialect_insert(db), policies):
+        await db.execute(stmt)
+
+
+# --- reads -------------------------------------------------------------------
+
+def _summary_stmt():
+    return select(Car.id, CarSummary).outerjoin(CarSummary, CarSummary.car_id == Car.id)
+
+
+def _policy_out(policy_id, car_id, provider, start, end) -> PolicyOut:
+    return PolicyOut(id=policy_id, car_id=car_id, provider=provider, start_date=start, end_date=end)
+
+
+def _build(db: Session, rows: Sequence[tuple[int, Optional[CarSummary]]], today: date) -> list[CarSummaryOut]:
+    """
+    Summary rows -> API objects. The current policy is the latest one when it covers
+    today; if the latest policy is future-dated, the policy covering today (if any)
+    is looked up for those cars only, via ix_policy_car_dates, in one query.
+    """
+    future_dated = [car_id for car_id, s in rows if s is not None and s.latest_policy_start and s.latest_policy_start > today]
+    covering: dict[int, PolicyOut] = {}
+    if future_dated:
+        stmt = (
+            select(InsurancePolicy.id, InsurancePolicy.car_id, InsurancePolicy.provider,
+                   InsurancePolicy.start_date, InsurancePolicy.end_date)
+            .where(InsurancePolicy.car_id.in_(future_dated))
+            .where(InsurancePolicy.start_date <= today)
+            .where(InsurancePolicy.end_date >= today)
+        )
+        for row in db.execute(stmt):
+            covering[row.car_id] = _policy_out(*row)
+
+    out = []
+    for car_id, s in rows:
+        if s is None:
+            out.append(CarSummaryOut(car_id=car_id, claim_count=0, claim_total=Decimal(0), policy_count=0))
+            continue
+        latest = None
+        current = None
+        if s.latest_policy_id is not None:
+            latest = _policy_out(s.latest_policy_id, car_id, s.latest_policy_provider,
+                                 s.latest_policy_start, s.latest_policy_end)
+            if s.latest_policy_start <= today <= s.latest_policy_end:
+                current = latest
+            elif s.latest_policy_start > today:
+                current = covering.get(car_id)
+        out.append(CarSummaryOut(
+            car_id=car_id,
+            claim_count=s.claim_count,
+            claim_total=s.claim_total,
+            last_claim_date=s.last_claim_date,
+            policy_count=s.policy_count,
+            latest_policy=latest,
+            current_policy=current,
+        ))
+    return out
+
+
+def get_car_summary(db: Session, car_id: int, today: Optional[date] = None) -> CarSummaryOut:
+    """One car's summary from its car_summary row (zeros when it has none yet); 404 if the car does not exist."""
+    row = db.execute(_summary_stmt().where(Car.id == car_id)).first()
+    if row is None:
+        raise CarNotFoundError(car_id)
+    return _build(db, [tuple(row)], today or date.today())[0]
+
+
+def list_car_summaries(
+    db: Session, after: Optional[int], limit: int, today: Optional[date] = None
+) -> tuple[list[CarSummaryOut], Optional[int]]:
+    """Keyset page of summaries ordered by car id; returns (items, next_cursor)."""
+    stmt = _summary_stmt().order_by(Car.id).limit(limit + 1)
+    if after is not None:
+        stmt = stmt.where(Car.id > after)
+    rows = [tuple(r) for r in db.execute(stmt)]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1][0]
+    return _build(db, rows, today or date.today()), next_cursor
+
+
+# --- rebuild -----------------------------------------------------------------
+
+def _rebuild_select(lo: int, hi: int, now: datetime):
+    """INSERT ... SELECT source for cars lo..hi (inclusive); cars with no claims and no policies get no row."""
+    claims = (
+        select(
+            Claim.car_id,
+            func.count().label("n"),
+            func.sum(Claim.amount).label("total"),
+            func.max(Claim.claim_date).label("last_date"),
+        )
+        .where(Claim.car_id.between(lo, hi))
+        .group_by(Claim.car_id)
+        .subquery()
+    )
+    policy_counts = (
+        select(InsurancePolicy.car_id, func.count().label("n"))
+        .where(InsurancePolicy.car_id.between(lo, hi))
+        .group_by(InsurancePolicy.car_id)
+        .subquery()
+    )
+    ranked = (
+        select(
+            InsurancePolicy.id, InsurancePolicy.car_id, InsurancePolicy.provider,
+            InsurancePolicy.start_date, InsurancePolicy.end_date,
+            func.row_number().over(
+                partition_by=InsurancePolicy.car_id,
+                order_by=(InsurancePolicy.start_date.desc(), InsurancePolicy.id.desc()),
+            ).label("rn"),
+        )
+        .where(InsurancePolicy.car_id.between(lo, hi))
+        .subquery()
+    )
+    return (
+        select(
+            Car.id,
+            func.coalesce(claims.c.n, 0),
+            func.coalesce(claims.c.total, 0),
+            claims.c.last_date,
+            func.coalesce(policy_counts.c.n, 0),
+            ranked.c.id,
+            ranked.c.provider,
+            ranked.c.start_date,
+            ranked.c.end_date,
+            literal(now, CarSummary.__table__.c.updated_at.type),
+        )
+        .select_from(Car)
+        .outerjoin(claims, claims.c.car_id == Car.id)
+        .outerjoin(policy_counts, policy_counts.c.car_id == Car.id)
+        .outerjoin(ranked, and_(ranked.c.car_id == Car.id, ranked.c.rn == 1))
+        .where(Car.id.between(lo, hi))
+        .where(or_(claims.c.car_id.is_not(None), policy_counts.c.car_id.is_not(None)))
+    )
+
+
+def rebuild_car_summary(db: Session, chunk_size: int = 50_000) -> int:
+    """
+    Recompute car_summary from claim/insurance_policy, one car-id range of
+    `chunk_size` per transaction (delete + INSERT ... SELECT). Returns rows written.
+    """
+    lo, hi = db.execute(select(func.min(Car.id), func.max(Car.id))).one()
+    written = 0
+    if lo is None:
+        db.execute(delete(CarSummary))
+        db.commit()
+        return 0
+
+    columns = [
+        "car_id", "claim_count", "claim_total", "last_claim_date", "policy_count",
+        "latest_policy_id", "latest_policy_provider", "latest_policy_start", "latest_policy_end", "updated_at",
+    ]
+    now = datetime.now(timezone.utc)
+    for start in range(lo, hi + 1, chunk_size):
+        end = start + chunk_size - 1
+        db.execute(delete(CarSummary).where(CarSummary.car_id.between(start, end)))
+        result = db.execute(insert(CarSummary).from_select(columns, _rebuild_select(start, end, now)))
+        db.commit()
+        written += max(result.rowcount or 0, 0)
+    log.info("car_summary_rebuilt", rows=written)
+    return written
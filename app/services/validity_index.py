@@ -0,0 +1,134 @@
+# app/services/validity_index.py
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date
+from typing import Iterable, Optional, Sequence
+
+from app.core.config import settings
+
+
+def build_intervals(rows: Iterable[tuple[date, date]]) -> tuple[list[date], list[date]]:
+    """
+    Turn (start, end) rows sorted by start into parallel arrays for bisect lookup.
+    The second array holds the running max of end dates, so a lookup stays correct
+    even if legacy rows overlap.
+    """
+    starts: list[date] = []
+    max_ends: list[date] = []
+    for start, end in rows:
+        starts.append(start)
+        max_ends.append(end if not max_ends or end > max_ends[-1] else max_ends[-1])
+    return starts, max_ends
+
+
+def covers(starts: Sequence[date], max_ends: Sequence[date], on_date: date) -> bool:
+    """Inclusive lookup: is there a policy with start <= on_date <= end?"""
+    i = bisect_right(starts, on_date) - 1
+    return i >= 0 and max_ends[i] >= on_date
+
+
+class _CarIntervals:
+    """Sorted policy intervals of one car: start dates + running max of end dates."""
+
+    __slots__ = ("starts", "max_ends", "loaded_at")
+
+    def __init__(self, starts: list[date], max_ends: list[date], loaded_at: float):
+        self.starts = starts
+        self.max_ends = max_ends
+        self.loaded_at = loaded_at
+
+
+class PolicyIntervalIndex:
+    """
+    Bounded, in-process LRU of per-car policy intervals.
+
+    Lookups are a bisect over the car's sorted start dates (O(log n), no DB round trip).
+    Writes in this process go through add_policy()/invalidate(); entries also expire
+    after `ttl_seconds` so writes made by other workers become visible eventually.
+    """
+
+    def __init__(self, max_cars: int, ttl_seconds: float):
+        self.max_cars = max_cars
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, _CarIntervals] = OrderedDict()
+        self._lock = threading.Lock()
+        # bumped on every write so a load that raced with a write is discarded
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, car_id: int, on_date: date) -> Optional[bool]:
+        """Return validity for a cached car, or None when the car is not cached."""
+        with self._lock:
+            entry = self._entries.get(car_id)
+            if entry is None or time.monotonic() - entry.loaded_at > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[car_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(car_id)
+            self.hits += 1
+            return covers(entry.starts, entry.max_ends, on_date)
+
+    def generation(self) -> int:
+        """Token to pass to load(); take it *before* reading rows from the DB."""
+        with self._lock:
+            return self._generation
+
+    def load(self, car_id: int, rows: Iterable[tuple[date, date]], generation: int) -> None:
+        """Cache (start, end) rows sorted by start for a car known to exist."""
+        starts, max_ends = build_intervals(rows)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[car_id] = _CarIntervals(starts, max_ends, time.monotonic())
+            self._entries.move_to_end(car_id)
+            while len(self._entries) > self.max_cars:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def add_policy(self, car_id: int, start: date, end: date) -> None:
+        """Write-through for a committed policy; cars that are not cached stay uncached."""
+        with self._lock:
+            self._generation += 1
+            entry = self._entries.get(car_id)
+            if entry is None:
+                return
+            i = bisect_right(entry.starts, start)
+            prev_max = entry.max_ends[i - 1] if i > 0 else end
+            entry.starts.insert(i, start)
+            entry.max_ends.insert(i, max(prev_max, end))
+            for j in range(i + 1, len(entry.max_ends)):
+                if entry.max_ends[j] >= end:
+                    break
+                entry.max_ends[j] = end
+
+    def invalidate(self, car_id: Optional[int] = None) -> None:
+        """Drop one car (or everything when car_id is None)."""
+        with self._lock:
+            self._generation += 1
+            if car_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(car_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxCars": self.max_cars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+validity_index = PolicyIntervalIndex(
+    max_cars=settings.VALIDITY_INDEX_MAX_CARS,
+    ttl_seconds=settings.VALIDITY_INDEX_TTL_SECONDS,
+)
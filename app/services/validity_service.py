@@ -1,25 +1,140 @@
 from datetime import date
-from sqlalchemy import select
+from typing import Sequence
+from sqlalchemy import select, and_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 from app.db.models import InsurancePolicy, Car
 from app.api.errors import CarNotFoundError
+from app.core.config import settings
+from app.services.validity_index import validity_index, build_intervals, covers
 
 log = structlog.get_logger()
 
-def is_insurance_valid_on(db: Session, car_id: int, on_date: date) -> bool:
-    car = db.get(Car, car_id)
-    if not car:
-        raise CarNotFoundError(car_id)
-
-    stmt = (
+def _valid_on_stmt(car_id: int, on_date: date):
+    """
+    Existence check folded into the lookup: no row means the car does not exist,
+    otherwise `valid` tells whether a policy covers on_date.
+    """
+    covering = (
         select(InsurancePolicy.id)
-        .where(InsurancePolicy.car_id == car_id)
+        .where(InsurancePolicy.car_id == Car.id)
         .where(InsurancePolicy.start_date <= on_date)
         .where(InsurancePolicy.end_date >= on_date)
-        .limit(1)
+        .exists()
     )
-    res = db.execute(stmt).first()
-    valid = res is not None
+    return select(covering.label("valid")).where(Car.id == car_id)
+
+
+def _intervals_stmt(car_id: int):
+    """All policy intervals of a car; a single (None, None) row when it has none, no rows when it does not exist."""
+    return (
+        select(InsurancePolicy.start_date, InsurancePolicy.end_date)
+        .select_from(Car)
+        .outerjoin(InsurancePolicy, InsurancePolicy.car_id == Car.id)
+        .where(Car.id == car_id)
+        .order_by(InsurancePolicy.start_date)
+    )
+
+
+def _intervals_from_rows(car_id: int, rows) -> list:
+    if not rows:
+        raise CarNotFoundError(car_id)
+    return [r for r in rows if r[0] is not None]
+
+
+def is_insurance_valid_on(db: Session, car_id: int, on_date: date) -> bool:
+    if settings.VALIDITY_INDEX_ENABLED:
+        valid = _valid_from_index(db, car_id, on_date)
+        log.info("insurance_validity_checked", carId=car_id, date=str(on_date), valid=valid)
+        return valid
+
+    res = db.execute(_valid_on_stmt(car_id, on_date)).first()
+    if res is None:
+        raise CarNotFoundError(car_id)
+    valid = bool(res.valid)
+    log.info("insurance_validity_checked", carId=car_id, date=str(on_date), valid=valid)
+    return valid
+
+
+def _valid_from_index(db: Session, car_id: int, on_date: date) -> bool:
+    """Answer from the in-process interval index, loading the car's policies on a miss."""
+    valid = validity_index.lookup(car_id, on_date)
+    if valid is not None:
+        return valid
+
+    generation = validity_index.generation()
+    rows = _intervals_from_rows(car_id, db.execute(_intervals_stmt(car_id)).all())
+    validity_index.load(car_id, rows, generation)
+    return covers(*build_intervals(rows), on_date)
+
+
+async def is_insurance_valid_on_async(db: AsyncSession, car_id: int, on_date: date) -> bool:
+    if settings.VALIDITY_INDEX_ENABLED:
+        valid = validity_index.lookup(car_id, on_date)
+        if valid is None:
+            generation = validity_index.generation()
+            rows = _intervals_from_rows(car_id, (await db.execute(_intervals_stmt(car_id))).all())
+            validity_index.load(car_id, rows, generation)
+            valid = covers(*build_intervals(rows), on_date)
+    else:
+        res = (await db.execute(_valid_on_stmt(car_id, on_date))).first()
+        if res is None:
+            raise CarNotFoundError(car_id)
+        valid = bool(res.valid)
+
     log.info("insurance_validity_checked", carId=car_id, date=str(on_date), valid=valid)
-    return valid
\ No newline at end of file
+    return valid
+
+
+def check_validity_batch(db: Session, pairs: Sequence[tuple[int, date]]) -> list[tuple[bool, bool]]:
+    """
+    Resolve many (car_id, date) checks with a single query.
+    Returns one (found, valid) tuple per input pair, in input order.
+
+    SQL form: car LEFT JOIN insurance_policy restricted to the requested cars and to
+    the overall date span, so it is served by ix_policy_car_dates.
+    """
+    if not pairs:
+        return []
+
+    car_ids = {car_id for car_id, _ in pairs}
+    min_date = min(d for _, d in pairs)
+    max_date = max(d for _, d in pairs)
+
+    stmt = (
+        select(Car.id, InsurancePolicy.start_date, InsurancePolicy.end_date)
+        .select_from(Car)
+        .outerjoin(
+            InsurancePolicy,
+            and_(
+                InsurancePolicy.car_id == Car.id,
+                InsurancePolicy.start_date <= max_date,
+                InsurancePolicy.end_date >= min_date,
+            ),
+        )
+        .where(Car.id.in_(car_ids))
+        .order_by(Car.id, InsurancePolicy.start_date)
+    )
+
+    rows_by_car: dict[int, list[tuple[date, date]]] = {}
+    for car_id, start, end in db.execute(stmt):
+        bucket = rows_by_car.setdefault(car_id, [])
+        if start is not None:
+            bucket.append((start, end))
+
+    intervals = {car_id: build_intervals(rows) for car_id, rows in rows_by_car.items()}
+
+    results: list[tuple[bool, bool]] = []
+    for car_id, on_date in pairs:
+        found = car_id in intervals
+        valid = found and covers(*intervals[car_id], on_date)
+        results.append((found, valid))
+
+    log.info(
+        "insurance_validity_batch_checked",
+        pairs=len(pairs),
+        cars=len(car_ids),
+        notFound=len(car_ids - intervals.keys()),
+    )
+    return results
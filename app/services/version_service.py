@@ -0,0 +1,83 @@
+# app/services/version_service.py
+"""
+Version counters behind the ETags: car.version per car (policies, claims) and
+the "cars" row of version_counter for the car list (car and owner rows).
+Bumps run inside the caller's transaction, so they commit with the write.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.errors import CarNotFoundError
+from app.db.models import Car, VersionCounter
+
+CARS_COUNTER = "cars"
+
+
+def _bump_cars_stmt(car_ids: Iterable[int]):
+    return update(Car).where(Car.id.in_(list(car_ids))).values(version=Car.version + 1)
+
+
+def bump_car_versions(db: Session, car_ids: Iterable[int]) -> None:
+    car_ids = set(car_ids)
+    if car_ids:
+        db.execute(_bump_cars_stmt(car_ids), execution_options={"synchronize_session": False})
+
+
+async def bump_car_versions_async(db: AsyncSession, car_ids: Iterable[int]) -> None:
+    car_ids = set(car_ids)
+    if car_ids:
+        await db.execute(_bump_cars_stmt(car_ids), execution_options={"synchronize_session": False})
+
+
+def _car_version_stmt(car_id: int):
+    return select(Car.version).where(Car.id == car_id)
+
+
+def car_version(db: Session, car_id: int) -> int:
+    """Current version of a car (one primary-key lookup); 404 if it does not exist."""
+    version = db.execute(_car_version_stmt(car_id)).scalar()
+    if version is None:
+        raise CarNotFoundError(car_id)
+    return version
+
+
+async def car_version_async(db: AsyncSession, car_id: int) -> int:
+    version = (await db.execute(_car_version_stmt(car_id))).scalar()
+    if version is None:
+        raise CarNotFoundError(car_id)
+    return version
+
+
+def _counter_stmt(name: str):
+    return select(VersionCounter.value).where(VersionCounter.name == name)
+
+
+def cars_version(db: Session) -> int:
+    return db.execute(_counter_stmt(CARS_COUNTER)).scalar() or 0
+
+
+async def cars_version_async(db: AsyncSession) -> int:
+    return (await db.execute(_counter_stmt(CARS_COUNTER))).scalar() or 0
+
+
+def bump_cars_version(db: Session) -> None:
+    """Call from any code path that inserts/updates car or owner rows (before its commit)."""
+    bump = (
+        update(VersionCounter)
+        .where(VersionCounter.name == CARS_COUNTER)
+        .values(value=VersionCounter.value + 1)
+    )
+    if db.execute(bump).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(VersionCounter).values(name=CARS_COUNTER, value=1))
+    except IntegrityError:
+        # created concurrently
+        db.execute(bump)
@@ -0,0 +1,142 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Iterable, Iterator, Literal, Optional, Sequence, Union
+
+BulkFormat = Literal["ndjson", "csv"]
+
+
+class RecordError(ValueError):
+    """A source line that could not be parsed into a record."""
+
+
+_BOM = b"\xef\xbb\xbf"
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Split a byte stream into lines (without line endings or a leading UTF-8 BOM),
+    holding only the current partial line between chunks.
+    """
+    tail = b""
+    first = True
+    for chunk in chunks:
+        parts = chunk.split(b"\n")
+        parts[0] = tail + parts[0]
+        tail = parts.pop()
+        for line in parts:
+            if first:
+                line, first = line.removeprefix(_BOM), False
+            yield line.rstrip(b"\r")
+    if tail:
+        yield (tail.removeprefix(_BOM) if first else tail).rstrip(b"\r")
+
+
+def _decoded(lines: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    # strict: a CSV reader cannot resynchronise after a broken line
+    for line in lines:
+        yield line.decode("utf-8") if isinstance(line, bytes) else line
+
+
+def detect_format(content_type: Optional[str], filename: Optional[str] = None) -> BulkFormat:
+    """CSV when the content type or file extension says so, NDJSON otherwise."""
+    if content_type and "csv" in content_type.lower():
+        return "csv"
+    if filename and filename.lower().endswith(".csv"):
+        return "csv"
+    return "ndjson"
+
+
+def iter_records(
+    lines: Iterable[Union[str, bytes]], fmt: BulkFormat
+) -> Iterator[tuple[int, Union[dict, RecordError]]]:
+    """
+    Yield (row_number, record) for each data row; row numbers are 1-based and count
+    data rows only (the CSV header and blank NDJSON lines are skipped).
+    Unparseable rows are yielded as RecordError instead of aborting the whole input.
+    Empty CSV cells become None. Lines may be bytes (see iter_lines): an NDJSON line
+    that is not UTF-8 is a RecordError, in CSV it raises UnicodeDecodeError.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(_decoded(lines))
+        for row_no, row in enumerate(reader, start=1):
+            if None in row:
+                yield row_no, RecordError("too many columns")
+                continue
+            yield row_no, {k.strip(): (v.strip() or None) if v is not None else None for k, v in row.items()}
+        return
+
+    row_no = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        row_no += 1
+        if isinstance(line, bytes):
+            try:
+                line = line.decode("utf-8")
+            except UnicodeDecodeError:
+                yield row_no, RecordError("not UTF-8 encoded")
+                continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_no, RecordError("invalid JSON")
+            continue
+        if not isinstance(record, dict):
+            yield row_no, RecordError("expected a JSON object")
+            continue
+        yield row_no, record
+
+
+def validation_message(exc: Exception) -> str:
+    """Compact one-line message for a Pydantic ValidationError (or any exception)."""
+    errors = getattr(exc, "errors", None)
+    if callable(errors):
+        parts = []
+        for e in errors():
+            loc = ".".join(str(p) for p in e.get("loc", ()))
+            parts.append(f"{loc}: {e.get('msg', 'invalid input')}" if loc else e.get("msg", "invalid input"))
+        return "; ".join(parts)
+    return str(exc)
+
+
+def raw_car_id(record: dict) -> Optional[int]:
+    """Best-effort carId of a record that failed validation, for error reports."""
+    try:
+        return int(record.get("carId"))
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_export(
+    columns: Sequence[str], rows: Iterable[Sequence], fmt: BulkFormat, rows_per_chunk: int = 1000
+) -> Iterator[str]:
+    """
+    Render rows as CSV (header first) or NDJSON, yielding one string per
+    `rows_per_chunk` rows so streaming responses do not write row by row.
+    Dates are written as ISO strings; None as an empty CSV cell / JSON null.
+    """
+    rows = iter(rows)
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(columns)
+        while True:
+            chunk = list(islice(rows, rows_per_chunk))
+            if chunk:
+                writer.writerows(chunk)
+            if buf.tell():
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+            if len(chunk) < rows_per_chunk:
+                return
+
+    while True:
+        chunk = list(islice(rows, rows_per_chunk))
+        if chunk:
+            yield "".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in chunk)
+        if len(chunk) < rows_per_chunk:
+            return
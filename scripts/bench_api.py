@@ -0,0 +1,243 @@
+"""
+In-process API benchmark: drives the endpoints through httpx + ASGITransport
+(no network, no server) at several concurrency levels and reports latency
+percentiles, throughput and SQL statements per request as JSON.
+
+    python -m scripts.generate_data --cars 100000          # data first
+    python -m scripts.bench_api --concurrency 1,8,32 --requests 500 --output bench.json
+    python -m scripts.bench_api --endpoints history,insurance_valid --compare bench.json
+
+Write endpoints (create_claim, create_policy) insert rows; skip them with --read-only.
+Queries per request come from the /metrics statement counter (METRICS_ENABLED is forced on).
+Run it against the same data set and settings (ASYNC_DB_ENABLED, FAST_JSON_ENABLED,
+VALIDITY_INDEX_ENABLED, ...) to compare runs; the settings are recorded in the output.
+"""
+import os
+
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # keep per-request logs out of the measurements
+os.environ["METRICS_ENABLED"] = "true"
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import platform
+import random
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.models import Car, Claim, InsurancePolicy, Owner
+from app.db.session import SessionLocal, engine
+
+_policy_days = itertools.count()
+
+
+def _random_date(rng: random.Random) -> str:
+    return (date(2015, 1, 1) + timedelta(days=rng.randrange(4000))).isoformat()
+
+
+def _car(rng, ctx) -> int:
+    return rng.randint(ctx["min_car"], ctx["max_car"])
+
+
+def _policy_payload(rng):
+    # one-day policies on distinct far-future days: practically never overlap
+    day = date(2050, 1, 1) + timedelta(days=next(_policy_days) % 18000)
+    return {"provider": "Bench", "startDate": day.isoformat(), "endDate": day.isoformat()}
+
+
+# name -> (write?, request builder returning (method, url, json body))
+ENDPOINTS = {
+    "health": (False, lambda rng, ctx: ("GET", "/health", None)),
+    "cars_list": (False, lambda rng, ctx: ("GET", "/api/cars?limit=100", None)),
+    "cars_page": (False, lambda rng, ctx: ("GET", f"/api/cars?limit=100&after={_car(rng, ctx)}", None)),
+    "history": (False, lambda rng, ctx: ("GET", f"/api/cars/{_car(rng, ctx)}/history", None)),
+    "insurance_valid": (False, lambda rng, ctx: (
+        "GET", f"/api/cars/{_car(rng, ctx)}/insurance-valid?date={_random_date(rng)}", None)),
+    "validity_batch": (False, lambda rng, ctx: (
+        "POST", "/api/cars/insurance-valid/batch",
+        {"items": [{"carId": _car(rng, ctx), "date": _random_date(rng)} for _ in range(100)]})),
+    "coverage": (False, lambda rng, ctx: (
+        "GET", f"/api/cars/{_car(rng, ctx)}/coverage?from=2015-01-01&to=2025-12-31", None)),
+    "coverage_batch": (False, lambda rng, ctx: (
+        "POST", "/api/cars/coverage/batch",
+        {"carIds": [_car(rng, ctx) for _ in range(100)], "from": "2015-01-01", "to": "2025-12-31"})),
+    "summary": (False, lambda rng, ctx: ("GET", f"/api/cars/{_car(rng, ctx)}/summary", None)),
+    "summary_page": (False, lambda rng, ctx: ("GET", f"/api/cars/summary?limit=100&after={_car(rng, ctx)}", None)),
+    "claim_analytics": (False, lambda rng, ctx: (
+        "GET", "/api/analytics/claims?grain=month&from=2024-01-01&to=2024-12-31&groupBy=make,provider", None)),
+    "create_claim": (True, lambda rng, ctx: (
+        "POST", f"/api/cars/{_car(rng, ctx)}/claims",
+        {"claimDate": _random_date(rng), "description": "Bench claim", "amount": 123.45})),
+    "create_policy": (True, lambda rng, ctx: (
+        "POST", f"/api/cars/{_car(rng, ctx)}/policies", _policy_payload(rng))),
+}
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+async def _run_level(client: httpx.AsyncClient, name: str, concurrency: int, total: int, ctx: dict, seed: int) -> dict:
+    build = ENDPOINTS[name][1]
+    rng = random.Random(seed)
+    requests = [build(rng, ctx) for _ in range(total)]
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    errors = 0
+    it = iter(requests)
+
+    async def worker():
+        nonlocal errors
+        for method, url, body in it:
+            t0 = time.perf_counter()
+            try:
+                r = await client.request(method, url, json=body)
+                statuses[r.status_code] += 1
+                if r.status_code >= 500:
+                    errors += 1
+            except Exception:
+                errors += 1
+                statuses["exception"] += 1
+            latencies.append(time.perf_counter() - t0)
+
+    queries_before = metrics.db_queries_total.total()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    queries = metrics.db_queries_total.total() - queries_before
+
+    latencies.sort()
+    ms = lambda v: round(v * 1000, 3)  # noqa: E731
+    return {
+        "endpoint": name,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "statusCounts": {str(k): v for k, v in sorted(statuses.items(), key=lambda kv: str(kv[0]))},
+        "elapsedSeconds": round(elapsed, 3),
+        "throughputRps": round(total / elapsed, 1) if elapsed else 0.0,
+        "latencyMs": {
+            "p50": ms(_percentile(latencies, 50)),
+            "p95": ms(_percentile(latencies, 95)),
+            "p99": ms(_percentile(latencies, 99)),
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+            "max": ms(latencies[-1]) if latencies else 0.0,
+        },
+        "queriesPerRequest": round(queries / total, 2) if total else 0.0,
+    }
+
+
+def _dataset() -> dict:
+    with SessionLocal() as db:
+        lo, hi = db.execute(select(func.min(Car.id), func.max(Car.id))).one()
+        counts = {
+            "owners": db.execute(select(func.count()).select_from(Owner)).scalar(),
+            "cars": db.execute(select(func.count()).select_from(Car)).scalar(),
+            "policies": db.execute(select(func.count()).select_from(InsurancePolicy)).scalar(),
+            "claims": db.execute(select(func.count()).select_from(Claim)).scalar(),
+        }
+    if lo is None:
+        sys.exit("no cars in the database; run python -m scripts.generate_data first")
+    return {"min_car": lo, "max_car": hi, "counts": counts}
+
+
+async def run(endpoints: list[str], levels: list[int], total: int, warmup: int, seed: int) -> dict:
+    from app.main import app
+
+    ctx = _dataset()
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in endpoints:
+            if warmup:
+                await _run_level(client, name, 1, warmup, ctx, seed - 1)
+            for level in levels:
+                res = await _run_level(client, name, level, total, ctx, seed)
+                results.append(res)
+                print(
+                    f"{name:<16} c={level:<4} p50={res['latencyMs']['p50']:>8}ms p95={res['latencyMs']['p95']:>8}ms "
+                    f"p99={res['latencyMs']['p99']:>8}ms {res['throughputRps']:>8} req/s "
+                    f"q/req={res['queriesPerRequest']} errors={res['errors']}",
+                    file=sys.stderr,
+                )
+    return {
+        "meta": {
+            "startedAt": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "database": f"{engine.dialect.name}+{engine.dialect.driver}",
+            "dataset": ctx["counts"],
+            "settings": {
+                "ASYNC_DB_ENABLED": settings.ASYNC_DB_ENABLED,
+                "FAST_JSON_ENABLED": settings.FAST_JSON_ENABLED,
+                "VALIDITY_INDEX_ENABLED": settings.VALIDITY_INDEX_ENABLED,
+                "CAR_REGISTRY_ENABLED": settings.CAR_REGISTRY_ENABLED,
+                "DB_POOL_SIZE": settings.DB_POOL_SIZE,
+            },
+            "requestsPerLevel": total,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def _compare(current: dict, baseline_path: str) -> None:
+    """Print p95 and throughput deltas against a previous run."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["endpoint"], r["concurrency"]): r for r in json.load(f)["results"]}
+    print(f"{'endpoint':<16} {'c':>4} {'p95 ms':>18} {'req/s':>20}", file=sys.stderr)
+    for r in current["results"]:
+        old = baseline.get((r["endpoint"], r["concurrency"]))
+        if old is None:
+            continue
+        p95_old, p95_new = old["latencyMs"]["p95"], r["latencyMs"]["p95"]
+        rps_old, rps_new = old["throughputRps"], r["throughputRps"]
+        pct = lambda a, b: f"{(b - a) / a * 100:+.1f}%" if a else "n/a"  # noqa: E731
+        print(
+            f"{r['endpoint']:<16} {r['concurrency']:>4} {p95_old:>7}->{p95_new:<7} {pct(p95_old, p95_new):>7} "
+            f"{rps_old:>7}->{rps_new:<7} {pct(rps_old, rps_new):>7}",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-process API benchmark")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help=f"comma list of: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma list of concurrency levels")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint and level")
+    parser.add_argument("--warmup", type=int, default=20, help="sequential warm-up requests per endpoint")
+    parser.add_argument("--read-only", action="store_true", help="skip create_claim / create_policy")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", help="previous JSON report to diff against")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.endpoints.split(",") if n.strip()]
+    unknown = [n for n in names if n not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+    if args.read_only:
+        names = [n for n in names if not ENDPOINTS[n][0]]
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    report = asyncio.run(run(names, levels, args.requests, args.warmup, args.seed))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        _compare(report, args.compare)
@@ -0,0 +1,86 @@
+"""
+Compare the default response path (response_model validation + FastAPI
+serialization + JSONResponse) with the FAST_JSON_ENABLED path (rows -> dicts ->
+JSON bytes) for car lists and car history.
+
+    python -m scripts.bench_serialization --items 1000 --repeat 50
+
+No database needed: rows are built in memory as transient ORM objects.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api import fastjson
+from app.api.fastjson import car_dict, encode_list, history_item_dict
+from app.api.schemas import CarOut, HistoryItem, HistoryClaimItem, HistoryPolicyItem
+from app.db.models import Car, Owner
+
+
+def _cars(n: int) -> list:
+    owner = Owner(id=1, name="Alice", email="a@example.com")
+    return [
+        Car(id=i, vin=f"WVWZZZ1JZXW{i:06d}", make="VW", model="Golf", year_of_manufacture=2018, owner=owner)
+        for i in range(1, n + 1)
+    ]
+
+
+def _history(n: int) -> list:
+    items = []
+    for i in range(n):
+        d = date(2000, 1, 1) + timedelta(days=i)
+        if i % 3 == 0:
+            items.append(HistoryPolicyItem.model_construct(policy_id=i, start_date=d, end_date=d + timedelta(days=2), provider="AXA"))
+        else:
+            items.append(HistoryClaimItem.model_construct(claim_id=i, claim_date=d, amount=Decimal("450.00"), description="Rear bumper"))
+    return items
+
+
+def _default_path(field, content) -> bytes:
+    # what FastAPI does for `return content` with response_model=...
+    serialized = asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=True))
+    return JSONResponse(serialized).body
+
+
+def _time(fn, repeat: int) -> float:
+    fn()  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    cases = {
+        "cars": (create_model_field(name="cars", type_=List[CarOut], mode="serialization"), _cars(args.items), car_dict),
+        "history": (create_model_field(name="history", type_=List[HistoryItem], mode="serialization"), _history(args.items), history_item_dict),
+    }
+
+    results = {"items": args.items, "repeat": args.repeat, "encoder": "orjson" if fastjson.orjson else "pydantic-core"}
+    for name, (field, content, builder) in cases.items():
+        default_body = _default_path(field, content)
+        fast_body = encode_list(builder, content)
+        assert json.loads(default_body) == json.loads(fast_body), f"{name}: fast path output differs"
+
+        default_ms = _time(lambda: _default_path(field, content), args.repeat)
+        fast_ms = _time(lambda: encode_list(builder, content), args.repeat)
+        results[name] = {
+            "defaultMs": round(default_ms, 3),
+            "fastMs": round(fast_ms, 3),
+            "speedup": round(default_ms / fast_ms, 2) if fast_ms else None,
+        }
+
+    print(json.dumps(results, indent=2))
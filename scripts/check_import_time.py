@@ -0,0 +1,103 @@
+"""
+Startup-time guard: imports app.main and builds the app with create_app() in
+fresh interpreters (python -X importtime), then checks the median against a
+budget and that disabled subsystems were not imported.
+
+    python -m scripts.check_import_time
+    python -m scripts.check_import_time --budget-ms 900 --runs 7 --top 15
+    SCHEDULER_ENABLED=true python -m scripts.check_import_time --allow apscheduler
+
+Forbidden by default: APScheduler (scheduler off), the async stack (async off)
+and the database drivers (the engine is created in the lifespan, not at
+import). Exits 1 when over budget or when a forbidden module was loaded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from app.main import create_app
+create_app()
+print(json.dumps({"ms": (time.perf_counter() - t0) * 1000, "modules": sorted(sys.modules)}))
+"""
+
+# module prefix -> why it must not be loaded while building the app
+FORBIDDEN = {
+    "apscheduler": "scheduler is imported only when SCHEDULER_ENABLED",
+    "app.core.scheduling": "scheduler is imported only when SCHEDULER_ENABLED",
+    "app.api.routers.async_api": "async routers only when ASYNC_DB_ENABLED",
+    "aiosqlite": "async driver only when ASYNC_DB_ENABLED",
+    "asyncpg": "async driver only when ASYNC_DB_ENABLED",
+    "sqlite3": "driver is loaded when the engine is created (lifespan)",
+    "psycopg": "driver is loaded when the engine is created (lifespan)",
+    "psycopg2": "driver is loaded when the engine is created (lifespan)",
+}
+
+
+def _run_once() -> tuple[float, list[str], list[tuple[int, int, str]]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True, text=True, env=os.environ.copy(), check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return result["ms"], result["modules"], rows
+
+
+def _forbidden_loaded(modules: list[str], allow: set[str]) -> dict[str, str]:
+    found = {}
+    for prefix, reason in FORBIDDEN.items():
+        if prefix in allow:
+            continue
+        if any(m == prefix or m.startswith(prefix + ".") for m in modules):
+            found[prefix] = reason
+    return found
+
+
+def main(budget_ms: float, runs: int, top: int, allow: set[str]) -> int:
+    timings = []
+    modules: list[str] = []
+    rows: list[tuple[int, int, str]] = []
+    for _ in range(runs):
+        ms, modules, rows = _run_once()
+        timings.append(ms)
+    median = statistics.median(timings)
+
+    print(f"create_app() from a cold interpreter: median={median:.0f}ms "
+          f"min={min(timings):.0f}ms max={max(timings):.0f}ms runs={runs} budget={budget_ms:.0f}ms")
+    print(f"modules loaded: {len(modules)}")
+    print(f"top {top} imports by cumulative time (last run):")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f}ms  (self {self_us / 1000:6.1f}ms)  {name}")
+
+    ok = True
+    for prefix, reason in _forbidden_loaded(modules, allow).items():
+        print(f"FORBIDDEN import: {prefix} ({reason})")
+        ok = False
+    if median > budget_ms:
+        print(f"OVER BUDGET by {median - budget_ms:.0f}ms")
+        ok = False
+    print("result=" + ("OK" if ok else "FAILED"))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time budget check for app startup")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="max median create_app() time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--allow", default="", help="comma list of FORBIDDEN prefixes to allow")
+    args = parser.parse_args()
+    allowed = {a.strip() for a in args.allow.split(",") if a.strip()}
+    sys.exit(main(args.budget_ms, args.runs, args.top, allowed))
@@ -0,0 +1,284 @@
+"""
+Query-count and query-plan regression check.
+
+Seeds a scratch database (alembic + scripts.generate_data), calls every endpoint
+in-process and records the SQL it runs through engine events:
+
+- each endpoint has a statement budget (steady state: one warm-up call first,
+  so one-off cache loads are not counted); going over fails, which catches N+1
+  regressions such as a dropped selectinload;
+- every statement that reads rows is EXPLAINed (EXPLAIN QUERY PLAN on SQLite,
+  EXPLAIN (FORMAT JSON) on PostgreSQL); a full scan of a table the case does not
+  allow to be scanned fails, e.g. the overlap check or the validity lookup no
+  longer using ix_policy_car_dates. The scheduler jobs are checked the same way.
+
+    python -m scripts.check_queries
+    python -m scripts.check_queries --cars 20000 --explain
+    python -m scripts.check_queries --database-url postgresql+psycopg://u:p@localhost/scratch --json plans.json
+
+--database-url must point at an empty scratch database: it is migrated and
+seeded. Plans depend on table sizes (a small --cars makes planners prefer
+scans), so keep the seed realistic. Exits 1 on any failure. The same cases and
+jobs run under pytest (tests/test_query_budgets.py) on a scratch SQLite file.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class Case:
+    name: str
+    method: str
+    path: str
+    max_queries: int
+    # JSON body from the call number (writes need a fresh body per call)
+    body: Optional[Callable[[int], dict]] = None
+    status: int = 200
+    # tables this case may read with a full scan (fleet-wide reads)
+    allow_scan: frozenset = frozenset()
+
+
+def _policy_body(n: int) -> dict:
+    # far-future, one year per call: never overlaps seeded or earlier rows
+    return {"provider": "AXA", "startDate": f"{2090 + n}-01-01", "endDate": f"{2090 + n}-12-31"}
+
+
+def _claim_body(n: int) -> dict:
+    return {"claimDate": "2024-03-01", "description": "Side mirror", "amount": "120.50"}
+
+
+def _validity_batch(n: int) -> dict:
+    return {"items": [{"carId": car_id, "date": "2016-06-01"} for car_id in range(1, 201)]}
+
+
+def _coverage_batch(n: int) -> dict:
+    return {"carIds": list(range(1, 201)), "from": "2016-01-01", "to": "2018-12-31"}
+
+
+CASES = [
+    Case("cars_first_page", "GET", "/api/cars?limit=50", 3, allow_scan=frozenset({"car"})),
+    # same budget at 4x the page size: statements must not grow with the page
+    Case("cars_page_200", "GET", "/api/cars?after=10&limit=200", 3),
+    Case("car_history", "GET", "/api/cars/1/history", 3),
+    Case("car_history_range", "GET", "/api/cars/1/history?from=2016-01-01&to=2018-12-31&limit=5", 3),
+    Case("insurance_valid", "GET", "/api/cars/1/insurance-valid?date=2016-06-01", 1),
+    Case("validity_batch", "POST", "/api/cars/insurance-valid/batch", 1, body=_validity_batch),
+    Case("car_coverage", "GET", "/api/cars/1/coverage?from=2016-01-01&to=2018-12-31", 2),
+    Case("coverage_batch", "POST", "/api/cars/coverage/batch", 1, body=_coverage_batch),
+    Case("car_summary", "GET", "/api/cars/1/summary", 2),
+    Case("car_summaries", "GET", "/api/cars/summary?after=10&limit=200", 1),
+    Case("claim_analytics", "GET", "/api/analytics/claims?grain=month&groupBy=make",
+         2, allow_scan=frozenset({"claim_rollup"})),
+    Case("uninsured_report", "GET", "/api/reports/uninsured-cars?date=2016-06-01&format=ndjson",
+         1, allow_scan=frozenset({"car"})),
+    Case("create_policy", "POST", "/api/cars/1/policies", 7, body=_policy_body, status=201),
+    Case("create_claim", "POST", "/api/cars/2/claims", 6, body=_claim_body, status=201),
+]
+
+# scheduler jobs: plans only (their statement count scales with the backlog)
+JOBS = {
+    "expiry_job": ("app.core.scheduling", "detect_and_log_expired_policies", frozenset()),
+    "rollup_job": ("app.services.rollup_service", "refresh_claim_rollups", frozenset()),
+}
+
+# statements whose plan can change with the data: reads and searched writes
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE|INSERT\b.*\bSELECT\b)", re.IGNORECASE | re.DOTALL)
+# EXPLAIN QUERY PLAN detail: "SCAN car", "SEARCH insurance_policy USING INDEX ix_... (car_id=?)"
+_SQLITE_STEP = re.compile(r"^(SCAN|SEARCH) (\w+)(?: AS \w+)?(?: USING (.*))?$")
+
+
+@dataclass
+class Statement:
+    sql: str
+    params: object
+    plan: list[str] = field(default_factory=list)
+    scans: set = field(default_factory=set)
+
+
+class Recorder:
+    """before_cursor_execute listener collecting statements while active."""
+
+    def __init__(self):
+        self.active = False
+        self.statements: list[Statement] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            if executemany and parameters:
+                parameters = parameters[0]
+            self.statements.append(Statement(statement, parameters))
+
+    def start(self) -> None:
+        self.statements = []
+        self.active = True
+
+    def stop(self) -> list[Statement]:
+        self.active = False
+        return self.statements
+
+
+def _explain(engine, stmt: Statement, tables: set[str]) -> None:
+    """Fill stmt.plan (readable steps) and stmt.scans (tables read by a full scan)."""
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            raw = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + stmt.sql, stmt.params).scalar()
+            plan = raw if isinstance(raw, list) else json.loads(raw)
+            _walk_pg(plan[0]["Plan"], stmt, 0)
+        else:
+            for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + stmt.sql, stmt.params):
+                detail = row[-1]
+                stmt.plan.append(detail)
+                m = _SQLITE_STEP.match(detail)
+                if m and m.group(1) == "SCAN" and m.group(2) in tables:
+                    stmt.scans.add(m.group(2))
+        conn.rollback()
+
+
+def _walk_pg(node: dict, stmt: Statement, depth: int) -> None:
+    relation = node.get("Relation Name")
+    index = node.get("Index Name")
+    stmt.plan.append("  " * depth + node["Node Type"]
+                     + (f" on {relation}" if relation else "") + (f" using {index}" if index else ""))
+    if node["Node Type"] == "Seq Scan" and relation:
+        stmt.scans.add(relation)
+    for child in node.get("Plans", []):
+        _walk_pg(child, stmt, depth + 1)
+
+
+def seed(cars: int) -> None:
+    """Migrate the (empty) configured database and load `cars` generated cars."""
+    from alembic import command
+    from alembic.config import Config
+
+    from app.db.session import SessionLocal
+    from app.services.rollup_service import rebuild
+    from app.services.summary_service import rebuild_car_summary
+    from scripts.generate_data import generate
+
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    command.upgrade(config, "head")
+    with SessionLocal() as db:
+        generate(db, max(1, cars // 2), cars, 3, 2, 10_000, seed=42)
+        rebuild_car_summary(db)
+        rebuild(db)
+
+
+def _check(statements: list[Statement], engine, tables: set[str], allow_scan: frozenset) -> list[str]:
+    """EXPLAIN the statements; one problem per statement with a disallowed full scan."""
+    problems = []
+    for stmt in statements:
+        if not _EXPLAINABLE.match(stmt.sql):
+            continue
+        _explain(engine, stmt, tables)
+        bad = stmt.scans - allow_scan
+        if bad:
+            problems.append(f"full scan of {', '.join(sorted(bad))}: {' '.join(stmt.sql.split())[:160]}")
+    return problems
+
+
+def run_case(client, recorder: Recorder, engine, tables: set[str], case: Case) -> tuple[list[Statement], list[str]]:
+    """Warm-up call, then the counted call: its statements and problems (status, budget, plans)."""
+    for n in range(2):
+        if n == 1:
+            recorder.start()
+        response = client.request(case.method, case.path, json=case.body(n) if case.body else None)
+    statements = recorder.stop()
+    problems = []
+    if response.status_code != case.status:
+        problems.append(f"status {response.status_code}, expected {case.status}: {response.text[:200]}")
+    if len(statements) > case.max_queries:
+        problems.append(f"{len(statements)} statements, budget {case.max_queries}")
+    problems += _check(statements, engine, tables, case.allow_scan)
+    return statements, problems
+
+
+def run_job(recorder: Recorder, engine, tables: set[str], name: str) -> tuple[list[Statement], list[str]]:
+    """Run the scheduler job JOBS[name] once: its statements and plan problems."""
+    module, func, allow_scan = JOBS[name]
+    job = getattr(__import__(module, fromlist=[func]), func)
+    recorder.start()
+    job()
+    statements = recorder.stop()
+    return statements, _check(statements, engine, tables, allow_scan)
+
+
+def _print(label: str, statements: list[Statement], problems: list[str], explain: bool) -> None:
+    print(f"{'FAIL' if problems else 'ok  '} {label}")
+    if explain or problems:
+        for stmt in statements:
+            print(f"    {' '.join(stmt.sql.split())[:200]}")
+            for step in stmt.plan:
+                print(f"        {step}")
+    for problem in problems:
+        print(f"  ! {problem}")
+
+
+def main(args) -> int:
+    # app modules are imported here, after the environment points them at the scratch database
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.db.base import Base
+    from app.db.session import get_engine
+    from app.main import create_app
+
+    seed(args.cars)
+    engine = get_engine()
+    tables = set(Base.metadata.tables)
+    recorder = Recorder()
+    event.listen(engine, "before_cursor_execute", recorder)
+    client = TestClient(create_app(), raise_server_exceptions=False)
+    report = {}
+
+    for case in CASES:
+        statements, problems = run_case(client, recorder, engine, tables, case)
+        _print(f"{case.name:<20} queries={len(statements)} (budget {case.max_queries})",
+               statements, problems, args.explain)
+        report[case.name] = {"queries": len(statements), "budget": case.max_queries, "problems": problems,
+                             "statements": [{"sql": s.sql, "plan": s.plan} for s in statements]}
+
+    for name in JOBS:
+        statements, problems = run_job(recorder, engine, tables, name)
+        _print(f"{name:<20} queries={len(statements)} (plans only)", statements, problems, args.explain)
+        report[name] = {"queries": len(statements), "problems": problems,
+                        "statements": [{"sql": s.sql, "plan": s.plan} for s in statements]}
+
+    failed = sum(1 for r in report.values() if r["problems"])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+    print("result=" + ("OK" if not failed else f"FAILED ({failed})"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query-count and query-plan regression check")
+    parser.add_argument("--database-url", help="empty scratch database (default: temporary SQLite file)")
+    parser.add_argument("--cars", type=int, default=5_000, help="seeded cars (policies x3, claims x2)")
+    parser.add_argument("--explain", action="store_true", help="print every statement and plan")
+    parser.add_argument("--json", help="write statements and plans per case to this file")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{Path(tempfile.mkdtemp()) / 'check_queries.db'}"
+    # one engine for every statement (no replicas, no shards); the jobs run synchronously here
+    os.environ.update({
+        "DATABASE_URL": url,
+        "READ_DATABASE_URLS": "[]",
+        "SHARD_DATABASE_URLS": "[]",
+        "ASYNC_DB_ENABLED": "false",
+        "SCHEDULER_ENABLED": "false",
+        "SCHEDULER_TEST_MODE": "true",
+        "ROLLUP_SAFETY_LAG_SECONDS": "0",
+        "LOG_LEVEL": "WARNING",
+    })
+    sys.exit(main(args))
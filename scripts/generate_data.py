@@ -0,0 +1,190 @@
+"""
+Bulk-load synthetic owners, cars, policies and claims for load testing.
+
+    python -m scripts.generate_data --cars 100000
+    python -m scripts.generate_data --owners 200000 --cars 1000000 --policies-per-car 3 --claims-per-car 2
+
+Policies of a car are generated back to back with random gaps, so they never
+overlap (inclusive dates). Ids are assigned up front (continuing after the
+current max id), which lets every table be loaded with COPY FROM STDIN on
+PostgreSQL (psycopg) or executemany elsewhere, one transaction per chunk.
+Same --seed, same data.
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.db.models import Car, Claim, InsurancePolicy, Owner
+from app.db.session import SessionLocal
+from app.services.version_service import bump_cars_version
+
+MAKES = {
+    "VW": ["Golf", "Passat", "Polo", "Tiguan"],
+    "Audi": ["A3", "A4", "A6", "Q5"],
+    "BMW": ["320d", "X1", "X3", "118i"],
+    "Dacia": ["Logan", "Duster", "Sandero"],
+    "Toyota": ["Corolla", "Yaris", "RAV4"],
+}
+PROVIDERS = ["AXA", "Allianz", "Generali", "Groupama", "Omniasig", "Uniqa"]
+DESCRIPTIONS = ["Rear bumper", "Side mirror", "Windshield", "Door scratch", "Headlight", "Hail damage"]
+FIRST_POLICY_START = date(2015, 1, 1)
+
+
+def _use_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg"
+
+
+def _write(db: Session, model, rows: list[dict]) -> None:
+    """One chunk: COPY FROM STDIN on psycopg, executemany otherwise; commits."""
+    if not rows:
+        return
+    if _use_copy(db):
+        columns = list(rows[0])
+        raw = db.connection().connection.driver_connection
+        sql = f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN"
+        with raw.cursor() as cur, cur.copy(sql) as copy:
+            for r in rows:
+                copy.write_row(tuple(r[c] for c in columns))
+    else:
+        db.execute(insert(model), rows)
+    db.commit()
+
+
+class _ChunkWriter:
+    def __init__(self, db: Session, model, chunk_size: int):
+        self.db, self.model, self.chunk_size = db, model, chunk_size
+        self.rows: list[dict] = []
+        self.written = 0
+
+    def add(self, row: dict) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        _write(self.db, self.model, self.rows)
+        self.written += len(self.rows)
+        self.rows = []
+
+
+def _next_id(db: Session, model) -> int:
+    return (db.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _fix_sequences(db: Session) -> None:
+    """Explicit ids bypass PostgreSQL sequences; move them past the loaded rows."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in ("owner", "car", "insurance_policy", "claim"):
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+    db.commit()
+
+
+def _analyze(db: Session) -> None:
+    db.execute(text("ANALYZE"))
+    db.commit()
+
+
+def generate(db: Session, owners: int, cars: int, policies_per_car: int, claims_per_car: int,
+             chunk_size: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    counts = {}
+
+    owner_base = _next_id(db, Owner)
+    w = _ChunkWriter(db, Owner, chunk_size)
+    for i in range(owners):
+        oid = owner_base + i
+        w.add({"id": oid, "name": f"Owner {oid}", "email": f"owner{oid}@example.com"})
+    w.flush()
+    counts["owners"] = w.written
+
+    car_base = _next_id(db, Car)
+    makes = list(MAKES)
+    w = _ChunkWriter(db, Car, chunk_size)
+    for i in range(cars):
+        cid = car_base + i
+        make = rng.choice(makes)
+        w.add({
+            "id": cid,
+            "vin": f"SYN{cid:014d}",
+            "make": make,
+            "model": rng.choice(MAKES[make]),
+            "year_of_manufacture": rng.randint(2000, 2025),
+            "owner_id": owner_base + rng.randrange(owners),
+        })
+    w.flush()
+    counts["cars"] = w.written
+    bump_cars_version(db)  # invalidates /api/cars ETags
+    db.commit()
+
+    policy_id = _next_id(db, InsurancePolicy)
+    w = _ChunkWriter(db, InsurancePolicy, chunk_size)
+    for i in range(cars):
+        start = FIRST_POLICY_START + timedelta(days=rng.randrange(365))
+        for _ in range(policies_per_car):
+            end = start + timedelta(days=rng.randint(180, 400))
+            w.add({
+                "id": policy_id,
+                "car_id": car_base + i,
+                "provider": rng.choice(PROVIDERS),
+                "start_date": start,
+                "end_date": end,
+                "logged_expiry_at": None,
+            })
+            policy_id += 1
+            # next policy starts after this one ends (inclusive bounds never touch)
+            start = end + timedelta(days=1 + rng.randrange(60))
+    w.flush()
+    counts["policies"] = w.written
+
+    claim_id = _next_id(db, Claim)
+    span = (date(2026, 1, 1) - FIRST_POLICY_START).days
+    w = _ChunkWriter(db, Claim, chunk_size)
+    for i in range(cars):
+        for _ in range(claims_per_car):
+            w.add({
+                "id": claim_id,
+                "car_id": car_base + i,
+                "claim_date": FIRST_POLICY_START + timedelta(days=rng.randrange(span)),
+                "description": rng.choice(DESCRIPTIONS),
+                "amount": Decimal(rng.randint(5000, 500000)) / 100,
+                "created_at": now,
+            })
+            claim_id += 1
+    w.flush()
+    counts["claims"] = w.written
+
+    _fix_sequences(db)
+    _analyze(db)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic load-test data")
+    parser.add_argument("--cars", type=int, default=10_000)
+    parser.add_argument("--owners", type=int, default=None, help="default: cars / 2")
+    parser.add_argument("--policies-per-car", type=int, default=3)
+    parser.add_argument("--claims-per-car", type=int, default=2)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    owners = args.owners or max(1, args.cars // 2)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        counts = generate(db, owners, args.cars, args.policies_per_car, args.claims_per_car,
+                          args.chunk_size, args.seed)
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(" ".join(f"{k}={v}" for k, v in counts.items())
+          + f" elapsed={elapsed:.1f}s throughput={total / elapsed:.0f} rows/s")
@@ -0,0 +1,46 @@
+"""
+Bulk-import policies from an NDJSON or CSV file.
+
+    python -m scripts.import_policies policies.ndjson
+    python -m scripts.import_policies policies.csv --batch-size 5000 --errors errors.ndjson
+
+Columns / keys: carId, provider, startDate, endDate.
+"""
+import argparse
+import sys
+
+from app.api.schemas import ImportReport
+from app.core.config import settings
+from app.db.shards import run_partitioned
+from app.services.policy_import_service import import_policies
+from app.utils.bulk_io import detect_format, iter_records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import insurance policies")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    parser.add_argument("--group-size", type=int, default=settings.IMPORT_LOCK_GROUP_SIZE,
+                        help="cars locked and committed per transaction")
+    parser.add_argument("--errors", help="write per-row errors as NDJSON to this file")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(None, args.path)
+    with open(args.path, encoding="utf-8-sig", newline="") as f:
+        report = ImportReport.merge(run_partitioned(iter_records(f, fmt), lambda db, records: import_policies(
+            db, records, batch_size=args.batch_size, group_size=args.group_size,
+        )))
+
+    if args.errors:
+        with open(args.errors, "w", encoding="utf-8") as out:
+            for e in report.errors:
+                out.write(e.model_dump_json(by_alias=True) + "\n")
+
+    print(f"rows={report.total} inserted={report.inserted} failed={report.failed}")
+    if not args.errors:
+        for e in report.errors[:20]:
+            print(f"  row {e.row} (car {e.car_id}): {e.detail}")
+        if report.failed > 20:
+            print(f"  ... {report.failed - 20} more (use --errors FILE)")
+    sys.exit(1 if report.failed else 0)
@@ -0,0 +1,46 @@
+"""
+Bulk-ingest claims from an NDJSON or CSV file and report throughput.
+
+    python -m scripts.ingest_claims claims.ndjson
+    python -m scripts.ingest_claims claims.csv --chunk-size 10000 --errors errors.ndjson
+
+Columns / keys: carId, claimDate, description, amount.
+Uses COPY FROM STDIN on PostgreSQL (psycopg), executemany elsewhere.
+"""
+import argparse
+import sys
+
+from app.api.schemas import ClaimIngestReport
+from app.core.config import settings
+from app.db.shards import run_partitioned
+from app.services.claim_ingest_service import ingest_claims
+from app.utils.bulk_io import detect_format, iter_records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-ingest claims")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=settings.CLAIM_INGEST_CHUNK_SIZE)
+    parser.add_argument("--errors", help="write per-row errors as NDJSON to this file")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(None, args.path)
+    with open(args.path, encoding="utf-8-sig", newline="") as f:
+        report = ClaimIngestReport.merge(run_partitioned(iter_records(f, fmt), lambda db, records: ingest_claims(db, records, chunk_size=args.chunk_size), chunk_size=args.chunk_size))
+
+    if args.errors:
+        with open(args.errors, "w", encoding="utf-8") as out:
+            for e in report.errors:
+                out.write(e.model_dump_json(by_alias=True) + "\n")
+
+    print(
+        f"rows={report.total} inserted={report.inserted} failed={report.failed} "
+        f"elapsed={report.elapsed_seconds}s throughput={report.rows_per_second} rows/s"
+    )
+    if not args.errors:
+        for e in report.errors[:20]:
+            print(f"  row {e.row} (car {e.car_id}): {e.detail}")
+        if report.failed > 20:
+            print(f"  ... {report.failed - 20} more (use --errors FILE)")
+    sys.exit(1 if report.failed else 0)
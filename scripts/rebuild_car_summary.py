@@ -0,0 +1,28 @@
+"""
+Recompute car_summary from the claim and insurance_policy tables.
+
+    python -m scripts.rebuild_car_summary
+    python -m scripts.rebuild_car_summary --chunk-size 100000
+
+Needed after loading data outside the API (e.g. scripts.generate_data) or to
+repair drift. Runs one delete + INSERT ... SELECT per car-id range, on every shard
+when SHARD_DATABASE_URLS is set.
+"""
+import argparse
+import time
+
+from app.db.shards import shard_session, shard_set
+from app.services.summary_service import rebuild_car_summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild car_summary")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="car ids per transaction")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows = 0
+    for index in range(shard_set.count):
+        with shard_session(index) as db:
+            rows += rebuild_car_summary(db, chunk_size=args.chunk_size)
+    print(f"car_summary rows={rows} elapsed={time.perf_counter() - started:.1f}s")
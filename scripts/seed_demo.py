@@ -2,6 +2,7 @@ from app.db.session import SessionLocal
 from app.db.models import Owner, Car
 from datetime import date
 from app.db.models import InsurancePolicy, Claim
+from app.services.version_service import bump_cars_version
 
 if __name__ == "__main__":
     db = SessionLocal()
@@ -13,6 +14,7 @@ if __name__ == "__main__":
         c1 = Car(vin="WVWZZZ1JZXW000001", make="VW", model="Golf", year_of_manufacture=2018, owner=alice)
         c2 = Car(vin="WAUZZZ8V0HA000002", make="Audi", model="A3", year_of_manufacture=2017, owner=alice)
         db.add_all([c1, c2])
+        bump_cars_version(db)
         db.commit()
         print("Seeded demo data.")
     finally:
@@ -0,0 +1,118 @@
+"""
+Copy a single database into the shards of SHARD_DATABASE_URLS.
+
+    alembic upgrade head                          # primary + every shard
+    python -m scripts.split_shards                # source: DATABASE_URL
+    python -m scripts.split_shards --source sqlite:///./old.db --chunk-size 20000
+
+Each car goes to shard_for(car.id) with its policies and claims; owners are
+copied to every shard holding one of their cars. Ids are kept, so car and owner
+ids stay unique across shards (on PostgreSQL the id sequences are moved past the
+copied ids). Afterwards car_summary and claim_rollup are rebuilt and the "cars"
+version counter bumped on every shard. Target shards should start empty; to
+reshard after changing SHARD_DATABASE_URLS, run it once per old database
+(--source) into fresh shard databases.
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Car, Claim, InsurancePolicy, Owner
+from app.db.session import engine_options
+from app.db.shards import shard_session, shard_set
+from app.db.upsert import dialect_insert
+from app.services.rollup_service import rebuild
+from app.services.summary_service import rebuild_car_summary
+from app.services.version_service import bump_cars_version
+
+# tables copied per car range, after car; rows follow their car_id
+_CAR_TABLES = (InsurancePolicy, Claim)
+# tables with integer ids whose PostgreSQL sequences must follow the copied ids
+_SEQUENCED = (Owner, Car, InsurancePolicy, Claim)
+
+
+def _rows(source: Session, stmt) -> list[dict]:
+    return [dict(r) for r in source.execute(stmt).mappings()]
+
+
+def _copy_chunk(source: Session, targets: dict[int, Session], cars: list[dict], counts: dict) -> None:
+    lo, hi = cars[0]["id"], cars[-1]["id"]
+    by_shard: dict[int, dict[str, list[dict]]] = {}
+
+    def bucket(car_id: int, table: str) -> list[dict]:
+        return by_shard.setdefault(shard_set.shard_for(car_id), {}).setdefault(table, [])
+
+    for car in cars:
+        bucket(car["id"], "car").append(car)
+    for model in _CAR_TABLES:
+        table = model.__table__
+        for row in _rows(source, select(table).where(table.c.car_id.between(lo, hi))):
+            bucket(row["car_id"], table.name).append(row)
+
+    owner_ids = {car["owner_id"] for car in cars}
+    owners = {o["id"]: o for o in _rows(source, select(Owner.__table__).where(Owner.id.in_(owner_ids)))}
+
+    for index, tables in by_shard.items():
+        db = targets[index]
+        shard_owners = [owners[i] for i in sorted({car["owner_id"] for car in tables["car"]})]
+        # an owner with cars on several shards (or seen in an earlier chunk) is copied once per shard
+        db.execute(dialect_insert(db)(Owner).on_conflict_do_nothing(index_elements=["id"]), shard_owners)
+        db.execute(insert(Car), tables["car"])
+        for model in _CAR_TABLES:
+            rows = tables.get(model.__tablename__)
+            if rows:
+                db.execute(insert(model), rows)
+                counts[model.__tablename__] += len(rows)
+        db.commit()
+        counts["car"] += len(tables["car"])
+
+
+def _finish_shard(db: Session) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        for model in _SEQUENCED:
+            table = model.__tablename__
+            db.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+            ))
+    bump_cars_version(db)
+    db.commit()
+    rebuild_car_summary(db)
+    rebuild(db)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split one database into the configured shards")
+    parser.add_argument("--source", default=settings.DATABASE_URL, help="database to copy from")
+    parser.add_argument("--chunk-size", type=int, default=5_000, help="cars per read")
+    args = parser.parse_args()
+    if not shard_set.sharded:
+        raise SystemExit("SHARD_DATABASE_URLS is empty")
+    if args.source in shard_set.urls:
+        raise SystemExit("--source must not be one of the shards")
+
+    started = time.perf_counter()
+    counts = {"car": 0, **{m.__tablename__: 0 for m in _CAR_TABLES}}
+    source_engine = create_engine(args.source, **engine_options(args.source))
+    targets = {i: shard_session(i) for i in range(shard_set.count)}
+    try:
+        with Session(source_engine) as source:
+            after = 0
+            while True:
+                cars = _rows(source, select(Car.__table__).where(Car.id > after).order_by(Car.id).limit(args.chunk_size))
+                if not cars:
+                    break
+                _copy_chunk(source, targets, cars, counts)
+                after = cars[-1]["id"]
+        for index, db in targets.items():
+            _finish_shard(db)
+            n = db.execute(select(func.count()).select_from(Car)).scalar()
+            print(f"{shard_set.name(index)}: cars={n}")
+    finally:
+        for db in targets.values():
+            db.close()
+        source_engine.dispose()
+    print(" ".join(f"{k}={v}" for k, v in counts.items()) + f" elapsed={time.perf_counter() - started:.1f}s")
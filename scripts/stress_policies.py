@@ -0,0 +1,133 @@
+"""
+Concurrency stress test for policy creation (correctness + throughput).
+
+    python -m scripts.stress_policies --threads 16 --cars 50 --attempts 20
+
+Contention phase: every thread tries to create the same one-day policies on the
+same --cars cars, so each (car, day) slot must be won exactly once; afterwards
+no two policies of a touched car may overlap. Throughput phase: each thread
+writes to cars of its own, which should not serialize on PostgreSQL (row locks)
+and queue on the single SQLite write lock. Exits 1 on any overlap, lost slot or
+unexpected error.
+
+Runs against DATABASE_URL and leaves the inserted policies behind (far-future
+dates, provider "Stress"); use a scratch database. tests/test_policy_locking.py
+runs the contention phase on every pytest run.
+"""
+import os
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import aliased
+
+from app.api.errors import BadRequestError, LockTimeoutError
+from app.core.logging import setup_logging
+from app.db.models import Car, InsurancePolicy
+from app.db.session import SessionLocal, engine
+from app.services.policy_service import create_policy
+
+BASE_DAY = date(2090, 1, 1)
+
+
+def _run_threads(threads: int, work) -> tuple[Counter, float]:
+    outcomes: Counter = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(n: int):
+        barrier.wait()
+        local = Counter()
+        for car_id, day in work(n):
+            with SessionLocal() as db:
+                try:
+                    create_policy(db, car_id, "Stress", day, day)
+                    local["created"] += 1
+                except BadRequestError:
+                    local["overlap_rejected"] += 1
+                except LockTimeoutError:
+                    local["lock_timeout"] += 1
+                except Exception as e:  # anything else is a failure
+                    local[f"error:{type(e).__name__}"] += 1
+        with lock:
+            outcomes.update(local)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return outcomes, time.perf_counter() - started
+
+
+def _overlaps(car_ids: list[int], first: date, last: date) -> int:
+    """Overlapping pairs among the touched cars' policies starting within this run's slots."""
+    a, b = aliased(InsurancePolicy), aliased(InsurancePolicy)
+    stmt = (
+        select(func.count())
+        .select_from(a)
+        .join(b, and_(b.car_id == a.car_id, b.id > a.id))
+        .where(a.car_id.in_(car_ids), a.start_date.between(first, last))
+        .where(~((a.end_date < b.start_date) | (a.start_date > b.end_date)))
+    )
+    with SessionLocal() as db:
+        return db.execute(stmt).scalar()
+
+
+def run_contention(threads: int, car_ids: list[int], days: list[date]) -> tuple[Counter, int, float]:
+    """Every thread races for the same (car, day) slots: outcomes, overlapping pairs, seconds."""
+    outcomes, elapsed = _run_threads(threads, lambda n: ((c, d) for d in days for c in car_ids))
+    return outcomes, _overlaps(car_ids, days[0], days[-1]), elapsed
+
+
+def main(threads: int, cars: int, attempts: int) -> int:
+    with SessionLocal() as db:
+        car_ids = list(db.execute(select(Car.id).order_by(Car.id).limit(cars * (threads + 1))).scalars())
+        # start after earlier runs' slots so reruns don't collide
+        last = db.execute(select(func.max(InsurancePolicy.end_date)).where(InsurancePolicy.provider == "Stress")).scalar()
+    if len(car_ids) < cars * (threads + 1):
+        sys.exit(f"need {cars * (threads + 1)} cars; run python -m scripts.generate_data first")
+    shared, own = car_ids[:cars], car_ids[cars:]
+    first = max(BASE_DAY, last + timedelta(days=1)) if last else BASE_DAY
+    days = [first + timedelta(days=i) for i in range(attempts)]
+    ok = True
+
+    outcomes, overlaps, elapsed = run_contention(threads, shared, days)
+    expected = cars * attempts
+    print(f"contention: threads={threads} slots={expected} {dict(outcomes)} overlaps={overlaps} "
+          f"elapsed={elapsed:.2f}s")
+    if overlaps or outcomes["created"] != expected or any(k.startswith("error") for k in outcomes):
+        ok = False
+
+    # disjoint cars per thread
+    def disjoint(n: int):
+        mine = own[n * cars:(n + 1) * cars]
+        return ((c, d) for d in days for c in mine)
+
+    outcomes, elapsed = _run_threads(threads, disjoint)
+    total = threads * cars * attempts
+    print(f"disjoint: threads={threads} writes={total} {dict(outcomes)} elapsed={elapsed:.2f}s "
+          f"throughput={outcomes['created'] / elapsed:.0f} policies/s")
+    if outcomes["created"] != total or _overlaps(own, days[0], days[-1]):
+        ok = False
+
+    print(f"database={engine.dialect.name} result={'OK' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent policy creation stress test")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--cars", type=int, default=20, help="cars per phase (and per thread when disjoint)")
+    parser.add_argument("--attempts", type=int, default=10, help="one-day slots per car")
+    args = parser.parse_args()
+    setup_logging()
+    sys.exit(main(args.threads, args.cars, args.attempts))
@@ -0,0 +1,49 @@
+"""
+Export every car without a valid policy on a date (with its owner).
+
+    python -m scripts.uninsured_report --date 2025-06-30 > uninsured.csv
+    python -m scripts.uninsured_report --date 2025-06-30 --format ndjson --output uninsured.ndjson
+
+One anti-join query read through a server-side cursor (per shard, merged by car
+id); memory stays flat.
+"""
+import argparse
+import sys
+import time
+
+from app.core.config import settings
+from app.db.shards import merged_stream
+from app.services.report_service import UNINSURED_COLUMNS, iter_uninsured_cars
+from app.utils.bulk_io import iter_export
+from app.utils.dates import parse_date_str
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Uninsured-cars report")
+    parser.add_argument("--date", required=True, type=parse_date_str, help="YYYY-MM-DD")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=settings.STREAM_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = 0
+
+    def counted(rows):
+        global count
+        for row in rows:
+            count += 1
+            yield row
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        with merged_stream(
+            lambda db: iter_uninsured_cars(db, args.date, chunk_size=args.chunk_size), key=lambda row: row[0]
+        ) as merged:
+            rows = counted(merged)
+            for chunk in iter_export(UNINSURED_COLUMNS, rows, args.format, rows_per_chunk=args.chunk_size):
+                out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"uninsured={count} elapsed={time.perf_counter() - started:.1f}s", file=sys.stderr)
@@ -0,0 +1,37 @@
+"""
+The suite runs against a scratch SQLite file. Settings are read once, when
+app.core.config is first imported, so the environment is pointed at it here,
+before any test module imports the app.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{Path(tempfile.mkdtemp(prefix='carins-tests-')) / 'test.db'}",
+    # one engine for every statement: no replicas, no shards, no async stack
+    "READ_DATABASE_URLS": "[]",
+    "SHARD_DATABASE_URLS": "[]",
+    "ASYNC_DB_ENABLED": "false",
+    "SCHEDULER_ENABLED": "false",
+    # scheduler jobs are called directly, and roll up claims inserted a moment ago
+    "SCHEDULER_TEST_MODE": "true",
+    "ROLLUP_SAFETY_LAG_SECONDS": "0",
+    "LOG_LEVEL": "WARNING",
+    # write logs on the calling thread: pytest closes the captured stdout the writer thread holds
+    "LOG_ASYNC": "false",
+})
+
+SEED_CARS = 3_000
+
+
+@pytest.fixture(scope="session")
+def seeded_db() -> str:
+    """Migrated scratch database with SEED_CARS generated cars (policies x3, claims x2)."""
+    from app.core.config import settings
+    from scripts.check_queries import seed
+
+    seed(SEED_CARS)
+    return settings.DATABASE_URL
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+
+
+def _ndjson(rows: list[dict]) -> bytes:
+    return "".join(json.dumps(r) + "\n" for r in rows).encode()
+
+
+@pytest.fixture(scope="module")
+def client(seeded_db):
+    return TestClient(create_app())
+
+
+# cars past the pages the query-budget cases read (future policies change their plans)
+@pytest.mark.parametrize("car_id, headers", [
+    (2_901, {}),  # no Content-Type: the body must not be parsed as JSON
+    (2_902, {"Content-Type": "application/json"}),
+])
+def test_policy_import_reads_ndjson_whatever_the_content_type(client, car_id, headers):
+    body = _ndjson([
+        {"carId": car_id, "provider": "AXA", "startDate": "2095-01-01", "endDate": "2095-06-30"},
+        {"carId": car_id, "provider": "AXA", "startDate": "2095-06-30", "endDate": "2095-12-31"},
+    ])
+    response = client.post("/api/policies/import", content=body, headers=headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total"], report["inserted"], report["failed"]) == (2, 1, 1)
+    assert report["errors"][0]["row"] == 2
+
+
+@pytest.mark.parametrize("headers", [{}, {"Content-Type": "application/json"}])
+def test_claim_import_reads_ndjson_whatever_the_content_type(client, headers):
+    body = _ndjson([
+        {"carId": 2_903, "claimDate": "2024-03-01", "description": "Side mirror", "amount": "120.50"},
+        {"carId": 2_903, "claimDate": "2024-03-02", "description": "", "amount": "80"},
+    ])
+    response = client.post("/api/claims/import", content=body, headers=headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total"], report["inserted"], report["failed"]) == (2, 1, 1)
+    assert report["errors"][0]["row"] == 2
@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.coverage_service import merge_coverage
+
+D = date(2024, 1, 1)
+
+
+def day(n: int) -> date:
+    return D + timedelta(days=n)
+
+
+def days(intervals) -> list[tuple[int, int]]:
+    return [((s - D).days, (e - D).days) for s, e in intervals]
+
+
+def coverage(policies: list[tuple[int, int]], date_from: int = 0, date_to: int = 99):
+    """merge_coverage on day offsets from D; returns (covered, gaps) as offsets."""
+    covered, gaps = merge_coverage([(day(s), day(e)) for s, e in policies], day(date_from), day(date_to))
+    return days(covered), days(gaps)
+
+
+def test_no_policies_is_one_gap_over_the_whole_range():
+    assert coverage([]) == ([], [(0, 99)])
+
+
+def test_gaps_at_both_range_edges():
+    assert coverage([(10, 89)]) == ([(10, 89)], [(0, 9), (90, 99)])
+
+
+@pytest.mark.parametrize("policy", [(0, 99), (-30, 200)])
+def test_full_cover_has_no_gaps(policy):
+    assert coverage([policy]) == ([(0, 99)], [])
+
+
+def test_policies_straddling_the_range_edges_are_clipped():
+    assert coverage([(-10, 5), (95, 120)]) == ([(0, 5), (95, 99)], [(6, 94)])
+
+
+def test_one_day_gaps_at_the_edges():
+    assert coverage([(1, 98)]) == ([(1, 98)], [(0, 0), (99, 99)])
+
+
+def test_policies_outside_the_range_are_ignored():
+    assert coverage([(-20, -1), (40, 49), (100, 120)]) == ([(40, 49)], [(0, 39), (50, 99)])
+
+
+def test_adjacent_and_overlapping_policies_merge():
+    # day 19 -> day 20 is adjacent; (25, 35) overlaps; (30, 32) is nested
+    assert coverage([(10, 19), (20, 29), (25, 35), (30, 32), (37, 40)]) == (
+        [(10, 35), (37, 40)],
+        [(0, 9), (36, 36), (41, 99)],
+    )
+
+
+def test_single_day_range():
+    assert coverage([(5, 5)], 5, 5) == ([(5, 5)], [])
+    assert coverage([(6, 9)], 5, 5) == ([], [(5, 5)])
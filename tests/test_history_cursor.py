@@ -0,0 +1,77 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.errors import BadRequestError
+from app.api.schemas import HistoryPolicyItem
+from app.db.session import SessionLocal
+from app.main import create_app
+from app.services.claim_service import create_claim
+from app.services.history_service import HistoryCursor, get_car_history
+from app.services.policy_service import create_policy
+
+# past the cars the other tests write to; far-future dates keep the seeded events out of range
+CAR_ID = 2_904
+FROM = date(2096, 1, 1)
+
+
+def _key(item) -> tuple:
+    if isinstance(item, HistoryPolicyItem):
+        return "P", item.policy_id
+    return "C", item.claim_id
+
+
+@pytest.fixture(scope="module")
+def events(seeded_db) -> list[tuple]:
+    """Expected history of CAR_ID from FROM on: same-day policies before claims, then by id."""
+    with SessionLocal() as db:
+        p1 = create_policy(db, car_id=CAR_ID, provider="AXA", start_date=date(2096, 1, 10), end_date=date(2096, 1, 31))
+        p2 = create_policy(db, car_id=CAR_ID, provider=None, start_date=date(2096, 2, 1), end_date=date(2096, 2, 28))
+        c1, c2, c3 = (
+            create_claim(db, car_id=CAR_ID, claim_date=d, description="Scratch", amount=Decimal("10.00"))
+            for d in (date(2096, 1, 20), date(2096, 1, 10), date(2096, 1, 10))
+        )
+        return [("P", p1.id), ("C", c2.id), ("C", c3.id), ("C", c1.id), ("P", p2.id)]
+
+
+@pytest.mark.parametrize("cursor", [
+    HistoryCursor(date(2096, 1, 10), 0, 7),
+    HistoryCursor(date(1999, 12, 31), 1, 123456789),
+])
+def test_cursor_round_trip(cursor):
+    assert HistoryCursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.parametrize("token", ["", "2096-01-10.P", "2096-01-10.X.7", "2096-13-01.P.7", "2096-01-10.C.x", "a.b.c.d"])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(BadRequestError):
+        HistoryCursor.decode(token)
+
+
+def test_malformed_cursor_is_a_400(seeded_db):
+    response = TestClient(create_app()).get(f"/api/cars/{CAR_ID}/history", params={"cursor": "2096-01-10.X.7"})
+    assert response.status_code == 400
+
+
+def test_history_merges_policies_and_claims_in_order(events):
+    with SessionLocal() as db:
+        items, next_cursor = get_car_history(db, CAR_ID, date_from=FROM)
+    assert [_key(i) for i in items] == events
+    assert next_cursor is None
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_cursor_pages_resume_without_gaps_or_repeats(events, limit):
+    seen, after = [], None
+    with SessionLocal() as db:
+        while True:
+            items, after = get_car_history(db, CAR_ID, date_from=FROM, after=after, limit=limit)
+            assert len(items) <= limit
+            seen.extend(_key(i) for i in items)
+            if after is None:
+                break
+            # the cursor survives the trip through the X-Next-Cursor header
+            after = HistoryCursor.decode(after.encode())
+    assert seen == events
@@ -0,0 +1,26 @@
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from app.db.models import Car
+from app.db.session import SessionLocal
+from scripts.stress_policies import run_contention
+
+THREADS = 8
+CARS = 5
+ATTEMPTS = 5
+
+
+def test_concurrent_policy_creation_wins_each_slot_once(seeded_db):
+    # the last cars and a far-future range: nothing else in the suite writes there
+    with SessionLocal() as db:
+        car_ids = sorted(db.execute(select(Car.id).order_by(Car.id.desc()).limit(CARS)).scalars())
+    days = [date(2150, 1, 1) + timedelta(days=i) for i in range(ATTEMPTS)]
+
+    outcomes, overlaps, _ = run_contention(THREADS, car_ids, days)
+
+    slots = CARS * ATTEMPTS
+    assert overlaps == 0
+    assert outcomes["created"] == slots  # no lost slots (lock timeouts, errors)
+    assert outcomes["overlap_rejected"] == (THREADS - 1) * slots
+    assert not [k for k in outcomes if k.startswith("error")], dict(outcomes)
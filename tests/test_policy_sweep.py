@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+from app.services.policy_import_service import _Row, _sweep
+
+D = date(2024, 1, 1)
+EXISTING = "Policy date range overlaps an existing policy."
+
+
+def day(n: int) -> date:
+    return D + timedelta(days=n)
+
+
+def rows(*ranges: tuple[int, int]) -> list[_Row]:
+    """Import rows numbered from 1 in the given order, sorted by start like import_policies does."""
+    return sorted(_Row(day(s), day(e), n, "AXA") for n, (s, e) in enumerate(ranges, start=1))
+
+
+def sweep(existing: list[tuple[int, int]], new: list[_Row]) -> dict[int, str | None]:
+    return {r.row: error for r, error in _sweep([(day(s), day(e)) for s, e in existing], new)}
+
+
+def test_adjacent_ranges_do_not_overlap():
+    assert sweep([(0, 9), (20, 29)], rows((10, 19), (30, 39))) == {1: None, 2: None}
+
+
+def test_touching_an_existing_policy_on_one_day_overlaps():
+    # inclusive ranges: sharing the first or last day is an overlap
+    assert sweep([(10, 19)], rows((0, 10), (19, 25))) == {1: EXISTING, 2: EXISTING}
+
+
+def test_rows_inside_around_and_between_existing_policies():
+    result = sweep([(10, 19), (30, 39)], rows((12, 15), (5, 45), (20, 29), (40, 40)))
+    assert result == {1: EXISTING, 2: EXISTING, 3: None, 4: None}
+
+
+def test_overlap_with_an_earlier_row_of_the_import():
+    result = sweep([], rows((0, 10), (10, 20), (11, 20)))
+    assert result == {
+        1: None,
+        2: "Policy date range overlaps row 1 of this import.",
+        3: None,
+    }
+
+
+def test_in_batch_duplicates_keep_the_first_row():
+    result = sweep([], rows((0, 9), (0, 9), (0, 9)))
+    assert result == {
+        1: None,
+        2: "Policy date range overlaps row 1 of this import.",
+        3: "Policy date range overlaps row 1 of this import.",
+    }
+
+
+def test_rejected_rows_do_not_block_later_rows():
+    # row 1 clashes with the existing policy, so row 2 only has to clear the existing one
+    assert sweep([(0, 5)], rows((3, 20), (10, 15))) == {1: EXISTING, 2: None}
+
+
+def test_no_existing_policies_and_no_rows():
+    assert sweep([(0, 5)], []) == {}
+    assert sweep([], rows((0, 0))) == {1: None}
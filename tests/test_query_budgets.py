@@ -0,0 +1,37 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.base import Base
+from app.db.session import get_engine
+from app.main import create_app
+from scripts.check_queries import CASES, JOBS, Recorder, run_case, run_job
+
+
+@pytest.fixture(scope="module")
+def recorded(seeded_db):
+    engine = get_engine()
+    recorder = Recorder()
+    event.listen(engine, "before_cursor_execute", recorder)
+    yield recorder, engine, set(Base.metadata.tables)
+    event.remove(engine, "before_cursor_execute", recorder)
+
+
+@pytest.fixture(scope="module")
+def client(seeded_db):
+    return TestClient(create_app(), raise_server_exceptions=False)
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case.name)
+def test_endpoint_within_query_budget_without_full_scans(client, recorded, case):
+    recorder, engine, tables = recorded
+    statements, problems = run_case(client, recorder, engine, tables, case)
+    assert len(statements) <= case.max_queries
+    assert not problems, "\n".join(problems)
+
+
+@pytest.mark.parametrize("name", list(JOBS))
+def test_scheduler_job_without_full_scans(recorded, name):
+    recorder, engine, tables = recorded
+    _, problems = run_job(recorder, engine, tables, name)
+    assert not problems, "\n".join(problems)
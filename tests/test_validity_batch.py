@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from app.db.models import InsurancePolicy
+from app.db.session import SessionLocal
+from app.services.validity_index import build_intervals, covers
+from app.services.validity_service import check_validity_batch, is_insurance_valid_on
+
+D = date(2024, 1, 1)
+
+
+def day(n: int) -> date:
+    return D + timedelta(days=n)
+
+
+def test_covers_is_inclusive_at_both_ends():
+    intervals = build_intervals([(day(10), day(19)), (day(20), day(29)), (day(40), day(49))])
+    assert [covers(*intervals, day(n)) for n in (9, 10, 19, 20, 29, 30, 39, 40, 49, 50)] == [
+        False, True, True, True, True, False, False, True, True, False,
+    ]
+
+
+def test_covers_uses_the_running_max_end_for_overlapping_legacy_rows():
+    # the long first policy still covers day 25, although the nearest start (day 20) ends on day 21
+    intervals = build_intervals([(day(0), day(30)), (day(20), day(21))])
+    assert covers(*intervals, day(25))
+    assert not covers(*intervals, day(31))
+
+
+def test_covers_without_policies():
+    assert not covers(*build_intervals([]), D)
+
+
+def test_batch_matches_single_checks_and_keeps_input_order(seeded_db):
+    with SessionLocal() as db:
+        policies = db.execute(
+            select(InsurancePolicy.car_id, InsurancePolicy.start_date, InsurancePolicy.end_date)
+            .where(InsurancePolicy.car_id <= 20)
+        ).all()
+        # each policy's first and last day, and the days just outside it
+        pairs = [
+            (car_id, d)
+            for car_id, start, end in policies
+            for d in (start - timedelta(days=1), start, end, end + timedelta(days=1))
+        ]
+        pairs.reverse()
+        pairs.append((10_000_000, D))
+
+        results = check_validity_batch(db, pairs)
+
+        assert results[-1] == (False, False)
+        assert results[:-1] == [(True, is_insurance_valid_on(db, car_id, d)) for car_id, d in pairs[:-1]]
+        assert any(valid for _, valid in results) and not all(valid for _, valid in results[:-1])